@@ -4,7 +4,7 @@ Cynapse - Ghost Shell Security Hub
 
 A specialized, air-gapped security ecosystem with:
 - 8 security neurons (Bat, Beaver, Canary, Meerkat, Octopus, Owl, Wolverine, Elara)
-- Ghost Shell threshold cryptography (2-of-3 Shamir Secret Sharing)
+- Ghost Shell threshold cryptography (k-of-n Shamir Secret Sharing, 2-of-3 by default)
 - HiveMind workflow orchestration
 - Synaptic Fortress TUI
 
@@ -7,10 +7,11 @@ HiveMind: Workflow orchestration engine with "Bees"
 """
 
 from .hub import CynapseHub
-from .hivemind import HiveMind, HiveConfig
+from .hivemind import HiveMind, HiveConfig, RetentionPolicy
 
 __all__ = [
     'CynapseHub',
     'HiveMind',
     'HiveConfig',
+    'RetentionPolicy',
 ]
@@ -3,6 +3,7 @@ from typing import List, Dict, Optional, Any
 from enum import Enum
 import uuid
 from datetime import datetime
+from pathlib import Path
 
 class AgentState(Enum):
     IDLE = "idle"
@@ -12,6 +12,7 @@ Usage:
 
 import os
 import sys
+import gzip
 import json
 import yaml
 import time
@@ -20,6 +21,7 @@ import hashlib
 import subprocess
 import threading
 import importlib 
+import uuid
 from pathlib import Path
 from typing import Dict, List, Any, Optional, Callable
 from dataclasses import dataclass, field
@@ -61,6 +63,11 @@ class HiveConfig:
     queen_model: str = "./models/elara.gguf"
     sandbox_enabled: bool = True
     auto_approve: bool = False
+    memory_retention_days: int = 0
+    instance_retention_days: int = 7
+    archive_path: str = "./cynapse/data/archive"
+    maintenance_interval_hours: int = 24
+    auto_maintenance: bool = False
 
     @classmethod
     def from_yaml(cls, path: str):
@@ -110,6 +117,7 @@ class Bee:
     nodes: List[Node]
     trigger: Dict[str, Any] = field(default_factory=dict)
     created_at: float = field(default_factory=time.time)
+    ephemeral: bool = False  # One-off bee, archived with its last instance
 
     def to_dict(self) -> Dict:
         return {
@@ -119,7 +127,8 @@ class Bee:
             'nodes': [{'id': n.id, 'type': n.type, 'config': n.config, 
                       'inputs': n.inputs, 'condition': n.condition} for n in self.nodes],
             'trigger': self.trigger,
-            'created_at': self.created_at
+            'created_at': self.created_at,
+            'ephemeral': self.ephemeral
         }
 
     @classmethod
@@ -133,7 +142,8 @@ class Bee:
             type=BeeType(data['type']),
             nodes=nodes,
             trigger=data.get('trigger', {}),
-            created_at=data.get('created_at', time.time())
+            created_at=data.get('created_at', time.time()),
+            ephemeral=data.get('ephemeral', False)
         )
 
 @dataclass
@@ -148,10 +158,25 @@ class BeeInstance:
     end_time: Optional[float] = None
     logs: List[str] = field(default_factory=list)
 
+@dataclass
+class RetentionPolicy:
+    """How long rows live in hivemind.db before being archived.
+
+    A value of 0 days keeps rows forever. When ``archive_path`` is None,
+    expired rows are deleted without being exported.
+    """
+    memory_days: int = 0
+    instance_days: int = 7
+    archive_path: Optional[str] = "./cynapse/data/archive"
+    batch_size: int = 5000
+
 # ---------------------------------------------------------------------------
 # Honeycomb (Storage Layer)
 # ---------------------------------------------------------------------------
 
+TERMINAL_STATES = ('completed', 'failed', 'cancelled')
+TEMPLATE_PREFIX = 'template_'
+
 class Honeycomb:
     """Unified storage: SQLite for state, memory for vectors"""
 
@@ -159,6 +184,7 @@ class Honeycomb:
         self.db_path = db_path
         self._init_db()
         self.vectors: Dict[str, List] = {}
+        self._maintenance_lock = threading.Lock()
 
     def _init_db(self):
         with sqlite3.connect(self.db_path) as conn:
@@ -185,6 +211,17 @@ class Honeycomb:
                 )
             """)
 
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_memory_timestamp ON memory(timestamp)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_instances_bee_state ON instances(bee_id, state)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_bees_created_at ON bees(created_at)")
+
+            # Bookkeeping for periodic maintenance (last VACUUM/ANALYZE run)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS maintenance (
+                    task TEXT PRIMARY KEY, last_run REAL
+                )
+            """)
+
             conn.commit()
 
     def save_bee(self, bee: Bee):
@@ -202,9 +239,12 @@ class Honeycomb:
                 return Bee.from_dict(json.loads(row[0]))
         return None
 
-    def list_bees(self) -> List[Dict]:
+    def list_bees(self, limit: Optional[int] = None) -> List[Dict]:
         with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute('SELECT id, name, type, created_at FROM bees ORDER BY created_at DESC')
+            cursor = conn.execute(
+                'SELECT id, name, type, created_at FROM bees ORDER BY created_at DESC LIMIT ?',
+                (-1 if limit is None else limit,)
+            )
             return [{'id': r[0], 'name': r[1], 'type': r[2], 'created_at': r[3]} for r in cursor.fetchall()]
 
     def create_instance(self, instance: BeeInstance):
@@ -238,6 +278,22 @@ class Honeycomb:
                 )
         return None
 
+    def list_instances(self, bee_id: str, state: Optional[BeeState] = None, limit: int = 100) -> List[Dict]:
+        with sqlite3.connect(self.db_path) as conn:
+            if state is None:
+                cursor = conn.execute(
+                    'SELECT instance_id, state, start_time, end_time FROM instances WHERE bee_id = ? '
+                    'ORDER BY start_time DESC, rowid DESC LIMIT ?',
+                    (bee_id, limit)
+                )
+            else:
+                cursor = conn.execute(
+                    'SELECT instance_id, state, start_time, end_time FROM instances WHERE bee_id = ? AND state = ? '
+                    'ORDER BY start_time DESC, rowid DESC LIMIT ?',
+                    (bee_id, state.value, limit)
+                )
+            return [{'instance_id': r[0], 'state': r[1], 'start_time': r[2], 'end_time': r[3]} for r in cursor.fetchall()]
+
     def log_interaction(self, query: str, response: str, correction: str = None, bee_id: str = None):
         with sqlite3.connect(self.db_path) as conn:
             conn.execute(
@@ -253,6 +309,119 @@ class Honeycomb:
             )
             return [{'query': r[0], 'response': r[1], 'correction': r[2], 'timestamp': r[3]} for r in cursor.fetchall()]
 
+    # -- Retention & maintenance ------------------------------------------
+
+    def _archive_rows(self, conn: sqlite3.Connection, table: str, where: str, params: tuple,
+                      archive_path: Optional[str], batch_size: int) -> int:
+        """Stream matching rows to a gzipped NDJSON file, then delete them.
+
+        Must be called inside an open write transaction so that the exported
+        set and the deleted set are the same rows.
+        """
+        cursor = conn.execute(f'SELECT * FROM {table} WHERE {where}', params)
+        columns = [d[0] for d in cursor.description]
+        count = 0
+
+        if archive_path:
+            archive_dir = Path(archive_path)
+            archive_dir.mkdir(parents=True, exist_ok=True)
+            stamp = time.strftime('%Y%m%dT%H%M%S', time.gmtime())
+            out_path = archive_dir / f"{table}-{stamp}.ndjson.gz"
+            n = 1
+            while out_path.exists():
+                out_path = archive_dir / f"{table}-{stamp}.{n}.ndjson.gz"
+                n += 1
+            tmp_path = out_path.with_suffix('.gz.part')
+            with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    f.writelines(json.dumps(dict(zip(columns, r))) + '\n' for r in rows)
+                    count += len(rows)
+            if count:
+                os.replace(tmp_path, out_path)
+            else:
+                tmp_path.unlink()
+        else:
+            count = conn.execute(f'SELECT COUNT(*) FROM {table} WHERE {where}', params).fetchone()[0]
+
+        if count:
+            conn.execute(f'DELETE FROM {table} WHERE {where}', params)
+        return count
+
+    def apply_retention(self, policy: RetentionPolicy, now: Optional[float] = None) -> Dict[str, int]:
+        """Archive and delete rows older than the policy allows.
+
+        Only finished instances are expired. Ephemeral bees whose every
+        instance has been expired are archived alongside them; user-defined
+        and template bees are never removed.
+        """
+        now = now or time.time()
+        archived = {'memory': 0, 'instances': 0, 'bees': 0}
+
+        with self._maintenance_lock, sqlite3.connect(self.db_path) as conn:
+            conn.execute('BEGIN IMMEDIATE')
+
+            if policy.memory_days > 0:
+                cutoff = now - policy.memory_days * 86400
+                archived['memory'] = self._archive_rows(
+                    conn, 'memory', 'timestamp < ?', (cutoff,),
+                    policy.archive_path, policy.batch_size)
+
+            if policy.instance_days > 0:
+                cutoff = now - policy.instance_days * 86400
+                placeholders = ','.join('?' * len(TERMINAL_STATES))
+                where = f'end_time < ? AND state IN ({placeholders})'
+                params = (cutoff, *TERMINAL_STATES)
+                conn.execute('CREATE TEMP TABLE IF NOT EXISTS expired_bees (bee_id TEXT PRIMARY KEY)')
+                conn.execute('DELETE FROM expired_bees')
+                conn.execute(f'INSERT OR IGNORE INTO expired_bees SELECT DISTINCT bee_id FROM instances WHERE {where}', params)
+                archived['instances'] = self._archive_rows(
+                    conn, 'instances', where, params,
+                    policy.archive_path, policy.batch_size)
+                archived['bees'] = self._archive_rows(
+                    conn, 'bees',
+                    'id IN (SELECT bee_id FROM expired_bees) AND substr(id, 1, ?) != ? '
+                    "AND json_extract(definition, '$.ephemeral') = 1 "
+                    'AND NOT EXISTS (SELECT 1 FROM instances WHERE instances.bee_id = bees.id)',
+                    (len(TEMPLATE_PREFIX), TEMPLATE_PREFIX), policy.archive_path, policy.batch_size)
+                conn.execute('DROP TABLE expired_bees')
+
+        return archived
+
+    def _last_run(self, conn: sqlite3.Connection, task: str) -> float:
+        row = conn.execute('SELECT last_run FROM maintenance WHERE task = ?', (task,)).fetchone()
+        return row[0] if row else 0.0
+
+    def maintenance_due(self, interval_hours: float, now: Optional[float] = None) -> bool:
+        if interval_hours <= 0:
+            return False
+        now = now or time.time()
+        with sqlite3.connect(self.db_path) as conn:
+            return now - self._last_run(conn, 'vacuum') >= interval_hours * 3600
+
+    def optimize(self, vacuum: bool = True) -> Dict[str, float]:
+        """Refresh planner statistics and (optionally) reclaim free pages"""
+        timings = {}
+        with self._maintenance_lock:
+            # VACUUM cannot run inside a transaction, so use autocommit mode
+            conn = sqlite3.connect(self.db_path, isolation_level=None)
+            try:
+                start = time.perf_counter()
+                conn.execute('ANALYZE')
+                timings['analyze'] = time.perf_counter() - start
+                conn.execute('INSERT OR REPLACE INTO maintenance VALUES (?, ?)', ('analyze', time.time()))
+
+                if vacuum:
+                    start = time.perf_counter()
+                    conn.execute('VACUUM')
+                    timings['vacuum'] = time.perf_counter() - start
+                    conn.execute('INSERT OR REPLACE INTO maintenance VALUES (?, ?)', ('vacuum', time.time()))
+            finally:
+                conn.close()
+        return timings
+
     def store_vectors(self, collection: str, texts: List[str], embeddings: List[List[float]]):
         np = _lazy_load_numpy()
         if collection not in self.vectors:
@@ -355,7 +524,7 @@ class CodeExecuteNode(NodeHandler):
 class VectorStoreNode(NodeHandler):
     def execute(self, inputs, config, context):
         honeycomb = context.get('honeycomb')
-        collection = config.get('collection', 'default')
+        collection = config.get('collection', inputs.get('collection') or 'default')
         texts = inputs.get('texts', [])
         embeddings = inputs.get('embeddings', [])
         honeycomb.store_vectors(collection, texts, embeddings)
@@ -439,13 +608,26 @@ class HiveMind:
                 workflow_path=cm.get("hivemind", "workflow_path"),
                 max_concurrent_bees=cm.get_int("hivemind", "max_concurrent_bees"),
                 sandbox_enabled=cm.get_boolean("hivemind", "sandbox_enabled"),
-                auto_approve=cm.get_boolean("hivemind", "auto_approve")
+                auto_approve=cm.get_boolean("hivemind", "auto_approve"),
+                memory_retention_days=cm.get_int("hivemind", "memory_retention_days", 0),
+                instance_retention_days=cm.get_int("hivemind", "instance_retention_days", 7),
+                archive_path=cm.get("hivemind", "archive_path", "./cynapse/data/archive"),
+                maintenance_interval_hours=cm.get_int("hivemind", "maintenance_interval_hours", 24),
+                auto_maintenance=cm.get_boolean("hivemind", "auto_maintenance", False)
             )
             
         self.honeycomb = Honeycomb(self.config.db_path)
+        self.retention = RetentionPolicy(
+            memory_days=self.config.memory_retention_days,
+            instance_days=self.config.instance_retention_days,
+            archive_path=self.config.archive_path or None
+        )
         self.handlers: Dict[str, NodeHandler] = {}
+        self.templates: Dict[str, Bee] = {}
         self.running_bees: Dict[str, threading.Thread] = {}
         self.lock = threading.Lock()  # Thread safety lock
+        self._maintenance_stop = threading.Event()
+        self._maintenance_thread: Optional[threading.Thread] = None
         
         # Initialize Core Values
         self.validator = ConstitutionalValidator()
@@ -457,9 +639,14 @@ class HiveMind:
         self.lead_agent = LeadAgent("hive_queen", self.context_manager, self.artifact_store, self.mailbox, hivemind_ref=self)
         
         self._register_default_handlers()
+        self._register_default_templates()
         Path(self.config.document_path).mkdir(parents=True, exist_ok=True)
         Path(self.config.workflow_path).mkdir(parents=True, exist_ok=True)
 
+        # Retention deletes data, so the background scheduler is opt-in
+        if self.config.auto_maintenance and self.config.maintenance_interval_hours > 0:
+            self.start_maintenance()
+
     def _register_default_handlers(self):
         self.handlers = {
             'file_reader': FileReaderNode(),
@@ -474,9 +661,10 @@ class HiveMind:
     def register_handler(self, node_type: str, handler: NodeHandler):
         self.handlers[node_type] = handler
 
-    def create_bee(self, name: str, bee_type: BeeType, nodes: List[Node] = None) -> Bee:
+    def create_bee(self, name: str, bee_type: BeeType, nodes: List[Node] = None,
+                   ephemeral: bool = False) -> Bee:
         bee_id = hashlib.md5(f"{name}_{time.time()}".encode()).hexdigest()[:12]
-        bee = Bee(id=bee_id, name=name, type=bee_type, nodes=nodes or [])
+        bee = Bee(id=bee_id, name=name, type=bee_type, nodes=nodes or [], ephemeral=ephemeral)
         self.honeycomb.save_bee(bee)
         return bee
 
@@ -486,12 +674,49 @@ class HiveMind:
     def list_bees(self) -> List[Dict]:
         return self.honeycomb.list_bees()
 
+    def register_template(self, name: str, bee_type: BeeType, nodes: List[Node]) -> Bee:
+        """Register a reusable bee definition under a stable id.
+
+        Per-call parameters are passed as instance context and referenced
+        from node inputs as ``context.<key>``, so running a template costs a
+        single instance row instead of a new bee definition.
+        """
+        bee = Bee(id=f"{TEMPLATE_PREFIX}{name}", name=name, type=bee_type, nodes=nodes)
+        existing = self.honeycomb.load_bee(bee.id)
+        if existing is None or existing.to_dict()['nodes'] != bee.to_dict()['nodes']:
+            self.honeycomb.save_bee(bee)
+        else:
+            bee = existing
+        self.templates[name] = bee
+        return bee
+
+    def _register_default_templates(self):
+        self.register_template('chat', BeeType.DEPLOYMENT, [
+            Node('llm', 'llm', {'model': 'elara'}, {'prompt': 'context.query'}),
+            Node('output', 'output', {'format': 'text'}, {'content': 'llm.text'}),
+        ])
+        self.register_template('train_docs', BeeType.TRAINING, [
+            Node('read', 'file_reader', {}, {'path': 'context.doc_path'}),
+            Node('chunk', 'text_chunker', {'chunk_size': 512}, {'text': 'read.content'}),
+            Node('store', 'vector_store', {}, {'texts': 'chunk.chunks', 'collection': 'context.collection'}),
+        ])
+
+    def spawn_template(self, name: str, params: Dict = None) -> str:
+        bee = self.templates.get(name)
+        if not bee:
+            raise ValueError(f"Template {name} not registered")
+        return self._spawn(bee, params)
+
     def spawn_bee(self, bee_id: str, initial_context: Dict = None) -> str:
         bee = self.load_bee(bee_id)
         if not bee:
             raise ValueError(f"Bee {bee_id} not found")
-        instance_id = f"{bee_id}_{int(time.time())}"
-        instance = BeeInstance(instance_id=instance_id, bee_id=bee_id, state=BeeState.QUEUED, context=initial_context or {})
+        return self._spawn(bee, initial_context)
+
+    def _spawn(self, bee: Bee, initial_context: Dict = None) -> str:
+        # Suffix keeps ids unique when a template runs several times per second
+        instance_id = f"{bee.id}_{int(time.time())}_{uuid.uuid4().hex[:6]}"
+        instance = BeeInstance(instance_id=instance_id, bee_id=bee.id, state=BeeState.QUEUED, context=initial_context or {})
         self.honeycomb.create_instance(instance)
         # Duplicate call removed
         
@@ -526,7 +751,10 @@ class HiveMind:
                 for key, ref in node.inputs.items():
                     if '.' in ref:
                         node_id, output_key = ref.split('.', 1)
-                        inputs[key] = node_outputs.get(node_id, {}).get(output_key)
+                        if node_id == 'context':
+                            inputs[key] = context.get(output_key)
+                        else:
+                            inputs[key] = node_outputs.get(node_id, {}).get(output_key)
                     else:
                         inputs[key] = node_outputs.get(ref)
                 handler = self.handlers.get(node.type)
@@ -559,27 +787,45 @@ class HiveMind:
             print(f"[Bee {instance_id}] Marked for cancellation")
 
     def train_from_documents(self, doc_path: str, collection: str = "knowledge"):
-        bee = self.create_bee(
-            name=f"train_docs_{int(time.time())}",
-            bee_type=BeeType.TRAINING,
-            nodes=[
-                Node('read', 'file_reader', {'path': doc_path}),
-                Node('chunk', 'text_chunker', {'chunk_size': 512}, {'text': 'read.content'}),
-                Node('store', 'vector_store', {'collection': collection}, {'texts': 'chunk.chunks'}),
-            ]
-        )
-        return self.spawn_bee(bee.id)
+        return self.spawn_template('train_docs', {'doc_path': doc_path, 'collection': collection})
 
     def deploy_chat(self, query: str):
-        bee = self.create_bee(
-            name=f"chat_{int(time.time())}",
-            bee_type=BeeType.DEPLOYMENT,
-            nodes=[
-                Node('llm', 'llm', {'model': 'elara'}, {'prompt': query}),
-                Node('output', 'output', {'format': 'text'}, {'content': 'llm.text'}),
-            ]
-        )
-        return self.spawn_bee(bee.id)
+        return self.spawn_template('chat', {'query': query})
+
+    def run_maintenance(self, force: bool = False) -> Dict[str, Any]:
+        """Apply the retention policy, then ANALYZE/VACUUM if due (or forced)"""
+        report: Dict[str, Any] = {'archived': self.honeycomb.apply_retention(self.retention)}
+        if force or self.honeycomb.maintenance_due(self.config.maintenance_interval_hours):
+            report['timings'] = self.honeycomb.optimize(vacuum=True)
+        elif any(report['archived'].values()):
+            # Large deletes skew planner statistics; refresh them cheaply
+            report['timings'] = self.honeycomb.optimize(vacuum=False)
+        return report
+
+    def _maintenance_loop(self):
+        interval = self.config.maintenance_interval_hours * 3600
+        # First pass shortly after startup, then once per interval
+        delay = 60.0
+        while not self._maintenance_stop.wait(delay):
+            delay = interval
+            if self.running_bees:
+                delay = 300.0  # Retry once the hive is idle
+                continue
+            try:
+                self.run_maintenance()
+            except sqlite3.Error as e:
+                print(f"[HiveMind] Maintenance failed: {e}")
+
+    def start_maintenance(self):
+        """Start the periodic retention/VACUUM/ANALYZE scheduler"""
+        if self._maintenance_thread and self._maintenance_thread.is_alive():
+            return
+        self._maintenance_stop.clear()
+        self._maintenance_thread = threading.Thread(target=self._maintenance_loop, daemon=True)
+        self._maintenance_thread.start()
+
+    def stop_maintenance(self):
+        self._maintenance_stop.set()
 
     def orchestrate_agent(self, request: str) -> str:
         """Trigger Lead Agent orchestration"""
@@ -590,6 +836,76 @@ class HiveMind:
         print(f"🐝 HiveMind: Spawning agent bee {bee_id} with context {context}")
         return "agent_bee_started"
 
+# ---------------------------------------------------------------------------
+# Benchmark
+# ---------------------------------------------------------------------------
+
+def benchmark_honeycomb(rows: int = 1_000_000, repeats: int = 20):
+    """Measure hot query latency at `rows` rows per table, with and without indexes"""
+    import tempfile
+
+    tmp_dir = tempfile.mkdtemp(prefix="honeycomb_bench_")
+    db_path = os.path.join(tmp_dir, "bench.db")
+    honeycomb = Honeycomb(db_path)
+    now = time.time()
+
+    print(f"Populating {rows:,} rows per table in {db_path}...")
+    start = time.perf_counter()
+    with sqlite3.connect(db_path) as conn:
+        conn.executemany(
+            'INSERT INTO bees VALUES (?, ?, ?, ?, ?)',
+            ((f"bee{i:09d}", f"chat_{i}", 'deployment', '{"ephemeral": true}', now - i) for i in range(rows))
+        )
+        conn.executemany(
+            'INSERT INTO instances VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+            ((f"bee{i:09d}_{i}", f"bee{i % (rows // 4 or 1):09d}", TERMINAL_STATES[i % 3],
+              '{}', None, now - i, now - i + 1, '[]') for i in range(rows))
+        )
+        conn.executemany(
+            'INSERT INTO memory (query, response, correction, timestamp, bee_id) VALUES (?, ?, ?, ?, ?)',
+            ((f"q{i}", f"r{i}", None, now - i, f"bee{i:09d}") for i in range(rows))
+        )
+    print(f"  populated in {time.perf_counter() - start:.1f}s")
+
+    queries = {
+        'get_recent_memory(10)': lambda: honeycomb.get_recent_memory(10),
+        'list_bees(limit=50)': lambda: honeycomb.list_bees(limit=50),
+        'list_instances(bee, state)': lambda: honeycomb.list_instances("bee000000042", BeeState.COMPLETED),
+    }
+
+    def measure() -> Dict[str, float]:
+        results = {}
+        for name, fn in queries.items():
+            fn()  # warm page cache
+            start = time.perf_counter()
+            for _ in range(repeats):
+                fn()
+            results[name] = (time.perf_counter() - start) / repeats * 1000
+        return results
+
+    with sqlite3.connect(db_path) as conn:
+        for index in ('idx_memory_timestamp', 'idx_instances_bee_state', 'idx_bees_created_at'):
+            conn.execute(f'DROP INDEX {index}')
+    without = measure()
+
+    honeycomb._init_db()
+    honeycomb.optimize(vacuum=False)
+    with_idx = measure()
+
+    print(f"\n{'query':<30} {'no index':>12} {'indexed':>12}")
+    for name in queries:
+        print(f"{name:<30} {without[name]:>10.2f}ms {with_idx[name]:>10.2f}ms")
+
+    start = time.perf_counter()
+    archived = honeycomb.apply_retention(
+        RetentionPolicy(memory_days=1, instance_days=1, archive_path=os.path.join(tmp_dir, "archive")),
+        now=now + 86400 - rows / 2
+    )
+    print(f"\nRetention archived {archived} in {time.perf_counter() - start:.1f}s")
+
+    import shutil
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+
 # ---------------------------------------------------------------------------
 # CLI Interface
 # ---------------------------------------------------------------------------
@@ -624,12 +940,22 @@ def main():
     chat_parser = subparsers.add_parser('chat', help='Quick chat')
     chat_parser.add_argument('--query', required=True)
 
+    maintain_parser = subparsers.add_parser('maintain', help='Apply retention, archive old rows, VACUUM/ANALYZE')
+    maintain_parser.add_argument('--force', action='store_true', help='VACUUM even if not yet due')
+
+    bench_parser = subparsers.add_parser('bench', help='Benchmark honeycomb query latency')
+    bench_parser.add_argument('--rows', type=int, default=1_000_000)
+
     args = parser.parse_args()
 
     if not args.command:
         parser.print_help()
         return
 
+    if args.command == 'bench':
+        benchmark_honeycomb(args.rows)
+        return
+
     config_path = Path('./hivemind.yaml')
     config = HiveConfig.from_yaml(config_path) if config_path.exists() else HiveConfig()
     hive = HiveMind(config)
@@ -681,5 +1007,14 @@ hive:
         instance_id = hive.deploy_chat(args.query)
         print(f"Chat: {instance_id}")
 
-    if __name__ == '__main__':
-        main()
\ No newline at end of file
+    elif args.command == 'maintain':
+        hive.stop_maintenance()
+        report = hive.run_maintenance(force=args.force)
+        for table, count in report['archived'].items():
+            print(f"Archived {count:>8} rows from {table}")
+        for task, seconds in report.get('timings', {}).items():
+            print(f"{task.upper():<8} {seconds * 1000:.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
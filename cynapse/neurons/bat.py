@@ -1,42 +1,80 @@
 #!/usr/bin/env python3
 """
 Ghost Shell v3.0 - Threshold Cryptographic Vault
-2-of-3 Shamir Secret Sharing | AES-256-GCM | Hardware Attestation | Cynapse Native
+k-of-n Shamir Secret Sharing | AES-256-GCM | Hardware Attestation | Cynapse Native
 """
 
 import asyncio
 import base64
+import concurrent.futures
 import hashlib
 import hmac
 import json
+import math
+import mmap
+import multiprocessing
 import os
 import secrets
 import struct
 import subprocess
 import sys
 import tempfile
+import threading
 import time
 import wave
+from array import array
 from dataclasses import dataclass, asdict
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Union, Callable
+from typing import BinaryIO, Dict, List, Optional, Tuple, Union, Callable
 import ctypes
 import ctypes.util
 
+try:
+    import numpy as np  # Optional: vectorized XOR and ChaCha20 keystream
+except ImportError:
+    np = None
+
+try:
+    from cryptography.exceptions import InvalidTag
+    from cryptography.hazmat.primitives.ciphers import Cipher as _Cipher, algorithms as _algorithms
+    from cryptography.hazmat.primitives.ciphers.aead import ChaCha20Poly1305 as _OpenSSLChaCha20Poly1305
+except ImportError:
+    _OpenSSLChaCha20Poly1305 = None
+
 
 # --- Cryptographic Primitives (Minimal Dependencies) ---
-# Pure Python ChaCha20-Poly1305 (no external crypto libs)
+# ChaCha20-Poly1305 (RFC 8439): OpenSSL when available, NumPy or pure Python otherwise
 class ChaCha20Poly1305:
     """
-    Pure Python ChaCha20-Poly1305 for environments without cryptography package
-    Slower than OpenSSL but zero dependencies
+    ChaCha20-Poly1305 AEAD with interchangeable backends
+    "cryptography" (OpenSSL), "numpy" (vectorized keystream) or "python"
+    (zero dependencies). All backends produce identical ciphertexts and tags.
     """
     
-    def __init__(self, key: bytes):
+    BACKENDS = ("cryptography", "numpy", "python")
+    CONSTANTS = (0x61707865, 0x3320646e, 0x79622d32, 0x6b206574)
+    BATCH_BLOCKS = 16384  # 1 MB of keystream per NumPy batch
+    
+    def __init__(self, key: bytes, backend: Optional[str] = None):
         if len(key) != 32:
             raise ValueError("Key must be 32 bytes")
         self.key = key
+        self.backend = backend or self.available_backends()[0]
+        if self.backend not in self.available_backends():
+            raise ValueError(f"ChaCha20 backend unavailable: {self.backend}")
+        self._aead = _OpenSSLChaCha20Poly1305(key) if self.backend == "cryptography" else None
+    
+    @classmethod
+    def available_backends(cls) -> List[str]:
+        """Usable backends, fastest first"""
+        available = []
+        if _OpenSSLChaCha20Poly1305 is not None:
+            available.append("cryptography")
+        if np is not None:
+            available.append("numpy")
+        available.append("python")
+        return available
     
     def _quarter_round(self, a: int, b: int, c: int, d: int) -> Tuple[int, int, int, int]:
         a = (a + b) & 0xffffffff
@@ -54,13 +92,11 @@ class ChaCha20Poly1305:
         return a, b, c, d
     
     def _chacha_block(self, key: bytes, nonce: bytes, counter: int) -> bytes:
-        # Constants
-        constants = [0x61707865, 0x3320646e, 0x79622d32, 0x6b206574]
+        # RFC 8439 state: constants | key | 32-bit block counter | 96-bit nonce
         key_words = struct.unpack('<8I', key)
-        counter_words = [counter & 0xffffffff, (counter >> 32) & 0xffffffff]
-        nonce_words = struct.unpack('<3I', nonce.ljust(12, b'\x00')[:12])
+        nonce_words = struct.unpack('<3I', nonce)
         
-        state = list(constants) + list(key_words) + counter_words + list(nonce_words)
+        state = list(self.CONSTANTS) + list(key_words) + [counter & 0xffffffff] + list(nonce_words)
         working = state[:]
         
         for _ in range(10):
@@ -86,41 +122,339 @@ class ChaCha20Poly1305:
         output = struct.pack('<16I', *[(s + w) & 0xffffffff for s, w in zip(state, working)])
         return output
     
+    def _chacha_blocks_numpy(self, nonce: bytes, counter: int, nblocks: int) -> bytes:
+        """Compute nblocks consecutive keystream blocks as parallel uint32 lanes"""
+        state = np.empty((16, nblocks), dtype=np.uint32)
+        state[0:4] = np.array(self.CONSTANTS, dtype=np.uint32)[:, None]
+        state[4:12] = np.frombuffer(self.key, dtype='<u4')[:, None]
+        state[12] = (counter + np.arange(nblocks, dtype=np.uint64)) & 0xffffffff
+        state[13:16] = np.frombuffer(nonce, dtype='<u4')[:, None]
+        x = [row.copy() for row in state]
+        
+        def quarter_round(a, b, c, d):
+            for dst, src, add, rot in ((a, b, d, 16), (c, d, b, 12), (a, b, d, 8), (c, d, b, 7)):
+                # dst += src; add ^= dst; add <<<= rot
+                x[dst] += x[src]
+                x[add] ^= x[dst]
+                high = x[add] << rot
+                x[add] >>= 32 - rot
+                x[add] |= high
+        
+        for _ in range(10):
+            quarter_round(0, 4, 8, 12)
+            quarter_round(1, 5, 9, 13)
+            quarter_round(2, 6, 10, 14)
+            quarter_round(3, 7, 11, 15)
+            quarter_round(0, 5, 10, 15)
+            quarter_round(1, 6, 11, 12)
+            quarter_round(2, 7, 8, 13)
+            quarter_round(3, 4, 9, 14)
+        
+        out = np.stack(x)
+        out += state
+        return out.T.astype('<u4', copy=False).tobytes()
+    
+    def _keystream(self, nonce: bytes, counter: int, length: int) -> bytes:
+        nblocks = (length + 63) // 64
+        if self.backend == "python":
+            stream = b''.join(self._chacha_block(self.key, nonce, counter + i) for i in range(nblocks))
+        else:
+            stream = b''.join(
+                self._chacha_blocks_numpy(nonce, counter + i, min(self.BATCH_BLOCKS, nblocks - i))
+                for i in range(0, nblocks, self.BATCH_BLOCKS))
+        return stream[:length]
+    
+    def _xor_keystream(self, data: bytes, nonce: bytes, counter: int = 1) -> bytes:
+        stream = self._keystream(nonce, counter, len(data))
+        if np is not None:
+            return np.bitwise_xor(np.frombuffer(data, np.uint8), np.frombuffer(stream, np.uint8)).tobytes()
+        return (int.from_bytes(data, 'little') ^ int.from_bytes(stream, 'little')).to_bytes(len(data), 'little')
+    
+    @staticmethod
+    def _poly1305(key: bytes, msg: bytes) -> bytes:
+        """One-time Poly1305 authenticator (RFC 8439 section 2.5)"""
+        p = (1 << 130) - 5
+        mask = (1 << 130) - 1
+        r = int.from_bytes(key[:16], 'little') & 0x0ffffffc0ffffffc0ffffffc0fffffff
+        s = int.from_bytes(key[16:], 'little')
+        from_bytes = int.from_bytes
+        
+        acc = 0
+        full = len(msg) - len(msg) % 16
+        for i in range(0, full, 16):
+            acc = (acc + from_bytes(msg[i:i+16], 'little') + (1 << 128)) * r
+            acc = (acc & mask) + 5 * (acc >> 130)  # Partial reduction mod 2^130 - 5
+        if full < len(msg):
+            tail = msg[full:]
+            acc = (acc + from_bytes(tail, 'little') + (1 << (8 * len(tail)))) * r
+        acc %= p
+        return ((acc + s) & ((1 << 128) - 1)).to_bytes(16, 'little')
+    
+    def _tag(self, nonce: bytes, ciphertext: bytes, aad: bytes) -> bytes:
+        poly_key = self._keystream(nonce, 0, 32)
+        mac_data = (aad + b'\x00' * (-len(aad) % 16) +
+                    ciphertext + b'\x00' * (-len(ciphertext) % 16) +
+                    struct.pack('<QQ', len(aad), len(ciphertext)))
+        return self._poly1305(poly_key, mac_data)
+    
+    @staticmethod
+    def _normalize_nonce(nonce: bytes) -> bytes:
+        return nonce.ljust(12, b'\x00')[:12]
+    
     def encrypt(self, plaintext: bytes, nonce: bytes, aad: bytes = b'') -> Tuple[bytes, bytes]:
         """Encrypt and return (ciphertext, tag)"""
-        if len(nonce) < 12:
-            nonce = nonce.ljust(12, b'\x00')
+        nonce = self._normalize_nonce(nonce)
+        if self._aead is not None:
+            sealed = self._aead.encrypt(nonce, plaintext, aad)
+            return sealed[:-16], sealed[-16:]
         
-        # Generate Poly1305 key
-        block = self._chacha_block(self.key, nonce, 0)
-        poly_key = block[:32]
-        
-        # Encrypt
-        ciphertext = bytearray()
-        counter = 1
-        for i in range(0, len(plaintext), 64):
-            block = self._chacha_block(self.key, nonce, counter)
-            chunk = plaintext[i:i+64]
-            ciphertext.extend(b ^ k for b, k in zip(chunk, block[:len(chunk)]))
-            counter += 1
-        
-        # Poly1305 tag (simplified - full implementation would use proper MAC)
-        tag = hmac.new(poly_key, aad + bytes(ciphertext), hashlib.sha256).digest()[:16]
-        
-        return bytes(ciphertext), tag
+        ciphertext = self._xor_keystream(plaintext, nonce)
+        return ciphertext, self._tag(nonce, ciphertext, aad)
     
     def decrypt(self, ciphertext: bytes, nonce: bytes, tag: bytes, aad: bytes = b'') -> Optional[bytes]:
-        """Verify tag and decrypt"""
-        computed_tag, _ = self.encrypt(ciphertext, nonce, aad)  # Re-encrypt to verify
-        if not hmac.compare_digest(tag, computed_tag[:16]):
+        """Verify tag and decrypt in a single keystream pass"""
+        nonce = self._normalize_nonce(nonce)
+        if self._aead is not None:
+            try:
+                return self._aead.decrypt(nonce, ciphertext + tag, aad)
+            except InvalidTag:
+                return None
+        
+        if not hmac.compare_digest(tag, self._tag(nonce, ciphertext, aad)):
             return None
-        
-        # XOR is symmetric
-        plaintext, _ = self.encrypt(ciphertext, nonce, aad)
+        return self._xor_keystream(ciphertext, nonce)
+
+
+# --- Chunked AEAD Container ---
+@dataclass
+class ContainerHeader:
+    """Parsed header of a segmented encrypted container"""
+    segment_size: int
+    nonce_prefix: bytes
+    plaintext_size: int
+    raw: bytes
+    
+    @property
+    def segment_count(self) -> int:
+        return max(1, -(-self.plaintext_size // self.segment_size))
+    
+    @property
+    def record_size(self) -> int:
+        """On-disk size of a full segment record"""
+        return SegmentedCipher.SEGMENT_HEADER.size + self.segment_size + SegmentedCipher.TAG_SIZE
+    
+    def segment_offset(self, index: int) -> int:
+        return len(self.raw) + index * self.record_size
+    
+    def segment_length(self, index: int) -> int:
+        """Plaintext bytes held by segment `index`"""
+        return min(self.segment_size, self.plaintext_size - index * self.segment_size)
+
+
+class SegmentedCipher:
+    """
+    Chunked ChaCha20-Poly1305 container for large payloads
+    
+    Layout:
+        header   magic(8) | version(1) | segment_size(4) | nonce_prefix(8) | plaintext_size(8)
+        segment  index(8) | length(4) | ciphertext(length) | tag(16)    (repeated)
+    
+    Segment i uses nonce = nonce_prefix || i (big-endian u32) and the file
+    header plus its own index/length as AAD, so segments cannot be
+    reordered, swapped between files or truncated without detection.
+    Every record except the last is the same size, so any segment can be
+    located and verified independently (constant memory, random access).
+    """
+    
+    MAGIC = b"CYGHOST2"
+    VERSION = 1
+    HEADER = struct.Struct("<8sBI8sQ")
+    SEGMENT_HEADER = struct.Struct("<QI")
+    TAG_SIZE = 16
+    DEFAULT_SEGMENT_SIZE = 4 << 20
+    
+    def __init__(self, key: bytes, segment_size: int = DEFAULT_SEGMENT_SIZE, backend: Optional[str] = None):
+        self.cipher = ChaCha20Poly1305(key, backend=backend)
+        self.segment_size = segment_size
+    
+    @staticmethod
+    def _segment_nonce(header: ContainerHeader, index: int) -> bytes:
+        if index >= 1 << 32:
+            raise ValueError("Too many segments for one container")
+        return header.nonce_prefix + struct.pack(">I", index)
+    
+    @classmethod
+    def read_header(cls, src: BinaryIO) -> ContainerHeader:
+        raw = src.read(cls.HEADER.size)
+        if len(raw) != cls.HEADER.size:
+            raise ValueError("Truncated container header")
+        magic, version, segment_size, nonce_prefix, plaintext_size = cls.HEADER.unpack(raw)
+        if magic != cls.MAGIC or version != cls.VERSION:
+            raise ValueError("Not a Ghost Shell container")
+        if segment_size == 0:
+            raise ValueError("Invalid segment size")
+        return ContainerHeader(segment_size, nonce_prefix, plaintext_size, raw)
+    
+    def encrypt_segment(self, header: ContainerHeader, index: int, plaintext: bytes) -> bytes:
+        record_header = self.SEGMENT_HEADER.pack(index, len(plaintext))
+        ciphertext, tag = self.cipher.encrypt(plaintext, self._segment_nonce(header, index),
+                                              header.raw + record_header)
+        return record_header + ciphertext + tag
+    
+    def decrypt_segment(self, header: ContainerHeader, index: int, record: bytes) -> bytes:
+        """Verify and decrypt one segment record; raises ValueError on tampering"""
+        hsize = self.SEGMENT_HEADER.size
+        if len(record) < hsize:
+            raise ValueError(f"Segment {index}: truncated record")
+        stored_index, length = self.SEGMENT_HEADER.unpack(record[:hsize])
+        if stored_index != index or length != header.segment_length(index) \
+                or len(record) != hsize + length + self.TAG_SIZE:
+            raise ValueError(f"Segment {index}: corrupt record header")
+        plaintext = self.cipher.decrypt(record[hsize:hsize + length], self._segment_nonce(header, index),
+                                        record[hsize + length:], header.raw + record[:hsize])
+        if plaintext is None:
+            raise ValueError(f"Segment {index}: authentication failed")
         return plaintext
+    
+    def encrypt_stream(self, src: BinaryIO, dst: BinaryIO, plaintext_size: int) -> ContainerHeader:
+        """Encrypt plaintext_size bytes from src into dst, one segment at a time"""
+        nonce_prefix = secrets.token_bytes(8)
+        raw = self.HEADER.pack(self.MAGIC, self.VERSION, self.segment_size, nonce_prefix, plaintext_size)
+        header = ContainerHeader(self.segment_size, nonce_prefix, plaintext_size, raw)
+        dst.write(raw)
+        for index in range(header.segment_count):
+            chunk = src.read(header.segment_length(index))
+            if len(chunk) != header.segment_length(index):
+                raise ValueError("Source ended before declared size")
+            dst.write(self.encrypt_segment(header, index, chunk))
+        return header
+    
+    def decrypt_stream(self, src: BinaryIO, dst: BinaryIO,
+                       progress: Optional[Callable[[int, int], None]] = None) -> int:
+        """
+        Verify and decrypt a container segment by segment
+        
+        Plaintext is only written after its segment verifies. Raises
+        ValueError on the first bad segment. Returns bytes written.
+        """
+        header = self.read_header(src)
+        written = 0
+        for index in range(header.segment_count):
+            record = src.read(self.SEGMENT_HEADER.size + header.segment_length(index) + self.TAG_SIZE)
+            dst.write(self.decrypt_segment(header, index, record))
+            written += header.segment_length(index)
+            if progress:
+                progress(written, header.plaintext_size)
+        if src.read(1):
+            raise ValueError("Trailing data after final segment")
+        return written
+    
+    def decrypt_file(self, src_path: Union[str, Path], dst_path: Union[str, Path],
+                     workers: Optional[int] = None, batch_segments: int = 4,
+                     progress: Optional[Callable[[int, int], None]] = None) -> int:
+        """
+        Decrypt a container across a process pool
+        
+        The output is preallocated and each worker verifies its segments and
+        writes them straight to their offsets, so throughput scales with
+        cores. Raises ValueError if any segment fails; the output is then
+        partially written and must be discarded by the caller.
+        """
+        with open(src_path, 'rb') as src:
+            header = self.read_header(src)
+            expected = header.segment_offset(header.segment_count - 1) + self.SEGMENT_HEADER.size \
+                + header.segment_length(header.segment_count - 1) + self.TAG_SIZE
+            if os.fstat(src.fileno()).st_size != expected:
+                raise ValueError("Container size does not match its header")
+        
+        with open(dst_path, 'wb') as dst:
+            os.ftruncate(dst.fileno(), header.plaintext_size)
+            if hasattr(os, "posix_fallocate") and header.plaintext_size:
+                try:
+                    os.posix_fallocate(dst.fileno(), 0, header.plaintext_size)
+                except OSError:
+                    pass  # Sparse output is fine (e.g. tmpfs without fallocate)
+        
+        batches = [(start, min(start + batch_segments, header.segment_count))
+                   for start in range(0, header.segment_count, batch_segments)]
+        workers = max(1, min(workers or os.cpu_count() or 1, len(batches)))
+        args = (self.cipher.key, self.cipher.backend, str(src_path), str(dst_path))
+        done = 0
+        
+        if workers == 1:
+            for start, stop in batches:
+                done += _decrypt_segment_batch(*args, start, stop)
+                if progress:
+                    progress(done, header.plaintext_size)
+            return done
+        
+        # Workers must not be forked: the caller typically runs an event loop
+        # and helper threads whose held locks a fork would copy
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            futures = [pool.submit(_decrypt_segment_batch, *args, start, stop) for start, stop in batches]
+            try:
+                for future in concurrent.futures.as_completed(futures):
+                    done += future.result()
+                    if progress:
+                        progress(done, header.plaintext_size)
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                raise
+        return done
+
+
+def _decrypt_segment_batch(key: bytes, backend: str, src_path: str, dst_path: str,
+                           start: int, stop: int) -> int:
+    """Process-pool worker: verify and decrypt segments [start, stop) in place"""
+    cipher = SegmentedCipher(key, backend=backend)
+    written = 0
+    with open(src_path, 'rb') as src, open(dst_path, 'r+b') as dst:
+        header = SegmentedCipher.read_header(src)
+        for index in range(start, stop):
+            length = header.segment_length(index)
+            record = os.pread(src.fileno(), SegmentedCipher.SEGMENT_HEADER.size + length + SegmentedCipher.TAG_SIZE,
+                              header.segment_offset(index))
+            plaintext = memoryview(cipher.decrypt_segment(header, index, record))
+            offset = index * header.segment_size
+            while plaintext:
+                n = os.pwrite(dst.fileno(), plaintext, offset)
+                plaintext, offset = plaintext[n:], offset + n
+            written += length
+    return written
+
+
+class _HashingWriter:
+    """File wrapper that hashes everything written through it"""
+    
+    def __init__(self, f: BinaryIO):
+        self.f = f
+        self.hash = hashlib.sha256()
+    
+    def write(self, data: bytes) -> int:
+        self.hash.update(data)
+        return self.f.write(data)
+
+
+# --- Shamir's Secret Sharing (k-of-n) ---
+def _build_gf_tables() -> Tuple[List[int], List[int]]:
+    """Log/antilog tables for GF(2^8) with generator 0x03"""
+    exp = [0] * 512
+    log = [0] * 256
+    x = 1
+    for i in range(255):
+        exp[i] = x
+        log[x] = i
+        # x *= 3  (x*2 reduced mod 0x11b, then xor x)
+        x ^= ((x << 1) ^ (0x1b if x & 0x80 else 0)) & 0xff
+    # Duplicate so exp[log[a] + log[b]] never needs a modulo
+    for i in range(255, 512):
+        exp[i] = exp[i - 255]
+    return exp, log
 
 
-# --- Shamir's Secret Sharing (2-of-3) ---
 class ShamirSecretSharing:
     """
     Threshold cryptography: split secret into n shares, any k can reconstruct
@@ -129,33 +463,43 @@ class ShamirSecretSharing:
     
     # AES irreducible polynomial for GF(2^8)
     PRIME = 0x11b
+    EXP, LOG = _build_gf_tables()
+    _MUL_ROWS: List[Optional[bytes]] = [None] * 256
     
     @staticmethod
     def _gf_mul(a: int, b: int) -> int:
         """Multiply in GF(2^8)"""
-        result = 0
-        for _ in range(8):
-            if b & 1:
-                result ^= a
-            high_bit = a & 0x80
-            a <<= 1
-            if high_bit:
-                a ^= 0x1b  # Reduce mod x^8 + x^4 + x^3 + x + 1
-            b >>= 1
-        return result & 0xff
+        if a == 0 or b == 0:
+            return 0
+        return ShamirSecretSharing.EXP[ShamirSecretSharing.LOG[a] + ShamirSecretSharing.LOG[b]]
     
     @staticmethod
     def _gf_inv(a: int) -> int:
-        """Multiplicative inverse in GF(2^8) using extended Euclidean algorithm"""
+        """Multiplicative inverse in GF(2^8): a^-1 = g^(255 - log a)"""
         if a == 0:
             return 0
-        # Fermat's little theorem: a^-1 = a^(254) mod p
-        result = 1
-        power = a
-        for _ in range(7):  # 254 = 11111110 binary
-            power = ShamirSecretSharing._gf_mul(power, power)
-            result = ShamirSecretSharing._gf_mul(result, power)
-        return result
+        return ShamirSecretSharing.EXP[255 - ShamirSecretSharing.LOG[a]]
+    
+    @classmethod
+    def _mul_row(cls, scalar: int) -> bytes:
+        """256-byte translation table mapping every byte b to scalar * b"""
+        row = cls._MUL_ROWS[scalar]
+        if row is None:
+            row = bytes(cls._gf_mul(scalar, b) for b in range(256))
+            cls._MUL_ROWS[scalar] = row
+        return row
+    
+    @classmethod
+    def _gf_mul_bytes(cls, data: bytes, scalar: int) -> bytes:
+        """Multiply every byte of data by scalar (C-speed table lookup)"""
+        return data.translate(cls._mul_row(scalar))
+    
+    @staticmethod
+    def _xor_bytes(a: bytes, b: bytes) -> bytes:
+        """Bytewise a ^ b for equal-length buffers"""
+        if np is not None:
+            return np.bitwise_xor(np.frombuffer(a, np.uint8), np.frombuffer(b, np.uint8)).tobytes()
+        return (int.from_bytes(a, 'little') ^ int.from_bytes(b, 'little')).to_bytes(len(a), 'little')
     
     @classmethod
     def split(cls, secret: bytes, n: int = 3, k: int = 2) -> List[Tuple[int, bytes]]:
@@ -164,21 +508,38 @@ class ShamirSecretSharing:
         
         Returns: List of (share_id, share_bytes) tuples
         """
+        if not 2 <= k <= n <= 255:
+            raise ValueError("Require 2 <= k <= n <= 255")
+        
         # Generate random polynomial coefficients (degree k-1)
         coeffs = [secret] + [secrets.token_bytes(len(secret)) for _ in range(k - 1)]
         
         shares = []
         for x in range(1, n + 1):
-            # Evaluate polynomial at point x
-            y = bytearray(len(secret))
-            for power, coeff in enumerate(coeffs):
-                term = bytearray(c if power == 0 else cls._gf_mul(c, pow(x, power, 256)) 
-                               for c in coeff)
-                y = bytearray(a ^ b for a, b in zip(y, term))
+            # Evaluate polynomial at point x (Horner's rule, whole buffers at a time)
+            y = coeffs[-1]
+            for coeff in reversed(coeffs[:-1]):
+                y = cls._xor_bytes(cls._gf_mul_bytes(y, x), coeff)
             shares.append((x, bytes(y)))
         
         return shares
     
+    @classmethod
+    def _lagrange_weights(cls, xs: List[int]) -> List[int]:
+        """Lagrange basis polynomials li(0) for the given share ids"""
+        weights = []
+        for i, xi in enumerate(xs):
+            li = 1
+            for j, xj in enumerate(xs):
+                if i != j:
+                    # li *= xj / (xj - xi)  evaluated at x=0
+                    den = xj ^ xi  # Subtraction is XOR in GF(2^8)
+                    if den == 0:
+                        raise ValueError("Duplicate share IDs")
+                    li = cls._gf_mul(li, cls._gf_mul(xj, cls._gf_inv(den)))
+            weights.append(li)
+        return weights
+    
     @classmethod
     def reconstruct(cls, shares: List[Tuple[int, bytes]]) -> bytes:
         """
@@ -187,26 +548,58 @@ class ShamirSecretSharing:
         if len(shares) < 2:
             raise ValueError("Need at least 2 shares")
         
-        secret_len = len(shares[0][1])
-        secret = bytearray(secret_len)
+        weights = cls._lagrange_weights([x for x, _ in shares])
+        secret = bytes(len(shares[0][1]))
+        for li, (_, yi) in zip(weights, shares):
+            secret = cls._xor_bytes(secret, cls._gf_mul_bytes(yi, li))
         
-        for i, (xi, yi) in enumerate(shares):
-            # Compute Lagrange basis polynomial li(0)
-            li = 1
-            for j, (xj, _) in enumerate(shares):
-                if i != j:
-                    # li *= xj / (xj - xi)  evaluated at x=0
-                    num = xj
-                    den = (xj - xi) % 256
-                    if den == 0:
-                        raise ValueError("Duplicate share IDs")
-                    li = cls._gf_mul(li, cls._gf_mul(num, cls._gf_inv(den)))
-            
-            # Add li * yi to secret
-            for b in range(secret_len):
-                secret[b] ^= cls._gf_mul(li, yi[b])
+        return secret
+    
+    @classmethod
+    def split_stream(cls, src: BinaryIO, outputs: List[BinaryIO], k: int = 2,
+                     chunk_size: int = 1 << 20) -> int:
+        """
+        Split a stream into len(outputs) shares chunk by chunk
         
-        return bytes(secret)
+        Share x is written to outputs[x-1]. Memory use is bounded by
+        chunk_size regardless of payload size. Returns bytes consumed.
+        """
+        total = 0
+        while True:
+            chunk = src.read(chunk_size)
+            if not chunk:
+                break
+            for (_, share), out in zip(cls.split(chunk, n=len(outputs), k=k), outputs):
+                out.write(share)
+            total += len(chunk)
+        return total
+    
+    @classmethod
+    def reconstruct_stream(cls, inputs: List[Tuple[int, BinaryIO]], dst: BinaryIO,
+                           chunk_size: int = 1 << 20) -> int:
+        """
+        Reconstruct a payload from k share streams, writing it to dst
+        
+        Returns bytes written.
+        """
+        if len(inputs) < 2:
+            raise ValueError("Need at least 2 shares")
+        
+        weights = cls._lagrange_weights([x for x, _ in inputs])
+        total = 0
+        while True:
+            chunks = [f.read(chunk_size) for _, f in inputs]
+            size = len(chunks[0])
+            if any(len(c) != size for c in chunks):
+                raise ValueError("Share streams have different lengths")
+            if not size:
+                break
+            secret = bytes(size)
+            for li, yi in zip(weights, chunks):
+                secret = cls._xor_bytes(secret, cls._gf_mul_bytes(yi, li))
+            dst.write(secret)
+            total += size
+        return total
 
 
 # --- Cynapse Integration ---
@@ -231,21 +624,97 @@ class StickAttestation:
         return hmac.compare_digest(self.attestation_signature, expected_sig)
 
 
-# --- Lightweight Audio (No PyAudio/NumPy) ---
+# --- Lightweight Audio (No PyAudio; NumPy optional) ---
+class GoertzelBank:
+    """
+    Goertzel power at a comb of DFT bins spanning a band around a target
+    
+    A Hann window widens each bin's main lobe to +/-2 bins, so sampling
+    every bin_step=2 bins covers the band with at most ~6 dB scalloping
+    while halving the work. The NumPy backend evaluates every bin with one
+    matrix-vector product; the pure-Python backend runs the classic
+    second-order recurrence once per bin.
+    """
+    
+    BACKENDS = ("numpy", "python")
+    
+    def __init__(self, target_freq: float, sample_rate: int, window_size: int,
+                 tolerance: float = 0.0, bin_step: int = 2, backend: Optional[str] = None):
+        if backend is None:
+            backend = "numpy" if np is not None else "python"
+        if backend not in self.BACKENDS or (backend == "numpy" and np is None):
+            raise ValueError(f"Unavailable Goertzel backend: {backend}")
+        self.backend = backend
+        self.window_size = window_size
+        
+        bin_width = sample_rate / window_size
+        centre = round(target_freq / bin_width)
+        span = int(tolerance / bin_width) // bin_step * bin_step
+        self.bins = [k for k in range(centre - span, centre + span + 1, bin_step)
+                     if 0 < k < window_size // 2]
+        self.freqs = [k * bin_width for k in self.bins]
+        self.coeffs = [2.0 * math.cos(2.0 * math.pi * k / window_size) for k in self.bins]
+        self.window = [0.5 - 0.5 * math.cos(2.0 * math.pi * i / window_size) for i in range(window_size)]
+        
+        if backend == "numpy":
+            phase = 2.0 * np.pi * np.outer(self.bins, np.arange(window_size)) / window_size
+            hann = np.asarray(self.window)
+            self._cos = np.cos(phase) * hann  # Window folded into the basis
+            self._sin = np.sin(phase) * hann
+    
+    def powers(self, samples) -> List[float]:
+        """|X(k)|^2 for each bin; samples is any int16 buffer of window_size frames"""
+        if self.backend == "numpy":
+            if isinstance(samples, np.ndarray):
+                x = samples.astype(np.float64)
+            else:
+                x = np.frombuffer(samples, dtype=np.int16).astype(np.float64)
+            re = self._cos @ x
+            im = self._sin @ x
+            return (re * re + im * im).tolist()
+        
+        windowed = [x * w for x, w in zip(samples, self.window)]
+        result = []
+        for coeff in self.coeffs:
+            s_prev = s_prev2 = 0.0
+            for sample in windowed:
+                s_prev, s_prev2 = sample + coeff * s_prev - s_prev2, s_prev
+            result.append(s_prev2 * s_prev2 + s_prev * s_prev - coeff * s_prev * s_prev2)
+        return result
+
+
 class UltrasonicDetector:
     """
     Raw ALSA/PulseAudio access for 18kHz detection
-    No PyAudio, no NumPy—pure Python + ctypes
+    No PyAudio—ctypes for capture, NumPy used for analysis when present
+    
+    Audio is analysed over a sliding window of CHUNK_SIZE frames that
+    advances by HOP_SIZE, so a whistle is caught regardless of how it
+    straddles capture buffers.
     """
     
     TARGET_FREQ = 18000
     TOLERANCE = 500
     SAMPLE_RATE = 48000
-    CHUNK_SIZE = 1024
+    CHUNK_SIZE = 1024  # Analysis window (frames)
+    HOP_SIZE = 512  # Frames read per ALSA call; window overlaps by CHUNK_SIZE - HOP_SIZE
+    BIN_STEP = 2  # Bank samples every other bin across TARGET_FREQ +/- TOLERANCE
+    POWER_THRESHOLD = 2e9  # Peak Hann-windowed |X(k)|^2; ~175 LSB tone amplitude at CHUNK_SIZE
+    REQUIRED_DETECTIONS = 3  # Consecutive windows above threshold
     
-    def __init__(self):
+    def __init__(self, backend: Optional[str] = None, chunk_size: Optional[int] = None):
+        if chunk_size:
+            # Tone power grows with the window squared, keep the threshold comparable
+            self.POWER_THRESHOLD = type(self).POWER_THRESHOLD * (chunk_size / type(self).CHUNK_SIZE) ** 2
+            self.CHUNK_SIZE = chunk_size
+            self.HOP_SIZE = chunk_size // 2
         self._alsa = None
         self._pcm = None
+        self.replay: Optional[Path] = None  # WAV to use instead of the microphone
+        self.replay_speed = 1.0
+        self.last_detection: Optional[float] = None  # Audio time of the last whistle
+        self.bank = GoertzelBank(self.TARGET_FREQ, self.SAMPLE_RATE, self.CHUNK_SIZE,
+                                 self.TOLERANCE, self.BIN_STEP, backend)
         self._load_alsa()
     
     def _load_alsa(self):
@@ -287,43 +756,140 @@ class UltrasonicDetector:
         self._alsa.snd_pcm_readi.argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.c_ulong]
         self._alsa.snd_pcm_readi.restype = ctypes.c_long
         
+        # PCM recover (xrun / suspend)
+        self._alsa.snd_pcm_recover.argtypes = [ctypes.c_void_p, ctypes.c_int, ctypes.c_int]
+        self._alsa.snd_pcm_recover.restype = ctypes.c_int
+        
         # PCM close
         self._alsa.snd_pcm_close.argtypes = [ctypes.c_void_p]
         self._alsa.snd_pcm_close.restype = ctypes.c_int
     
-    def _simple_fft(self, samples: List[int]) -> List[float]:
-        """
-        Simple DFT for target frequency detection
-        No NumPy—pure Python, optimized for single frequency
+    def _windows(self, blocks):
         """
-        n = len(samples)
-        target_bin = int(self.TARGET_FREQ * n / self.SAMPLE_RATE)
+        Turn a stream of int16 blocks into overlapping CHUNK_SIZE windows
         
-        # Goertzel algorithm for single frequency detection
-        # More efficient than full FFT when looking for one frequency
-        omega = 2.0 * 3.141592653589793 * target_bin / n
-        sine = 0.5  # Precomputed sin/cos for speed
-        cosine = 0.5
+        Yields (frames consumed so far, window); the window is reused.
         
-        coeff = 2.0 * cosine
-        s_prev = 0.0
-        s_prev2 = 0.0
+        Blocks are memoryviews (cast to 'h') or ndarrays; they are copied
+        once into a ring of samples and never converted element by element.
+        """
+        if self.bank.backend == "numpy":
+            window = np.zeros(self.CHUNK_SIZE, dtype=np.int16)
+            view = window
+        else:
+            window = array('h', bytes(2 * self.CHUNK_SIZE))
+            view = memoryview(window)  # Slice assignment between views is a memmove
+        filled = position = 0
+        for block in blocks:
+            n = len(block)
+            if not n:
+                continue
+            position += n
+            if n >= self.CHUNK_SIZE:
+                view[:] = block[n - self.CHUNK_SIZE:]
+            else:
+                view[:self.CHUNK_SIZE - n] = view[n:]
+                view[self.CHUNK_SIZE - n:] = block
+            filled = min(self.CHUNK_SIZE, filled + n)
+            if filled == self.CHUNK_SIZE:
+                yield position, window
+    
+    def analyze(self, window) -> float:
+        """Peak Goertzel power across the bank for one CHUNK_SIZE window"""
+        return max(self.bank.powers(window))
+    
+    def detection_events(self, blocks, callback: Optional[Callable[[float], None]] = None):
+        """
+        Yield the audio time (seconds) of every whistle in a block stream
         
-        for sample in samples:
-            s = sample + coeff * s_prev - s_prev2
-            s_prev2 = s_prev
-            s_prev = s
+        A whistle is REQUIRED_DETECTIONS consecutive windows above
+        POWER_THRESHOLD; the count restarts after each event.
+        """
+        consecutive_detections = 0
+        for position, window in self._windows(blocks):
+            power = self.analyze(window)
+            
+            # Threshold detection
+            if power > self.POWER_THRESHOLD:
+                consecutive_detections += 1
+                if callback:
+                    callback(power)
+                
+                if consecutive_detections >= self.REQUIRED_DETECTIONS:
+                    consecutive_detections = 0
+                    yield position / self.SAMPLE_RATE
+            else:
+                consecutive_detections = 0
+    
+    def _run_detection(self, blocks, callback: Optional[Callable[[float], None]] = None) -> bool:
+        """Feed sample blocks through the sliding window until a whistle or the stream ends"""
+        self.last_detection = next(self.detection_events(blocks, callback), None)
+        return self.last_detection is not None
+    
+    def _wav_blocks(self, path: Union[str, Path], speed: float = 0.0,
+                    max_seconds: float = math.inf):
+        """
+        Replay HOP_SIZE-frame blocks from a mono 16-bit WAV at SAMPLE_RATE
         
-        power = s_prev2 * s_prev2 + s_prev * s_prev - coeff * s_prev * s_prev2
-        return [power]
+        speed=1.0 paces blocks like a live capture, 4.0 plays four times
+        faster, and 0 streams as fast as the analysis keeps up. max_seconds
+        bounds the replay in audio time, so timeouts behave identically at
+        any speed.
+        """
+        max_frames = max_seconds * self.SAMPLE_RATE
+        with wave.open(str(path), 'rb') as wav:
+            if (wav.getnchannels(), wav.getsampwidth(), wav.getframerate()) != (1, 2, self.SAMPLE_RATE):
+                raise ValueError(f"{path}: expected mono 16-bit PCM at {self.SAMPLE_RATE} Hz")
+            start = time.monotonic()
+            frames = 0
+            while frames < max_frames:
+                data = wav.readframes(self.HOP_SIZE)
+                if not data:
+                    return
+                frames += len(data) // 2
+                if speed > 0:
+                    # A capture only returns once the block has been recorded
+                    delay = start + frames / (self.SAMPLE_RATE * speed) - time.monotonic()
+                    if delay > 0:
+                        time.sleep(delay)
+                if self.bank.backend == "numpy":
+                    yield np.frombuffer(data, dtype='<i2')
+                else:
+                    yield memoryview(data).cast('h')
+    
+    def _alsa_blocks(self, pcm, deadline: float):
+        """Capture HOP_SIZE-frame blocks, exposing the ctypes buffer without copying"""
+        buffer = (ctypes.c_int16 * self.HOP_SIZE)()
+        samples = memoryview(buffer).cast('B').cast('h')
+        as_array = np.frombuffer(buffer, dtype=np.int16) if self.bank.backend == "numpy" else None
+        
+        while time.time() < deadline:
+            # Blocking read; no sleep needed
+            frames = self._alsa.snd_pcm_readi(pcm, buffer, self.HOP_SIZE)
+            if frames < 0:
+                # Overrun or suspend: re-prepare the stream; anything else ends capture
+                if self._alsa.snd_pcm_recover(pcm, frames, 1) < 0:
+                    print(f"⚠️  Audio capture failed (ALSA error {frames})")
+                    return
+                continue
+            yield as_array[:frames] if as_array is not None else samples[:frames]
     
     def detect(self, timeout_seconds: float = 30.0, 
-               callback: Optional[Callable[[float], None]] = None) -> bool:
+               callback: Optional[Callable[[float], None]] = None,
+               replay: Optional[Union[str, Path]] = None,
+               speed: Optional[float] = None) -> bool:
         """
         Listen for ultrasonic whistle
         
+        replay (or self.replay) streams a WAV recording instead of the
+        microphone, at speed x real time (self.replay_speed by default).
         Returns: True if detected, False on timeout/error
         """
+        replay = replay or self.replay
+        if replay:
+            speed = self.replay_speed if speed is None else speed
+            return self._run_detection(self._wav_blocks(replay, speed, timeout_seconds), callback)
+        
         if not self._alsa:
             print("ALSA not available, using simulation mode")
             return self._simulate_detection(timeout_seconds)
@@ -341,41 +907,9 @@ class UltrasonicDetector:
             self._alsa.snd_pcm_close(pcm)
             return False
         
-        start_time = time.time()
-        consecutive_detections = 0
-        required_detections = 3
-        
+        deadline = time.time() + timeout_seconds
         try:
-            buffer = (ctypes.c_int16 * self.CHUNK_SIZE)()
-            
-            while time.time() - start_time < timeout_seconds:
-                # Read audio chunk
-                frames = self._alsa.snd_pcm_readi(pcm, buffer, self.CHUNK_SIZE)
-                if frames < 0:
-                    continue  # Error, retry
-                
-                # Convert to Python list
-                samples = [buffer[i] for i in range(frames)]
-                
-                # Analyze
-                power = self._simple_fft(samples)[0]
-                
-                # Threshold detection
-                if power > 1e8:  # Adjust based on testing
-                    consecutive_detections += 1
-                    if callback:
-                        callback(power)
-                    
-                    if consecutive_detections >= required_detections:
-                        return True
-                else:
-                    consecutive_detections = 0
-                
-                # Small sleep to prevent CPU spin
-                time.sleep(0.001)
-            
-            return False
-            
+            return self._run_detection(self._alsa_blocks(pcm, deadline), callback)
         finally:
             self._alsa.snd_pcm_close(pcm)
     
@@ -561,19 +1095,198 @@ ENCRYPTED_BLOB: {base64.b64encode(secrets.token_bytes(64)).decode()}
 '''
 
 
+# --- Secure Wipe ---
+@dataclass
+class WipeResult:
+    """Outcome of wiping a single file"""
+    path: Path
+    size: int
+    passes: int
+    seconds: float
+    punched: bool = False
+    
+    @property
+    def mb_per_s(self) -> float:
+        return self.size * self.passes / (1 << 20) / max(self.seconds, 1e-9)
+
+
+class SecureWiper:
+    """
+    Full-file overwrite engine for large assembled artifacts
+    
+    Every byte of the file is overwritten on each pass from a page-aligned
+    buffer filled with a ChaCha20 keystream under a fresh random key
+    (os.urandom when the cryptography package is missing). Each pass can be
+    flushed with fdatasync, and the blocks can be released with
+    fallocate(PUNCH_HOLE) before the file is renamed and unlinked.
+    
+    Overwriting cannot reach blocks an SSD or copy-on-write filesystem
+    has already remapped; RAM-only assembly avoids the problem entirely.
+    """
+    
+    BUFFER_SIZE = 4 << 20
+    FALLOC_FL_KEEP_SIZE = 0x01
+    FALLOC_FL_PUNCH_HOLE = 0x02
+    
+    def __init__(self, passes: int = 1, buffer_size: int = BUFFER_SIZE,
+                 sync: bool = True, punch_hole: bool = False):
+        if passes < 1:
+            raise ValueError("At least one pass is required")
+        self.passes = passes
+        self.buffer_size = max(mmap.PAGESIZE, buffer_size // mmap.PAGESIZE * mmap.PAGESIZE)
+        self.sync = sync
+        self.punch_hole = punch_hole
+        self._fallocate = self._load_fallocate() if punch_hole else None
+    
+    @staticmethod
+    def _load_fallocate():
+        """libc fallocate(2), which Python only exposes in its posix_fallocate form"""
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+            fallocate = libc.fallocate
+        except (OSError, AttributeError, TypeError):
+            return None
+        fallocate.argtypes = [ctypes.c_int, ctypes.c_int, ctypes.c_int64, ctypes.c_int64]
+        fallocate.restype = ctypes.c_int
+        return fallocate
+    
+    def _fill(self, buf: mmap.mmap, zeros: bytes, encryptor):
+        if encryptor is not None:
+            encryptor.update_into(zeros, buf)
+        else:
+            buf[:] = os.urandom(len(buf))
+    
+    def _overwrite(self, fd: int, size: int, buf: mmap.mmap, zeros: bytes):
+        encryptor = None
+        if _OpenSSLChaCha20Poly1305 is not None:
+            algorithm = _algorithms.ChaCha20(secrets.token_bytes(32), secrets.token_bytes(16))
+            encryptor = _Cipher(algorithm, mode=None).encryptor()
+        view = memoryview(buf)
+        offset = 0
+        while offset < size:
+            self._fill(buf, zeros, encryptor)
+            chunk = view[:min(self.buffer_size, size - offset)]
+            while chunk:
+                n = os.pwrite(fd, chunk, offset)
+                chunk, offset = chunk[n:], offset + n
+        view.release()
+    
+    def wipe(self, path: Union[str, Path]) -> Optional[WipeResult]:
+        """Overwrite, optionally deallocate, rename and unlink one file"""
+        path = Path(path)
+        if not path.exists():
+            return None
+        
+        start = time.perf_counter()
+        punched = False
+        buf = mmap.mmap(-1, self.buffer_size)  # Anonymous maps are page-aligned
+        zeros = bytes(self.buffer_size)
+        try:
+            fd = os.open(path, os.O_WRONLY | getattr(os, "O_CLOEXEC", 0))
+            try:
+                size = os.fstat(fd).st_size
+                for _ in range(self.passes):
+                    self._overwrite(fd, size, buf, zeros)
+                    if self.sync:
+                        getattr(os, "fdatasync", os.fsync)(fd)
+                if self._fallocate is not None and size:
+                    mode = self.FALLOC_FL_PUNCH_HOLE | self.FALLOC_FL_KEEP_SIZE
+                    punched = self._fallocate(fd, mode, 0, size) == 0
+                os.ftruncate(fd, 0)
+            finally:
+                os.close(fd)
+        finally:
+            buf.close()
+        
+        # Rename to random, then delete, so the name does not linger either
+        random_path = path.parent / secrets.token_hex(16)
+        path.rename(random_path)
+        random_path.unlink()
+        
+        return WipeResult(path, size, self.passes, time.perf_counter() - start, punched)
+    
+    def wipe_many(self, paths: List[Union[str, Path]], workers: Optional[int] = None) -> List[WipeResult]:
+        """Wipe several files concurrently; pwrite and fdatasync release the GIL"""
+        paths = list(paths)
+        if not paths:
+            return []
+        workers = max(1, min(workers or os.cpu_count() or 1, len(paths)))
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(self.wipe, paths))
+        return [r for r in results if r is not None]
+
+
+# --- RAM-only Assembly ---
+@dataclass
+class AssembledModel:
+    """
+    Decrypted model plus the storage it lives in
+    
+    kind is "memfd" (anonymous, never linked into any filesystem), "shm"
+    (tmpfs under /dev/shm) or "disk" (legacy temp directory). For memfd the
+    path is the /proc fd link, which pool workers and loaders can open.
+    """
+    path: Path
+    kind: str
+    fd: Optional[int] = None
+    
+    @property
+    def ram_only(self) -> bool:
+        return self.kind in ("memfd", "shm")
+    
+    def mmap(self) -> mmap.mmap:
+        """Read-only, zero-copy view of the decrypted model"""
+        if self.fd is not None:
+            return mmap.mmap(self.fd, 0, access=mmap.ACCESS_READ)
+        with open(self.path, 'rb') as f:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    
+    def release(self, wipe: Optional[Callable[[Path], None]] = None):
+        """Drop the model: pages are freed, nothing ever reached persistent storage"""
+        if self.kind == "disk":
+            if wipe:
+                wipe(self.path)
+            return
+        if self.fd is not None:
+            try:
+                os.ftruncate(self.fd, 0)  # Free pages even if a loader still holds a dup
+                os.close(self.fd)
+            except OSError:
+                pass
+            self.fd = None
+        if self.kind == "shm":
+            try:
+                self.path.unlink()
+            except FileNotFoundError:
+                pass
+
+
 # --- Main Ghost Shell Controller ---
 class GhostShell:
     """
     Cynapse Ghost Shell Vault
-    2-of-3 threshold cryptography with hardware attestation
+    k-of-n threshold cryptography with hardware attestation
     """
     
-    STICK_PATHS = [Path(f"/media/bat{i}") for i in range(1, 4)]  # Mount points
+    STICK_MOUNT = "/media/bat{}"  # Mount point pattern, one per share
+    ENCRYPTED_MODEL = "elara.enc"
+    STICK_ROLES = ["whisper_wake", "canary_decoy", "ctf_challenge"]
+    SHARE_MAGIC = b"CYSHARE1"
+    SHARE_HEADER = struct.Struct("<8sBBB")  # magic, share id, threshold, total shares
+    SHM_DIR = Path("/dev/shm")
+    WIPE_PASSES = 3  # Overwrite passes for artifacts that reached a disk
     
-    def __init__(self):
+    def __init__(self, threshold: int = 2, total_shares: int = 3):
+        if not 2 <= threshold <= total_shares <= 255:
+            raise ValueError("Require 2 <= threshold <= total_shares <= 255")
+        self.threshold = threshold
+        self.total_shares = total_shares
         self.detector = UltrasonicDetector()
         self.attestation_key = self._load_attestation_key()
-        self.assembly_key = None  # Derived from 2-of-3 shares
+        self.assembly_key = None  # Derived from k-of-n shares
+        self.assembled: Optional[AssembledModel] = None
+        self._attestation_cache: Dict[Tuple[str, str], Optional[StickAttestation]] = {}
+        self._attestation_lock = threading.Lock()
         self.audit = AuditLogger("bat_ghost")
     
     def _load_attestation_key(self) -> bytes:
@@ -584,14 +1297,27 @@ class GhostShell:
         # Fallback: derive from machine fingerprint
         return hashlib.sha256(os.uname().nodename.encode()).digest()
     
-    def _verify_stick(self, stick_path: Path) -> Optional[StickAttestation]:
-        """Cryptographic verification of stick authenticity"""
+    def _verify_stick(self, stick_path: Path) -> Optional[Tuple[StickAttestation, Dict]]:
+        """
+        Cryptographic verification of stick authenticity
+        
+        Returns the attestation and the parsed manifest, or None. Results
+        are cached per stick keyed by the manifest's SHA-256, so a repeated
+        assemble in the same session only rereads the manifest.
+        """
         manifest_path = stick_path / "manifest.json"
-        if not manifest_path.exists():
+        try:
+            raw = manifest_path.read_bytes()
+        except OSError:
             return None
         
+        cache_key = (str(stick_path), hashlib.sha256(raw).hexdigest())
+        with self._attestation_lock:
+            if cache_key in self._attestation_cache:
+                return self._attestation_cache[cache_key]
+        
         try:
-            data = json.loads(manifest_path.read_text())
+            data = json.loads(raw)
             
             # In production: verify signature chain
             attestation = StickAttestation(
@@ -604,15 +1330,19 @@ class GhostShell:
             )
             
             if attestation.verify(self.attestation_key):
-                return attestation
-            
-            # Failed verification—possible counterfeit
-            self.audit.trigger_canary(str(stick_path), "attestation_failed")
-            return None
+                result = attestation, data
+            else:
+                # Failed verification—possible counterfeit
+                self.audit.trigger_canary(str(stick_path), "attestation_failed")
+                result = None
             
         except Exception as e:
             self.audit.log("stick_verification_error", {"error": str(e)})
-            return None
+            return None  # Not cached: may be a partially written manifest
+        
+        with self._attestation_lock:
+            self._attestation_cache[cache_key] = result
+        return result
     
     async def authenticate_presence(self, timeout: float = 30.0) -> bool:
         """
@@ -633,47 +1363,188 @@ class GhostShell:
         
         return detected
     
+    def mounted_sticks(self) -> List[Tuple[int, Path]]:
+        """(stick number, mount point) of every mounted share stick, in stick order"""
+        template = Path(self.STICK_MOUNT)
+        prefix, _, suffix = template.name.partition("{}")
+        sticks = []
+        try:
+            candidates = list(template.parent.glob(f"{prefix}*{suffix}"))
+        except OSError:
+            return sticks
+        for path in candidates:
+            number = path.name[len(prefix):len(path.name) - len(suffix)]
+            if number.isdigit() and 1 <= int(number) <= 255 and path.is_dir():  # A split has at most 255
+                sticks.append((int(number), path))
+        return sorted(sticks)
+    
+    @property
+    def stick_paths(self) -> List[Path]:
+        """Mount points of the mounted share sticks"""
+        return [path for _, path in self.mounted_sticks()]
+    
+    def _load_share(self, stick_num: int, stick_path: Path,
+                    require_attestation: bool) -> Optional[Tuple[int, bytes, Optional[Tuple[int, int]]]]:
+        """
+        Verify one stick and read its share (blocking; runs in a worker thread)
+        
+        Returns (share_id, share_data, (threshold, total_shares)) with the
+        split parameters taken from the stick manifest, or None for them
+        when the manifest does not record them.
+        """
+        # Verify stick authenticity
+        if require_attestation:
+            verified = self._verify_stick(stick_path)
+            if not verified:
+                print(f"⚠️  Bat-{stick_num}: Attestation failed, possible tampering")
+                return None
+            manifest = verified[1]
+        else:
+            try:
+                manifest = json.loads((stick_path / "manifest.json").read_bytes())
+            except (OSError, ValueError):
+                manifest = {}
+        
+        split = None
+        try:
+            split = (int(manifest["threshold"]), int(manifest["total_shares"]))
+        except (ValueError, KeyError, TypeError):
+            pass
+        
+        # Load share
+        share_path = stick_path / f"share{stick_num}.bin"
+        try:
+            share_data = share_path.read_bytes()
+        except OSError:
+            return None
+        
+        self.audit.log("share_loaded", {
+            "stick_id": f"bat{stick_num}",
+            "share_size": len(share_data)
+        })
+        return stick_num, share_data, split
+    
     def collect_shares(self, require_attestation: bool = True) -> List[Tuple[int, bytes]]:
         """
-        Gather shares from available sticks
+        Gather shares from available sticks (blocking; see collect_shares_async)
         Returns: List of (share_id, share_data) for reconstruction
         """
+        shares, _ = asyncio.run(self.collect_shares_async(require_attestation))
+        return shares
+    
+    async def collect_shares_async(self, require_attestation: bool = True,
+                                   threshold: Optional[int] = None,
+                                   total_shares: Optional[int] = None) -> Tuple[List[Tuple[int, bytes]], int]:
+        """
+        Gather shares from available sticks concurrently
+        
+        Each stick is read in its own thread so slow USB media overlap, and
+        collection stops as soon as threshold valid shares are in hand. The
+        k-of-n split recorded in the stick manifests is authoritative;
+        threshold/total_shares, when given, must agree with it. Sticks from
+        a different split are skipped. Falls back to the configured k-of-n
+        only when no manifest records it.
+        Returns: (List of (share_id, share_data), threshold) for reconstruction
+        Raises: ValueError if an explicit threshold/total_shares disagrees
+        """
+        tasks = [asyncio.create_task(asyncio.to_thread(self._load_share, i, stick_path, require_attestation))
+                 for i, stick_path in self.mounted_sticks()]
         shares = []
-        available_sticks = []
-        
-        for i, stick_path in enumerate(self.STICK_PATHS, 1):
-            if not stick_path.exists():
-                continue
-            
-            # Verify stick authenticity
-            if require_attestation:
-                attestation = self._verify_stick(stick_path)
-                if not attestation:
-                    print(f"⚠️  Bat-{i}: Attestation failed, possible tampering")
+        unrecorded = []  # Shares whose manifest lacks the split parameters
+        split = None
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                share = await next_done
+                if share is None:
                     continue
-            
-            # Load share
-            share_path = stick_path / f"share{i}.bin"
-            if not share_path.exists():
-                continue
-            
-            share_data = share_path.read_bytes()
-            shares.append((i, share_data))
-            available_sticks.append(i)
-            
-            self.audit.log("share_loaded", {
-                "stick_id": f"bat{i}",
-                "share_size": len(share_data)
-            })
+                share_id, share_data, share_split = share
+                if share_split is None:
+                    unrecorded.append((share_id, share_data))
+                    continue
+                if split is None:
+                    split = share_split
+                    k, n = split
+                    if threshold is not None and threshold != k or total_shares is not None and total_shares != n:
+                        raise ValueError(f"Sticks hold a {k}-of-{n} split, not "
+                                         f"{threshold or k}-of-{total_shares or n}")
+                elif share_split != split:
+                    print(f"⚠️  Bat-{share_id}: belongs to a different split "
+                          f"({share_split[0]}-of-{share_split[1]}), skipped")
+                    continue
+                shares.append((share_id, share_data))
+                if len(shares) >= split[0]:
+                    break
+        finally:
+            for task in tasks:
+                task.cancel()  # Threads already reading finish in the background
+        
+        if split is None:
+            split = (threshold or self.threshold, total_shares or self.total_shares)
+            shares = unrecorded
+        k, n = split
+        shares = sorted(shares)[:k]
+        print(f"📦 Collected {len(shares)}/{k} shares ({k}-of-{n}) from sticks: {[s[0] for s in shares]}")
+        return shares, k
+    
+    def _find_encrypted_model(self) -> Optional[Path]:
+        """Encrypted model may travel on any stick or sit next to them"""
+        for stick_path in self.stick_paths:
+            for candidate in (stick_path / self.ENCRYPTED_MODEL, stick_path.parent / self.ENCRYPTED_MODEL):
+                if candidate.exists():
+                    return candidate
+        return None
+    
+    def _create_ram_target(self) -> AssembledModel:
+        """
+        Pick the decryption target: memfd, else /dev/shm, else a temp dir
         
-        print(f"📦 Collected {len(shares)}/3 shares from sticks: {available_sticks}")
-        return shares
+        memfd and tmpfs pages never reach persistent storage, so no wipe
+        pass is needed afterwards.
+        """
+        if hasattr(os, "memfd_create"):
+            try:
+                fd = os.memfd_create("elara.gguf", os.MFD_CLOEXEC)
+                return AssembledModel(Path(f"/proc/{os.getpid()}/fd/{fd}"), "memfd", fd)
+            except OSError:
+                pass
+        
+        if self.SHM_DIR.is_dir() and os.access(self.SHM_DIR, os.W_OK):
+            path = self.SHM_DIR / f"ghost_{secrets.token_hex(8)}.gguf"
+            try:
+                fd = os.open(path, os.O_RDWR | os.O_CREAT | os.O_EXCL | os.O_CLOEXEC, 0o600)
+                return AssembledModel(path, "shm", fd)
+            except OSError:
+                pass
+        
+        return AssembledModel(Path(tempfile.mkdtemp(prefix="ghost_")) / "elara.gguf", "disk")
+    
+    def model_loader(self):
+        """Hand the assembled model to the Elara loader without copying it"""
+        if self.assembled is None:
+            raise RuntimeError("Nothing assembled yet")
+        from cynapse.neurons.elara.model_loader import ElaraModelLoader
+        return ElaraModelLoader(self.assembled.path, model_fd=self.assembled.fd)
     
-    async def assemble(self, output_path: Optional[Path] = None) -> Optional[Path]:
+    async def assemble(self, output_path: Optional[Path] = None,
+                       encrypted_path: Optional[Path] = None,
+                       workers: Optional[int] = None,
+                       progress_callback: Optional[Callable[[int, int], None]] = None,
+                       ram_only: bool = True,
+                       require_attestation: bool = True,
+                       threshold: Optional[int] = None,
+                       total_shares: Optional[int] = None) -> Optional[Path]:
         """
-        Main assembly workflow
+        Main assembly workflow (progress_callback receives decrypted/total bytes)
+        
+        The k-of-n split is read from the stick manifests; an explicit
+        threshold/total_shares that disagrees with it aborts assembly.
+        
+        Without an explicit output_path the model is decrypted straight into
+        an anonymous memfd (or /dev/shm) when ram_only is set, falling back to
+        a temp directory. The result is kept in self.assembled for handoff
+        via model_loader().
         1. Authenticate presence (whistle)
-        2. Collect shares (2-of-3)
+        2. Collect shares (k-of-n)
         3. Reconstruct key
         4. Decrypt model
         5. Load into memory (RAM-only)
@@ -692,10 +1563,15 @@ class GhostShell:
         
         # Step 2: Collect shares
         print("\n[2/5] Collecting cryptographic shares...")
-        shares = self.collect_shares()
+        try:
+            shares, threshold = await self.collect_shares_async(require_attestation, threshold, total_shares)
+        except ValueError as e:
+            print(f"❌ {e}")
+            self.audit.log("assembly_failed", {"reason": "threshold_mismatch", "error": str(e)}, "critical")
+            return None
         
-        if len(shares) < 2:
-            print(f"❌ Insufficient shares: {len(shares)}/2 required")
+        if len(shares) < threshold:
+            print(f"❌ Insufficient shares: {len(shares)}/{threshold} required")
             self.audit.log("assembly_failed", {
                 "reason": "insufficient_shares",
                 "available": len(shares)
@@ -705,13 +1581,13 @@ class GhostShell:
         # Step 3: Reconstruct
         print("\n[3/5] Reconstructing encryption key...")
         try:
-            self.assembly_key = ShamirSecretSharing.reconstruct(shares[:2])
+            self.assembly_key = ShamirSecretSharing.reconstruct(shares)
             key_hash = hashlib.sha256(self.assembly_key).hexdigest()[:16]
             print(f"✅ Key reconstructed: {key_hash}...")
             
             self.audit.log("key_reconstructed", {
                 "key_fingerprint": key_hash,
-                "shares_used": [s[0] for s in shares[:2]]
+                "shares_used": [s[0] for s in shares]
             })
             
         except Exception as e:
@@ -719,116 +1595,478 @@ class GhostShell:
             self.audit.log("assembly_failed", {"reason": "reconstruction_error", "error": str(e)})
             return None
         
-        # Step 4 & 5: Decrypt and load (placeholder for actual model)
+        # Step 4: Decrypt, verifying each segment before it is written
         print("\n[4/5] Decrypting model...")
-        print("[5/5] Loading into secure memory...")
         
-        # Create secure temp file (RAM-backed if possible)
-        if output_path is None:
-            output_path = Path(tempfile.mkdtemp(prefix="ghost_")) / "elara.gguf"
+        # Decrypt straight into RAM where possible
+        if output_path is not None:
+            target = AssembledModel(output_path, "disk")
+        elif ram_only:
+            target = self._create_ram_target()
+        else:
+            target = AssembledModel(Path(tempfile.mkdtemp(prefix="ghost_")) / "elara.gguf", "disk")
+        output_path = target.path
+        if target.kind == "disk":
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+        
+        encrypted_path = encrypted_path or self._find_encrypted_model()
+        if encrypted_path is None:
+            print("⚠️  No encrypted model found, writing placeholder")
+            output_path.write_text(f"# Ghost Shell Assembled Model\n"
+                                  f"# Key fingerprint: {key_hash}\n"
+                                  f"# Assembled: {datetime.utcnow().isoformat()}\n"
+                                  f"# This file is encrypted in memory\n")
+        else:
+            try:
+                cipher = SegmentedCipher(self.assembly_key)
+                start = time.perf_counter()
+                size = await asyncio.to_thread(cipher.decrypt_file, encrypted_path, output_path,
+                                               workers, progress=progress_callback)
+                elapsed = time.perf_counter() - start
+                print(f"✅ Decrypted {_format_size(size)} from {encrypted_path} "
+                      f"({size / (1 << 30) / max(elapsed, 1e-9):.2f} GB/s)")
+            except (OSError, ValueError) as e:
+                print(f"❌ Decryption failed: {e}")
+                target.release(self._secure_wipe)
+                self.audit.log("assembly_failed", {"reason": "decryption_error", "error": str(e)})
+                return None
+        
+        print("[5/5] Loading into secure memory...")
         
-        # In production: decrypt actual model shards
-        # For now, create placeholder
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        output_path.write_text(f"# Ghost Shell Assembled Model\n"
-                              f"# Key fingerprint: {key_hash}\n"
-                              f"# Assembled: {datetime.utcnow().isoformat()}\n"
-                              f"# This file is encrypted in memory\n")
+        self.assembled = target
         
-        print(f"\n✅ Assembly complete: {output_path}")
-        print("   Model is RAM-resident. Will self-destruct on exit.")
+        print(f"\n✅ Assembly complete: {output_path} ({target.kind})")
+        if target.ram_only:
+            print("   Model is RAM-resident. Will self-destruct on exit.")
+        else:
+            print("   ⚠️  Model is on disk. Will be wiped on exit.")
         
         self.audit.log("assembly_complete", {
             "output_path": str(output_path),
+            "storage": target.kind,
             "key_fingerprint": key_hash
         })
         
         # Register cleanup
         import atexit
-        atexit.register(self._secure_wipe, output_path)
+        atexit.register(target.release, self._secure_wipe)
         
         return output_path
     
-    def _secure_wipe(self, path: Path):
-        """Cryptographically secure file deletion"""
+    def _secure_wipe(self, path: Path, passes: Optional[int] = None, punch_hole: bool = True):
+        """Cryptographically secure file deletion (full-file overwrite, WIPE_PASSES by default)"""
         if not path.exists():
             return
         
         print(f"\n🧹 Securely wiping {path}...")
+        result = SecureWiper(passes=passes or self.WIPE_PASSES, punch_hole=punch_hole).wipe(path)
+        if result is None:
+            return
         
-        # Overwrite with random data
-        size = path.stat().st_size
-        with open(path, 'wb') as f:
-            for _ in range(3):  # 3-pass overwrite
-                f.write(secrets.token_bytes(min(size, 8192)))
-                f.seek(0)
-        
-        # Rename to random, then delete
-        random_name = secrets.token_hex(16)
-        random_path = path.parent / random_name
-        path.rename(random_path)
-        random_path.unlink()
+        self.audit.log("secure_wipe_complete", {
+            "path": str(path),
+            "bytes": result.size,
+            "passes": result.passes,
+            "mb_per_s": round(result.mb_per_s, 1),
+        })
+        print(f"   Wipe complete: {_format_size(result.size)} x{result.passes} "
+              f"at {result.mb_per_s:.0f} MB/s")
+    
+    def secure_wipe_many(self, paths: List[Path], passes: Optional[int] = None,
+                         workers: Optional[int] = None) -> List[WipeResult]:
+        """Wipe several artifacts concurrently and report aggregate throughput"""
+        passes = passes or self.WIPE_PASSES
+        start = time.perf_counter()
+        results = SecureWiper(passes=passes, punch_hole=True).wipe_many(paths, workers)
+        elapsed = time.perf_counter() - start
+        total = sum(r.size * r.passes for r in results)
+        print(f"🧹 Wiped {len(results)} files, {_format_size(total)} "
+              f"at {total / (1 << 20) / max(elapsed, 1e-9):.0f} MB/s")
+        self.audit.log("secure_wipe_complete", {
+            "paths": [str(r.path) for r in results],
+            "bytes": total,
+            "passes": passes,
+        })
+        return results
+    
+    def _write_manifest(self, stick_dir: Path, stick_num: int, share_id: int, extra: Dict):
+        """Write the stick manifest describing its share"""
+        manifest = {
+            "stick_id": f"bat{stick_num}",
+            "role": self.STICK_ROLES[stick_num - 1] if stick_num <= len(self.STICK_ROLES) else "share_holder",
+            "share_index": share_id,
+            "total_shares": self.total_shares,
+            "threshold": self.threshold,
+            **extra,
+            "firmware_hash": hashlib.sha256(b"firmware_v3.0").hexdigest()[:16],
+            "manufacturing_date": datetime.utcnow().isoformat(),
+        }
+        # Sign exactly what StickAttestation.verify checks
+        signed = f"{manifest['stick_id']}:{manifest['firmware_hash']}:{manifest['manufacturing_date']}"
+        manifest["attestation"] = hmac.new(self.attestation_key, signed.encode(), hashlib.sha256).hexdigest()
         
-        self.audit.log("secure_wipe_complete", {"path": str(path)})
-        print("   Wipe complete.")
+        manifest_path = stick_dir / "manifest.json"
+        manifest_path.write_text(json.dumps(manifest, indent=2))
     
     def split_model(self, model_path: Path, output_dir: Path):
         """
-        Split a model into 3 shares for distribution to sticks
+        Split a model's encryption key into n shares for distribution to sticks
         """
-        print(f"Splitting {model_path} into 3 shares (2-of-3 threshold)...")
-        
-        # Read model
-        model_data = model_path.read_bytes()
+        n, k = self.total_shares, self.threshold
+        print(f"Splitting {model_path} into {n} shares ({k}-of-{n} threshold)...")
         
         # Generate random encryption key
         encryption_key = secrets.token_bytes(32)
         
-        # Encrypt model
-        cipher = ChaCha20Poly1305(encryption_key)
-        nonce = secrets.token_bytes(12)
-        ciphertext, tag = cipher.encrypt(model_data, nonce)
-        
-        # Split key into shares (not the model—key is small, model is large)
-        shares = ShamirSecretSharing.split(encryption_key, n=3, k=2)
+        # Stream-encrypt model into a segmented container (constant memory).
+        # Saved encrypted model can be stored anywhere, key is split.
+        output_dir.mkdir(parents=True, exist_ok=True)
+        encrypted_path = output_dir / self.ENCRYPTED_MODEL
+        cipher = SegmentedCipher(encryption_key)
+        with open(model_path, 'rb') as src, open(encrypted_path, 'wb') as f:
+            dst = _HashingWriter(f)
+            header = cipher.encrypt_stream(src, dst, os.fstat(src.fileno()).st_size)
+        container_hash = dst.hash
         
-        # Save encrypted model (can be stored anywhere, key is split)
-        encrypted_path = output_dir / "elara.enc"
-        with open(encrypted_path, 'wb') as f:
-            f.write(nonce + tag + ciphertext)
+        print(f"   Encrypted model: {encrypted_path} "
+              f"({header.plaintext_size} bytes, {header.segment_count} segments)")
         
-        print(f"   Encrypted model: {encrypted_path} ({len(ciphertext)} bytes)")
+        # Split key into shares (not the model—key is small, model is large)
+        shares = ShamirSecretSharing.split(encryption_key, n=n, k=k)
         
         # Distribute shares to sticks
-        for (share_id, share_data), stick_num in zip(shares, range(1, 4)):
+        for (share_id, share_data), stick_num in zip(shares, range(1, n + 1)):
             stick_dir = output_dir / f"bat{stick_num}"
             stick_dir.mkdir(exist_ok=True)
             
             share_path = stick_dir / f"share{share_id}.bin"
             share_path.write_bytes(share_data)
             
-            # Create manifest
-            manifest = {
-                "stick_id": f"bat{stick_num}",
-                "role": ["whisper_wake", "canary_decoy", "ctf_challenge"][stick_num-1],
-                "share_index": share_id,
-                "total_shares": 3,
-                "threshold": 2,
-                "encrypted_model_hash": hashlib.sha256(ciphertext).hexdigest(),
-                "firmware_hash": hashlib.sha256(b"firmware_v3.0").hexdigest()[:16],
-                "manufacturing_date": datetime.utcnow().isoformat(),
-                "attestation": base64.b64encode(
-                    hmac.new(self.attestation_key, f"bat{stick_num}".encode(), hashlib.sha256).digest()
-                ).decode()
-            }
-            
-            manifest_path = stick_dir / "manifest.json"
-            manifest_path.write_text(json.dumps(manifest, indent=2))
+            self._write_manifest(stick_dir, stick_num, share_id, {
+                "encrypted_model_hash": container_hash.hexdigest(),
+            })
             
             print(f"   Share {share_id} → Bat-{stick_num}: {share_path}")
         
-        print("\n✅ Split complete. Distribute bat1/, bat2/, bat3/ to separate USB sticks.")
-        print("   Any 2 sticks can reconstruct the key. Losing 1 stick is survivable.")
+        sticks = ", ".join(f"bat{i}/" for i in range(1, n + 1))
+        print(f"\n✅ Split complete. Distribute {sticks} to separate USB sticks.")
+        print(f"   Any {k} sticks can reconstruct the key. Losing {n - k} stick(s) is survivable.")
+    
+    def split_payload(self, payload_path: Path, output_dir: Path, chunk_size: int = 1 << 20) -> List[Path]:
+        """
+        Secret-share an arbitrary file directly, streaming it chunk by chunk
+        
+        Each share is as large as the payload, so this suits payloads that
+        must not exist anywhere in encrypted-but-complete form. Memory use
+        is independent of payload size.
+        """
+        n, k = self.total_shares, self.threshold
+        print(f"Streaming {payload_path} into {n} shares ({k}-of-{n} threshold)...")
+        
+        share_paths = []
+        for stick_num in range(1, n + 1):
+            stick_dir = output_dir / f"bat{stick_num}"
+            stick_dir.mkdir(parents=True, exist_ok=True)
+            share_paths.append(stick_dir / f"payload{stick_num}.bin")
+        
+        outputs = [open(path, 'wb') for path in share_paths]
+        try:
+            for share_id, out in enumerate(outputs, 1):
+                out.write(self.SHARE_HEADER.pack(self.SHARE_MAGIC, share_id, k, n))
+            with open(payload_path, 'rb') as src:
+                size = ShamirSecretSharing.split_stream(src, outputs, k=k, chunk_size=chunk_size)
+        finally:
+            for out in outputs:
+                out.close()
+        
+        for stick_num, share_path in enumerate(share_paths, 1):
+            self._write_manifest(share_path.parent, stick_num, stick_num, {
+                "payload_share": share_path.name,
+                "payload_size": size,
+            })
+            print(f"   Share {stick_num} → Bat-{stick_num}: {share_path}")
+        
+        self.audit.log("payload_split", {"size": size, "threshold": k, "total_shares": n})
+        return share_paths
+    
+    def reconstruct_payload(self, share_paths: List[Path], output_path: Path,
+                            chunk_size: int = 1 << 20) -> int:
+        """
+        Stream-reconstruct a payload from share files written by split_payload
+        
+        Returns the payload size in bytes.
+        """
+        inputs = []
+        shares = []
+        threshold = self.threshold
+        try:
+            for path in share_paths:
+                f = open(path, 'rb')
+                inputs.append(f)
+                magic, share_id, k, n = self.SHARE_HEADER.unpack(f.read(self.SHARE_HEADER.size))
+                if magic != self.SHARE_MAGIC:
+                    raise ValueError(f"{path} is not a Ghost Shell share")
+                if not shares:
+                    threshold = k  # The split's own threshold is authoritative
+                elif k != threshold:
+                    raise ValueError(f"{path} belongs to a different split ({k}-of-{n})")
+                shares.append((share_id, f))
+                if len(shares) == threshold:
+                    break
+            
+            if len(shares) < threshold:
+                raise ValueError(f"Insufficient shares: {len(shares)}/{threshold} required")
+            
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(output_path, 'wb') as dst:
+                size = ShamirSecretSharing.reconstruct_stream(shares, dst, chunk_size=chunk_size)
+        finally:
+            for f in inputs:
+                f.close()
+        
+        self.audit.log("payload_reconstructed", {"size": size, "shares_used": [s[0] for s in shares]})
+        return size
+
+
+# --- Benchmarks ---
+def _format_size(size: int) -> str:
+    for unit, scale in (("GB", 1 << 30), ("MB", 1 << 20), ("KB", 1 << 10)):
+        if size >= scale:
+            return f"{size / scale:.3g} {unit}"
+    return f"{size} B"
+
+
+def benchmark_shamir(sizes: Tuple[int, ...] = (32, 1 << 20, 100 << 20), n: int = 3, k: int = 2):
+    """Time split/reconstruct of random secrets of each size"""
+    backend = "numpy xor" if np is not None else "int xor"
+    print(f"Shamir {k}-of-{n} over GF(2^8), table lookups + {backend}")
+    print(f"{'secret':>10} {'split':>12} {'reconstruct':>12} {'MB/s':>10}")
+    for size in sizes:
+        secret = secrets.token_bytes(size)
+        start = time.perf_counter()
+        shares = ShamirSecretSharing.split(secret, n=n, k=k)
+        split_time = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        recovered = ShamirSecretSharing.reconstruct(shares[-k:])
+        reconstruct_time = time.perf_counter() - start
+        if recovered != secret:
+            raise RuntimeError("Shamir round-trip mismatch")
+        
+        rate = size / (1 << 20) / max(split_time, 1e-9)
+        print(f"{_format_size(size):>10} {split_time * 1000:>10.2f}ms "
+              f"{reconstruct_time * 1000:>10.2f}ms {rate:>10.1f}")
+
+
+def benchmark_chacha(size: int = 64 << 20, python_size: int = 1 << 20):
+    """Encrypt/decrypt throughput per available ChaCha20-Poly1305 backend"""
+    key = secrets.token_bytes(32)
+    nonce = secrets.token_bytes(12)
+    print(f"{'backend':<14} {'size':>8} {'encrypt MB/s':>14} {'decrypt MB/s':>14}")
+    reference = None
+    for backend in ChaCha20Poly1305.available_backends():
+        n = python_size if backend == "python" else size
+        data = secrets.token_bytes(n)
+        cipher = ChaCha20Poly1305(key, backend=backend)
+        
+        start = time.perf_counter()
+        ciphertext, tag = cipher.encrypt(data, nonce)
+        enc = time.perf_counter() - start
+        start = time.perf_counter()
+        plaintext = cipher.decrypt(ciphertext, nonce, tag)
+        dec = time.perf_counter() - start
+        if plaintext != data:
+            raise RuntimeError(f"{backend}: round-trip mismatch")
+        
+        # Backends must agree byte for byte
+        sample = cipher.encrypt(b"cynapse" * 100, nonce, b"aad")
+        if reference is not None and sample != reference:
+            raise RuntimeError(f"{backend}: output differs from other backends")
+        reference = sample
+        
+        mb = n / (1 << 20)
+        print(f"{backend:<14} {_format_size(n):>8} {mb / enc:>14.1f} {mb / dec:>14.1f}")
+
+
+def benchmark_parallel_decrypt(size: int = 512 << 20, worker_counts: Tuple[int, ...] = (1, 4, 8)):
+    """Container decryption throughput in GB/s for each worker count"""
+    work_dir = Path(tempfile.mkdtemp(prefix="ghost_bench_"))
+    try:
+        plain_path, enc_path, out_path = work_dir / "model.bin", work_dir / "model.enc", work_dir / "out.bin"
+        with open(plain_path, 'wb') as f:
+            for _ in range(size >> 20):
+                f.write(secrets.token_bytes(1 << 20))
+        cipher = SegmentedCipher(secrets.token_bytes(32))
+        with open(plain_path, 'rb') as src, open(enc_path, 'wb') as dst:
+            cipher.encrypt_stream(src, dst, size)
+        
+        print(f"Decrypting {_format_size(size)} container ({cipher.cipher.backend}, "
+              f"{os.cpu_count()} CPUs available)")
+        for workers in worker_counts:
+            start = time.perf_counter()
+            cipher.decrypt_file(enc_path, out_path, workers=workers)
+            elapsed = time.perf_counter() - start
+            print(f"  {workers:>2} workers: {size / (1 << 30) / elapsed:.2f} GB/s")
+    finally:
+        for path in work_dir.iterdir():
+            path.unlink()
+        work_dir.rmdir()
+
+
+def benchmark_wipe(size: int = 256 << 20, files: int = 4, passes: int = 1):
+    """Wipe throughput in MB/s for one large file and for several files at once"""
+    work_dir = Path(tempfile.mkdtemp(prefix="ghost_bench_"))
+    block = secrets.token_bytes(1 << 20)
+    
+    def make(name: str, nbytes: int) -> Path:
+        path = work_dir / name
+        with open(path, 'wb') as f:
+            for _ in range(nbytes >> 20):
+                f.write(block)
+        return path
+    
+    try:
+        keystream = "chacha20" if _OpenSSLChaCha20Poly1305 is not None else "urandom"
+        print(f"Wiping with {passes} pass(es), {keystream} keystream, "
+              f"{_format_size(SecureWiper.BUFFER_SIZE)} buffers")
+        for sync in (False, True):
+            wiper = SecureWiper(passes=passes, sync=sync, punch_hole=True)
+            result = wiper.wipe(make("single.bin", size))
+            label = "fdatasync" if sync else "no sync  "
+            print(f"  1 x {_format_size(size)} ({label}): {result.mb_per_s:.0f} MB/s"
+                  f"{', hole punched' if result.punched else ''}")
+        
+        paths = [make(f"multi{i}.bin", size // files) for i in range(files)]
+        start = time.perf_counter()
+        results = SecureWiper(passes=passes, punch_hole=True).wipe_many(paths)
+        elapsed = time.perf_counter() - start
+        total = sum(r.size * r.passes for r in results)
+        print(f"  {files} x {_format_size(size // files)} (concurrent): "
+              f"{total / (1 << 20) / elapsed:.0f} MB/s")
+    finally:
+        for path in work_dir.iterdir():
+            path.unlink()
+        work_dir.rmdir()
+
+
+def _write_test_wav(path: Path, seconds: float, freq: Optional[float] = None,
+                    amplitude: float = 8000.0, noise: float = 0.0,
+                    sample_rate: int = UltrasonicDetector.SAMPLE_RATE,
+                    tone_span: Optional[Tuple[float, float]] = None):
+    """Synthesize a mono 16-bit WAV: optional tone (within tone_span seconds) plus white noise"""
+    import random
+    rng = random.Random(0)
+    start, stop = tone_span or (0.0, seconds)
+    frames = array('h')
+    step = 2.0 * math.pi * (freq or 0.0) / sample_rate
+    for i in range(int(seconds * sample_rate)):
+        value = rng.gauss(0.0, noise) if noise else 0.0
+        if freq and start * sample_rate <= i < stop * sample_rate:
+            value += amplitude * math.sin(step * i)
+        frames.append(max(-32768, min(32767, int(value))))
+    with wave.open(str(path), 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(frames.tobytes())
+
+
+def benchmark_goertzel(seconds: float = 5.0):
+    """Detection results and CPU per second of audio on synthetic WAVs, per backend"""
+    work_dir = Path(tempfile.mkdtemp(prefix="ghost_bench_"))
+    cases = [
+        ("18 kHz tone", dict(freq=18000, amplitude=2000, noise=300), True),
+        ("18.45 kHz tone (off-bin)", dict(freq=18450, amplitude=2000, noise=300), True),
+        ("18 kHz burst, 0.2 s", dict(freq=18000, amplitude=2000, noise=300, tone_span=(2.0, 2.2)), True),
+        ("15 kHz tone", dict(freq=15000, amplitude=8000, noise=300), False),
+        ("white noise", dict(noise=300), False),
+    ]
+    try:
+        paths = []
+        for i, (_, kwargs, _) in enumerate(cases):
+            paths.append(work_dir / f"case{i}.wav")
+            _write_test_wav(paths[-1], seconds, **kwargs)
+        
+        backends = [b for b in GoertzelBank.BACKENDS if b != "numpy" or np is not None]
+        for backend in backends:
+            detector = UltrasonicDetector(backend=backend)
+            print(f"{backend} backend, bins {[round(f) for f in detector.bank.freqs]} Hz:")
+            for (label, _, expected), path in zip(cases, paths):
+                start = time.process_time()
+                windows = 0
+                for _, window in detector._windows(detector._wav_blocks(path)):
+                    detector.analyze(window)
+                    windows += 1
+                cpu = time.process_time() - start
+                detected = detector.detect(seconds, replay=path, speed=0)
+                verdict = "ok" if detected == expected else "WRONG"
+                print(f"  {label:<24} detected={str(detected):<5} {verdict:<5} "
+                      f"{cpu / seconds * 1000:6.2f} ms CPU per s of audio ({windows} windows)")
+    finally:
+        for path in work_dir.iterdir():
+            path.unlink()
+        work_dir.rmdir()
+
+
+def benchmark_detection(noise_seconds: float = 20.0, chunk_sizes: Tuple[int, ...] = (512, 1024, 2048),
+                        threshold_scales: Tuple[float, ...] = (0.5, 1.0, 2.0)):
+    """
+    Replay synthetic recordings to tune POWER_THRESHOLD and CHUNK_SIZE
+    
+    Latency is audio time from whistle onset to detection. False positives
+    are whistle events per minute of noise-only audio. CPU is process time
+    per second of audio replayed unpaced.
+    """
+    work_dir = Path(tempfile.mkdtemp(prefix="ghost_bench_"))
+    onset = 1.0
+    amplitudes = (250, 500, 2000)
+    noise_levels = (300, 600, 1000)
+    try:
+        whistles = {}
+        for amplitude in amplitudes:
+            whistles[amplitude] = work_dir / f"whistle{amplitude}.wav"
+            _write_test_wav(whistles[amplitude], onset + 2.0, freq=18000, amplitude=amplitude,
+                            noise=300, tone_span=(onset, onset + 1.0))
+        noises = {}
+        for level in noise_levels:
+            noises[level] = work_dir / f"noise{level}.wav"
+            _write_test_wav(noises[level], noise_seconds, noise=level)
+        
+        backend = UltrasonicDetector().bank.backend
+        print(f"Replay benchmark ({backend} backend), whistle onset at {onset:.1f} s, noise sigma 300 LSB")
+        header = "  ".join([f"lat@{a:<5}" for a in amplitudes] + [f"fp/min@{n:<4}" for n in noise_levels])
+        print(f"  {'chunk':>5} {'threshold':>9}  {header}  CPU ms/s")
+        for chunk_size in chunk_sizes:
+            for scale in threshold_scales:
+                detector = UltrasonicDetector(chunk_size=chunk_size)
+                detector.POWER_THRESHOLD *= scale
+                
+                cells = []
+                for amplitude in amplitudes:
+                    found = detector.detect(onset + 2.0, replay=whistles[amplitude], speed=0)
+                    latency = (detector.last_detection - onset) * 1000 if found else None
+                    cells.append(f"{latency:6.0f} ms " if latency is not None and latency >= 0
+                                 else "   early  " if found else "   missed ")
+                
+                cpu = 0.0
+                for level in noise_levels:
+                    start = time.process_time()
+                    events = sum(1 for _ in detector.detection_events(detector._wav_blocks(noises[level])))
+                    cpu += time.process_time() - start
+                    cells.append(f"{events * 60 / noise_seconds:9.1f}  ")
+                
+                per_second = cpu / (noise_seconds * len(noise_levels)) * 1000
+                print(f"  {chunk_size:>5} {detector.POWER_THRESHOLD:>9.2g}  {''.join(cells)}  {per_second:6.2f}")
+        
+        detector = UltrasonicDetector()
+        for speed in (1.0, 4.0):
+            start = time.monotonic()
+            detector.detect(1.0, replay=noises[noise_levels[0]], speed=speed)
+            print(f"  Replaying 1 s at {speed:g}x took {time.monotonic() - start:.2f} s wall-clock")
+    finally:
+        for path in work_dir.iterdir():
+            path.unlink()
+        work_dir.rmdir()
 
 
 # --- CLI Interface ---
@@ -836,18 +2074,51 @@ async def main():
     import argparse
     
     parser = argparse.ArgumentParser(description="Ghost Shell v3.0 - Threshold Cryptographic Vault")
-    parser.add_argument("command", choices=["assemble", "split", "detect", "deploy-canary", "deploy-ctf"])
-    parser.add_argument("--model", type=Path, help="Model path for split")
-    parser.add_argument("--output", type=Path, default=Path("ghost_output"), help="Output directory")
+    parser.add_argument("command", choices=["assemble", "split", "split-payload", "combine",
+                                            "detect", "deploy-canary", "deploy-ctf", "bench"])
+    parser.add_argument("--model", type=Path,
+                        help="Model to split, payload for split-payload, or encrypted model for assemble")
+    parser.add_argument("--shares", type=Path, nargs="+", help="Share files for combine")
+    parser.add_argument("-k", "--threshold", type=int,
+                        help="Shares required to reconstruct (default 2; assemble reads it from the sticks)")
+    parser.add_argument("-n", "--total-shares", type=int,
+                        help="Shares to generate (default 3; assemble reads it from the sticks)")
+    parser.add_argument("--output", type=Path,
+                        help="Output directory (default ghost_output), or the output file for combine (required)")
     parser.add_argument("--no-attestation", action="store_true", help="Skip hardware attestation")
     parser.add_argument("--timeout", type=float, default=30.0, help="Whistle detection timeout")
+    parser.add_argument("--suite", choices=["shamir", "chacha", "decrypt", "wipe", "goertzel", "detection"], default="shamir", help="Benchmark to run")
+    parser.add_argument("--workers", type=int, help="Decryption processes for assemble (default: all CPUs)")
+    parser.add_argument("--replay", type=Path, help="WAV recording to use instead of the microphone")
+    parser.add_argument("--speed", type=float, default=1.0, help="Replay speed (1 = real time, 0 = unpaced)")
     
     args = parser.parse_args()
+    if args.output is None and args.command != "combine":
+        args.output = Path("ghost_output")
     
-    ghost = GhostShell()
+    if args.command == "bench":
+        if args.suite == "shamir":
+            benchmark_shamir()
+        elif args.suite == "chacha":
+            benchmark_chacha()
+        elif args.suite == "decrypt":
+            benchmark_parallel_decrypt()
+        elif args.suite == "wipe":
+            benchmark_wipe()
+        elif args.suite == "goertzel":
+            benchmark_goertzel()
+        elif args.suite == "detection":
+            benchmark_detection()
+        return
+    
+    ghost = GhostShell(threshold=args.threshold or 2, total_shares=args.total_shares or 3)
+    ghost.detector.replay = args.replay
+    ghost.detector.replay_speed = args.speed
     
     if args.command == "assemble":
-        result = await ghost.assemble()
+        result = await ghost.assemble(encrypted_path=args.model, workers=args.workers,
+                                      require_attestation=not args.no_attestation,
+                                      threshold=args.threshold, total_shares=args.total_shares)
         sys.exit(0 if result else 1)
     
     elif args.command == "split":
@@ -855,8 +2126,21 @@ async def main():
             parser.error("--model required for split")
         ghost.split_model(args.model, args.output)
     
+    elif args.command == "split-payload":
+        if not args.model:
+            parser.error("--model required for split-payload")
+        ghost.split_payload(args.model, args.output)
+    
+    elif args.command == "combine":
+        if not args.shares:
+            parser.error("--shares required for combine")
+        if args.output is None:
+            parser.error("--output (file to write) required for combine")
+        size = ghost.reconstruct_payload(args.shares, args.output)
+        print(f"Reconstructed {size} bytes → {args.output}")
+    
     elif args.command == "detect":
-        print("Listening for whistle...")
+        print(f"Replaying {args.replay}..." if args.replay else "Listening for whistle...")
         detected = ghost.detector.detect(args.timeout)
         print(f"Detected: {detected}")
         sys.exit(0 if detected else 1)
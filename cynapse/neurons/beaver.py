@@ -6,7 +6,6 @@ Lightweight, dependency-minimal, Hub-connected rule engine
 
 import asyncio
 import hashlib
-import json
 import os
 import re
 import socket
@@ -18,26 +17,21 @@ from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Union, Any
 import ipaddress
 
+from cynapse.utils.audit import AuditLogger
+
 
 # --- Cynapse Integration ---
 class CynapseBridge:
     """Minimal Cynapse Hub integration for audit and orchestration"""
     
-    AUDIT_PATH = Path.home() / ".cynapse" / "logs" / "audit.ndjson"
+    _audit: Optional[AuditLogger] = None
     
     @staticmethod
     def log_event(event_type: str, data: Dict, severity: str = "info") -> None:
-        """Append to Cynapse NDJSON audit trail"""
-        entry = {
-            "timestamp": datetime.utcnow().isoformat() + "Z",
-            "neuron": "beaver_miner",
-            "event": event_type,
-            "severity": severity,
-            "data": data
-        }
-        CynapseBridge.AUDIT_PATH.parent.mkdir(parents=True, exist_ok=True)
-        with open(CynapseBridge.AUDIT_PATH, "a") as f:
-            f.write(json.dumps(entry) + "\n")
+        """Chained entry in the Cynapse NDJSON audit trail (via the shared audit writer)"""
+        if CynapseBridge._audit is None:
+            CynapseBridge._audit = AuditLogger("beaver_miner")
+        CynapseBridge._audit.log(event_type, data, severity=severity)
     
     @staticmethod
     def request_signature(rule_path: Path) -> Optional[Path]:
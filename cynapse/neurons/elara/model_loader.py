@@ -6,6 +6,8 @@ Optimized loading with memory mapping and GPU configuration.
 Bridges reference model to Cynapse system.
 """
 
+import mmap
+import os
 import sys
 import torch
 from pathlib import Path
@@ -35,12 +37,56 @@ class ElaraModelLoader:
     - Memory-mapped loading for large models
     - GPU layer optimization
     - Flash Attention support
+    - Zero-copy loading from an in-memory fd (e.g. Ghost Shell memfd)
     """
     
-    def __init__(self, model_path: Optional[Path] = None):
+    CHECKPOINT_MAGIC = b"PK\x03\x04"  # torch.save zip archive
+    
+    def __init__(self, model_path: Optional[Path] = None, model_fd: Optional[int] = None):
         self.model_path = model_path or Path('./cynapse/data/models/elara.gguf')
+        self.model_fd = model_fd  # Takes precedence over model_path when set
         self.model = None
         self.config = None
+    
+    def _available(self) -> bool:
+        if self.model_fd is not None:
+            try:
+                os.fstat(self.model_fd)
+                return True
+            except OSError:
+                return False
+        return self.model_path.exists()
+    
+    def weights_view(self) -> mmap.mmap:
+        """Read-only memory map of the weights file, without copying it"""
+        if self.model_fd is not None:
+            return mmap.mmap(self.model_fd, 0, access=mmap.ACCESS_READ)
+        with open(self.model_path, 'rb') as f:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    
+    def _load_weights(self, device: str) -> bool:
+        """
+        Load a PyTorch checkpoint into self.model straight from weights_view()
+        
+        Tensors are read out of the mapping, so a memfd-backed model never
+        needs a path or a second in-memory copy of the file.
+        Returns False if the weights file is not a PyTorch checkpoint.
+        """
+        try:
+            weights = self.weights_view()
+        except ValueError:
+            return False  # Empty file
+        with weights:
+            if weights[:len(self.CHECKPOINT_MAGIC)] != self.CHECKPOINT_MAGIC:
+                return False
+            checkpoint = torch.load(weights, map_location=device)
+        
+        state_dict = checkpoint.get('model_state_dict') or checkpoint.get('model') or checkpoint
+        unwanted_prefix = '_orig_mod.'  # Left behind by torch.compile
+        state_dict = {k[len(unwanted_prefix):] if k.startswith(unwanted_prefix) else k: v
+                      for k, v in state_dict.items()}
+        self.model.load_state_dict(state_dict)
+        return True
         
     def load(
         self,
@@ -63,7 +109,7 @@ class ElaraModelLoader:
             print("Elara model not available")
             return None
         
-        if not self.model_path.exists():
+        if not self._available():
             print(f"Model not found: {self.model_path}")
             print("Place elara.gguf in cynapse/data/models/")
             return None
@@ -102,9 +148,11 @@ class ElaraModelLoader:
             # Initialize model
             self.model = GPT(self.config)
             
-            # Load weights (placeholder - would load actual weights)
-            # checkpoint = torch.load(self.model_path, map_location=device)
-            # self.model.load_state_dict(checkpoint['model_state_dict'])
+            # Load weights (from the fd when Ghost Shell assembled into memory)
+            if self._load_weights(device):
+                print("  Weights: loaded from checkpoint")
+            else:
+                print("  Weights: not a PyTorch checkpoint, using initialized weights")
             
             # Move to device
             self.model.to(device)
@@ -141,7 +189,8 @@ class ElaraModelLoader:
         """Get model information."""
         return {
             'model_path': str(self.model_path),
-            'exists': self.model_path.exists(),
+            'exists': self._available(),
+            'in_memory': self.model_fd is not None,
             'loaded': self.model is not None,
             'config': {
                 'layers': 32,
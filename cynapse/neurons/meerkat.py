@@ -5,8 +5,10 @@ Outputs directly to Cynapse Synaptic Fortress TUI, zero external files
 """
 
 import asyncio
+import concurrent.futures
 import json
 import sqlite3
+import threading
 import subprocess
 import sys
 from dataclasses import dataclass
@@ -71,22 +73,65 @@ class MeerkatScanner:
         'scanning': '∿',
     }
     
-    def __init__(self, db_path: Path = None, workers: int = 10):
+    LOOKUP_CHUNK = 5000  # Inventory rows per set-based query (one DB worker each)
+    
+    # Every version pattern of every item (full, major.minor, major) in one
+    # pass. The major prefix subsumes the longer ones; rank keeps the
+    # per-pattern order (then CVSS) of the original one-item-at-a-time lookup.
+    # With the inventory indexed by pkg, SQLite either probes cve(pkg) if the
+    # database has that index or scans cve once, never once per item.
+    BULK_LOOKUP_SQL = """
+        SELECT i.item, c.cve_id, c.cvss, c.summary,
+               CASE WHEN c.version = i.p0 OR c.version LIKE i.p0 || '%' THEN 0
+                    WHEN c.version = i.p1 OR c.version LIKE i.p1 || '%' THEN 1
+                    ELSE 2 END AS rank
+        FROM inventory i JOIN cve c ON c.pkg = i.pkg
+        WHERE c.version LIKE i.p2 || '%' OR c.version IN (i.p0, i.p1, i.p2)
+        ORDER BY i.item, rank, c.cvss DESC, c.rowid
+    """
+    
+    def __init__(self, db_path: Path = None, db_workers: int = 4):
         self.db_path = db_path or Path(__file__).parent / "cve.db"
-        self.workers = workers
-        self._db_conn = None
+        self.db_workers = db_workers
+        self._db_pool: Optional[concurrent.futures.ThreadPoolExecutor] = None
+        self._db_local = threading.local()
+        self._db_conns: List[sqlite3.Connection] = []
+        self._db_conns_lock = threading.Lock()
         self._version_cache: Dict[str, str] = {}
-        
-    async def _get_db(self) -> sqlite3.Connection:
-        """Lazy async DB connection"""
-        if self._db_conn is None:
-            self._db_conn = await asyncio.to_thread(sqlite3.connect, str(self.db_path))
-            await asyncio.to_thread(self._db_conn.execute, "PRAGMA journal_mode=WAL")
-        return self._db_conn
+    
+    def _db(self) -> sqlite3.Connection:
+        """This DB worker thread's own connection (sqlite3 connections are not shared)"""
+        conn = getattr(self._db_local, "conn", None)
+        if conn is None:
+            # check_same_thread=False only so close() can run on the caller's thread
+            conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TEMP TABLE IF NOT EXISTS inventory (
+                    item INTEGER PRIMARY KEY, pkg TEXT, p0 TEXT, p1 TEXT, p2 TEXT
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS temp.inventory_pkg ON inventory(pkg)")
+            self._db_local.conn = conn
+            with self._db_conns_lock:
+                self._db_conns.append(conn)
+        return conn
+    
+    async def _run_db(self, fn, *args):
+        """Run fn on a dedicated DB worker thread"""
+        if self._db_pool is None:
+            self._db_pool = concurrent.futures.ThreadPoolExecutor(
+                max_workers=self.db_workers, thread_name_prefix="meerkat-db")
+        return await asyncio.get_running_loop().run_in_executor(self._db_pool, fn, *args)
     
     async def close(self):
-        if self._db_conn:
-            await asyncio.to_thread(self._db_conn.close)
+        if self._db_pool is not None:
+            await asyncio.to_thread(self._db_pool.shutdown, True)
+            self._db_pool = None
+        with self._db_conns_lock:
+            conns, self._db_conns = self._db_conns, []
+        for conn in conns:
+            conn.close()
     
     # --- Inventory Methods ---
     
@@ -195,36 +240,44 @@ class MeerkatScanner:
     
     async def lookup_vulnerabilities(self, item: SoftwareItem) -> List[Vulnerability]:
         """Query SQLite for CVEs"""
-        conn = await self._get_db()
+        return (await self.lookup_vulnerabilities_bulk([item]))[0]
+    
+    async def lookup_vulnerabilities_bulk(self, items: List[SoftwareItem]) -> List[List[Vulnerability]]:
+        """
+        CVEs for many items at once, grouped per item (same order as items)
         
-        version_patterns = [
-            item.version,
-            ".".join(item.version.split(".")[:2]),
-            item.version.split(".")[0],
+        Distinct (name, version) pairs are loaded into a temp table and
+        resolved with one join per chunk; chunks run in parallel, each on
+        its DB worker's own connection.
+        """
+        keys = list(dict.fromkeys((item.name, item.version) for item in items))
+        chunks = [keys[i:i + self.LOOKUP_CHUNK] for i in range(0, len(keys), self.LOOKUP_CHUNK)]
+        found: Dict[Tuple[str, str], List[Vulnerability]] = {}
+        for chunk, results in zip(chunks, await asyncio.gather(
+                *(self._run_db(self._lookup_chunk, chunk) for chunk in chunks))):
+            found.update(zip(chunk, results))
+        return [found[(item.name, item.version)] for item in items]
+    
+    def _lookup_chunk(self, keys: List[Tuple[str, str]]) -> List[List[Vulnerability]]:
+        """DB worker: set-based lookup of one inventory chunk"""
+        conn = self._db()
+        rows = [
+            (i, name, version, ".".join(version.split(".")[:2]), version.split(".")[0])
+            for i, (name, version) in enumerate(keys)
         ]
+        with conn:
+            conn.execute("DELETE FROM inventory")
+            conn.executemany("INSERT INTO inventory VALUES (?, ?, ?, ?, ?)", rows)
         
-        vulnerabilities = []
-        
-        for pattern in version_patterns:
-            rows = await asyncio.to_thread(
-                lambda: conn.execute(
-                    """SELECT cve_id, cvss, summary FROM cve 
-                       WHERE pkg = ? AND (version = ? OR version LIKE ?)
-                       ORDER BY cvss DESC""",
-                    (item.name, pattern, f"{pattern}%")
-                ).fetchall()
-            )
-            
-            for row in rows:
-                cve_id, cvss, summary = row
-                severity = self._cvss_to_severity(cvss)
-                
-                if not any(v.cve_id == cve_id for v in vulnerabilities):
-                    vulnerabilities.append(Vulnerability(
-                        cve_id=cve_id, cvss_score=cvss, severity=severity, summary=summary
-                    ))
-        
-        return vulnerabilities
+        results: List[List[Vulnerability]] = [[] for _ in keys]
+        seen: List[Set[str]] = [set() for _ in keys]
+        for item, cve_id, cvss, summary, _ in conn.execute(self.BULK_LOOKUP_SQL):
+            if cve_id not in seen[item]:
+                seen[item].add(cve_id)
+                results[item].append(Vulnerability(
+                    cve_id=cve_id, cvss_score=cvss, severity=self._cvss_to_severity(cvss), summary=summary
+                ))
+        return results
     
     def _cvss_to_severity(self, score: float) -> str:
         if score >= 9.0: return "critical"
@@ -300,28 +353,22 @@ class MeerkatScanner:
         line_callback(f"{self.COLORS['dim']}Found {len(all_items)} items. Checking CVE database...{self.COLORS['reset']}")
         line_callback("")
         
-        # Phase 2: Vulnerability check with progress
-        semaphore = asyncio.Semaphore(self.workers)
+        # Phase 2: Vulnerability check (one bulk lookup for the whole inventory)
         scan_results = []
         
-        async def check_item(item: SoftwareItem) -> ScanResult:
-            async with semaphore:
-                vulns = await self.lookup_vulnerabilities(item)
-                risk = max((v.cvss_score for v in vulns), default=0.0)
-                
-                # Send formatted line to TUI
-                line = self.format_line(item, len(vulns), risk)
-                line_callback(line)
-                
-                # Send details if vulnerabilities found
-                if vulns and detail_callback:
-                    for vuln in vulns[:3]:  # Top 3 only
-                        detail_callback(self.format_detail(vuln))
-                
-                return ScanResult(software=item, vulnerabilities=vulns, risk_score=risk)
-        
-        tasks = [check_item(item) for item in all_items]
-        scan_results = await asyncio.gather(*tasks)
+        for item, vulns in zip(all_items, await self.lookup_vulnerabilities_bulk(all_items)):
+            risk = max((v.cvss_score for v in vulns), default=0.0)
+            
+            # Send formatted line to TUI
+            line = self.format_line(item, len(vulns), risk)
+            line_callback(line)
+            
+            # Send details if vulnerabilities found
+            if vulns and detail_callback:
+                for vuln in vulns[:3]:  # Top 3 only
+                    detail_callback(self.format_detail(vuln))
+            
+            scan_results.append(ScanResult(software=item, vulnerabilities=vulns, risk_score=risk))
         
         # Sort by risk
         scan_results.sort(key=lambda x: x.risk_score, reverse=True)
@@ -372,7 +419,7 @@ async def run_in_tui(rich_log_callback: Callable[[str], None]):
     Entry point for Cynapse TUI integration.
     Passes formatted lines directly to RichLog widget.
     """
-    scanner = MeerkatScanner(workers=10)
+    scanner = MeerkatScanner()
     
     try:
         await scanner.scan(
@@ -386,7 +433,7 @@ async def run_in_tui(rich_log_callback: Callable[[str], None]):
 # --- CLI Standalone ---
 async def main():
     """Standalone CLI mode (no TUI)"""
-    scanner = MeerkatScanner(workers=10)
+    scanner = MeerkatScanner()
     
     try:
         await scanner.scan(line_callback=print)
@@ -1,30 +1,825 @@
-from datetime import datetime
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import atexit
+import concurrent.futures
+import gzip
+import hashlib
+import io
 import json
+import mmap
+import multiprocessing
+import os
+import queue
+import sys
+import threading
+import time
+
+try:
+    import zstandard  # Optional: faster, smaller compression of closed segments
+except ImportError:
+    zstandard = None
+
+try:
+    import fcntl  # Cross-process append lock (POSIX)
+except ImportError:
+    fcntl = None
+
+
+GENESIS = "0" * 64  # Chain value before the first entry
+CHAIN_MARK = b', "chain": "'
+TIMESTAMP_PREFIX = b'{"timestamp": "'
+TIMESTAMP_LEN = len("2026-01-01T00:00:00.000000Z")  # AuditLogger always writes microseconds
+INDEX_BLOCK = 1 << 20  # Uncompressed bytes per index block / compressed frame
+CODECS = {"zst": ".zst", "gz": ".gz"}
+PARALLEL_SCAN_BYTES = 64 << 20  # Queries scanning less than this run in-process
+
+
+def default_codec() -> str:
+    return "zst" if zstandard is not None else "gz"
+
+
+def chain_hash(prev: str, body: bytes) -> str:
+    """Chain value of one entry: sha256(previous chain value || entry bytes)"""
+    digest = hashlib.sha256(prev.encode())
+    digest.update(body)
+    return digest.hexdigest()
+
+
+def split_chain(line: bytes) -> Tuple[bytes, Optional[str]]:
+    """Entry bytes as they were hashed, and the chain value (None for unchained lines)"""
+    line = line.rstrip(b"\n")
+    i = line.rfind(CHAIN_MARK)
+    if i < 0:
+        return line, None
+    return line[:i] + b"}", line[i + len(CHAIN_MARK):-2].decode()
+
+
+def entry_timestamp(line: bytes) -> Optional[bytes]:
+    """ISO timestamp of an entry written by AuditLogger (always the first field)"""
+    if not line.startswith(TIMESTAMP_PREFIX):
+        return None
+    end = line.find(b'"', len(TIMESTAMP_PREFIX))
+    return line[len(TIMESTAMP_PREFIX):end] if end > 0 else None
+
+
+def sortable_timestamp(ts: bytes) -> bytes:
+    """
+    Fixed-width form of an ISO timestamp, so comparing bytes compares times
+    (isoformat() drops ".ffffff" when microseconds are 0)
+    """
+    if len(ts) == TIMESTAMP_LEN or b"." in ts:
+        return ts
+    return ts.rstrip(b"Z") + b".000000Z"
+
+
+def iso_to_epoch(iso) -> float:
+    if isinstance(iso, bytes):
+        iso = iso.decode()
+    return datetime.fromisoformat(iso.rstrip("Z")).replace(tzinfo=timezone.utc).timestamp()
+
+
+def _compress(data: bytes, codec: str) -> bytes:
+    if codec == "zst":
+        return zstandard.ZstdCompressor(level=3).compress(data)
+    return gzip.compress(data, compresslevel=6, mtime=0)
+
+
+def _decompress(data: bytes, codec: str) -> bytes:
+    if codec == "zst":
+        if zstandard is None:
+            raise RuntimeError("zstandard is required to read .zst audit segments")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+
+def _read_last_chain(f, size: int) -> Optional[str]:
+    """Chain value of the last chained line of an open binary file (None if it has none)"""
+    end, head = size, b""
+    while end > 0:
+        start = max(0, end - 65536)
+        f.seek(start)
+        lines = (f.read(end - start) + head).split(b"\n")
+        head = lines.pop(0) if start > 0 else b""  # May be cut; completed by the next read
+        for line in reversed(lines):
+            value = split_chain(line)[1] if line else None
+            if value is not None:
+                return value
+        end = start
+    return None
+
+
+def _index_path(data_path: Path) -> Path:
+    """Index for a data file: the uncompressed name + .idx"""
+    name = data_path.name
+    for ext in CODECS.values():
+        if name.endswith(ext):
+            name = name[:-len(ext)]
+    return data_path.with_name(name + ".idx")
+
+
+def _read_index(index_path: Path) -> Tuple[List[Dict], Dict]:
+    blocks, meta = [], {}
+    try:
+        with open(index_path, "rb") as f:
+            for raw in f:
+                try:
+                    record = json.loads(raw)
+                except ValueError:
+                    continue  # Torn last record after a crash
+                if "off" not in record:
+                    meta.update(record)  # Segment header ("created") and closing footer
+                else:
+                    blocks.append(record)
+    except FileNotFoundError:
+        pass
+    blocks.sort(key=lambda b: b["off"])
+    return blocks, meta
+
+
+class AuditSegmentLog:
+    """
+    Active audit file with a running hash chain, a sparse time index and
+    rotation into closed, compressed segments
+
+    Every entry gets a "chain" field: sha256 of the previous entry's chain
+    value and this entry's bytes, carried in memory so nothing is reread on
+    the hot path. <file>.idx records, per ~1 MB block, its byte range and
+    min/max timestamp. When the active file exceeds max_bytes or max_age
+    seconds it is renamed to <stem>.<start time><suffix> and compressed
+    (zstd if available, else gzip) one independent frame per index block,
+    so a reader can seek straight to a time range.
+
+    Appends from several processes are serialized with flock on
+    <file>.lock; a process that finds foreign writes resyncs its chain
+    from the file tail before continuing.
+    """
+
+    def __init__(self, path: Path, max_bytes: int = 64 << 20, max_age: float = 86400.0,
+                 compress: bool = True, codec: Optional[str] = None):
+        self.path = Path(path)
+        self.index_path = _index_path(self.path)
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.compress = compress
+        self.codec = codec or default_codec()
+        if self.codec not in CODECS:
+            raise ValueError(f"Unknown codec: {self.codec}")
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock_file = open(self.path.with_name(self.path.name + ".lock"), "ab")
+        self._data = None
+        self._index = None
+        self._size = -1  # Bytes we believe are in the active file (-1: resync)
+        self._chain = GENESIS
+        self._started: Optional[float] = None
+        self._block: Optional[List] = None  # [offset, length, min ts, max ts]
+        self._compressors: List[threading.Thread] = []
+        self._open()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _open(self):
+        self._data = open(self.path, "ab")
+        self._index = open(self.index_path, "ab")
+        self._size = -1
+        self._started = None
+
+    def _lock(self):
+        if fcntl is not None:
+            fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_EX)
+
+    def _unlock(self):
+        if fcntl is not None:
+            fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_UN)
+
+    def append(self, lines: List[bytes]):
+        """Chain, index and append entry lines (without trailing newline)"""
+        self._lock()
+        try:
+            self._sync_state()
+            if self._size >= self.max_bytes or (
+                    self._size > 0 and time.time() - self._started >= self.max_age):
+                self._rotate()
+
+            out = []
+            offset = self._size
+            chain = self._chain.encode()
+            sha256 = hashlib.sha256
+            prefix, start = TIMESTAMP_PREFIX, len(TIMESTAMP_PREFIX)
+            for body in lines:
+                if not body:
+                    continue
+                digest = sha256(chain)
+                digest.update(body)
+                chain = digest.hexdigest().encode()
+                line = body[:-1] + CHAIN_MARK + chain + b'"}\n'
+                out.append(line)
+
+                if self._block is None:
+                    self._block = [offset, 0, None, None]
+                block = self._block
+                block[1] += len(line)
+                if body.startswith(prefix):  # Inlined entry_timestamp()
+                    ts = body[start:body.find(b'"', start)]
+                    if len(ts) != TIMESTAMP_LEN:
+                        ts = sortable_timestamp(ts)
+                    if block[2] is None or ts < block[2]:
+                        block[2] = ts
+                    if block[3] is None or ts > block[3]:
+                        block[3] = ts
+                offset += len(line)
+                if block[1] >= INDEX_BLOCK:
+                    self._close_block()
+            self._chain = chain.decode()
+
+            self._data.write(b"".join(out))
+            self._data.flush()
+            self._size = offset
+        finally:
+            self._unlock()
+
+    def sync(self):
+        os.fsync(self._data.fileno())
+
+    def close(self, index_partial: bool = True):
+        """
+        Index the partial block (one-shot appenders skip it; the bytes stay
+        readable as an unindexed span) and wait for pending compression
+        """
+        if self._data is None:
+            return
+        if index_partial:
+            self._lock()
+            try:
+                self._close_block()
+            finally:
+                self._unlock()
+        self._data.close()
+        self._index.close()
+        self._lock_file.close()
+        self._data = None
+        for thread in self._compressors:
+            thread.join()
+
+    def _close_block(self):
+        block, self._block = self._block, None
+        if block is None or not block[1]:
+            return
+        record = {"off": block[0], "len": block[1],
+                  "ts": iso_to_epoch(block[2]) if block[2] else None,
+                  "te": iso_to_epoch(block[3]) if block[3] else None}
+        self._index.write(json.dumps(record).encode() + b"\n")
+        self._index.flush()
+
+    def _write_created(self):
+        """
+        Segment header: creation time names and orders the segment once
+        closed; prev_chain anchors its first entry so the chain can still
+        be verified after older segments are removed
+        """
+        self._started = time.time()
+        header = {"created": self._started, "prev_chain": self._chain}
+        self._index.write(json.dumps(header).encode() + b"\n")
+        self._index.flush()
+
+    def _sync_state(self):
+        """Pick up rotation or appends by other processes since our last write"""
+        try:
+            rotated = os.stat(self.path).st_ino != os.fstat(self._data.fileno()).st_ino
+        except FileNotFoundError:
+            rotated = True
+        if rotated:
+            self._close_block()  # Still lands in the index of the segment it belongs to
+            self._data.close()
+            self._index.close()
+            self._open()
+
+        size = os.fstat(self._data.fileno()).st_size
+        if size == self._size:
+            return
+        self._close_block()  # Foreign bytes follow; start a fresh block after them
+        self._chain = self._recover_chain(size)
+        self._size = size
+        if self._started is None:
+            try:
+                with open(self.index_path, "rb") as f:
+                    header = json.loads(f.readline() or b"{}")
+            except (OSError, ValueError):
+                header = {}
+            if "created" in header:
+                self._started = header["created"]
+            elif size == 0:
+                self._write_created()
+            else:  # Active file from before segmenting
+                self._started = os.stat(self.path).st_mtime
+
+    def _recover_chain(self, size: int) -> str:
+        """Continue from the last chained entry, never from a foreign unchained line"""
+        if size > 0:
+            with open(self.path, "rb") as f:
+                value = _read_last_chain(f, size)
+            if value is not None:
+                return value
+        closed = [s for s in list_segments(self.path) if not s.active]
+        return closed[-1].last_chain() if closed else GENESIS
+
+    def _rotate(self):
+        self._close_block()
+        stamp = datetime.fromtimestamp(self._started, timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+        stem, suffix = self.path.name.split(".", 1) if "." in self.path.name else (self.path.name, "")
+        suffix = "." + suffix if suffix else ""
+        segment = self.path.with_name(f"{stem}.{stamp}{suffix}")
+        n = 1
+        while segment.exists() or segment.with_name(segment.name + CODECS[self.codec]).exists():
+            segment = self.path.with_name(f"{stem}.{stamp}-{n}{suffix}")
+            n += 1
+
+        self._data.close()
+        self._index.close()
+        os.rename(self.path, segment)
+        if self.index_path.exists():
+            os.rename(self.index_path, _index_path(segment))
+        self._open()
+        self._size = 0
+        self._write_created()
+
+        if self.compress:
+            thread = threading.Thread(target=compress_segment, args=(segment, self.codec),
+                                      name=f"audit-compress:{segment.name}")
+            thread.start()
+            self._compressors = [t for t in self._compressors if t.is_alive()] + [thread]
+
+
+def compress_segment(segment: Path, codec: Optional[str] = None) -> Path:
+    """
+    Compress a closed segment one frame per ~1 MB block of whole lines and
+    rewrite its index with compressed offsets; returns the compressed path
+    """
+    codec = codec or default_codec()
+    target = segment.with_name(segment.name + CODECS[codec])
+    index_path = _index_path(segment)
+    tmp = target.with_name(f"{target.name}.tmp{os.getpid()}")
+    index_tmp = index_path.with_name(f"{index_path.name}.tmp{os.getpid()}")
+
+    _, meta = _read_index(index_path)
+    header = {key: meta[key] for key in ("created", "prev_chain") if key in meta}
+    records = [header] if header else []
+    lines = 0
+    last_chain = header.get("prev_chain")
+    offset = coffset = 0
+    with open(segment, "rb") as src, open(tmp, "wb") as dst:
+        pending = b""
+        while True:
+            chunk = src.read(INDEX_BLOCK)
+            if chunk:
+                pending += chunk
+                cut = pending.rfind(b"\n") + 1
+                if cut == 0:
+                    continue
+                block, pending = pending[:cut], pending[cut:]
+            elif pending:
+                block, pending = pending, b""
+            else:
+                break
+
+            stamps = [sortable_timestamp(ts) for ts in map(entry_timestamp, block.splitlines()) if ts is not None]
+            frame = _compress(block, codec)
+            dst.write(frame)
+            records.append({"off": offset, "len": len(block), "coff": coffset, "clen": len(frame),
+                            "ts": iso_to_epoch(min(stamps)) if stamps else None,
+                            "te": iso_to_epoch(max(stamps)) if stamps else None})
+            lines += block.count(b"\n")
+            values = (split_chain(line)[1] for line in reversed(block.splitlines()))
+            last_chain = next((v for v in values if v is not None), last_chain)
+            offset += len(block)
+            coffset += len(frame)
+        dst.flush()
+        os.fsync(dst.fileno())
+
+    footer = {"end": True, "codec": codec, "lines": lines, "size": offset, "csize": coffset,
+              "last_chain": last_chain or GENESIS}
+    with open(index_tmp, "wb") as f:
+        f.write(b"".join(json.dumps(r).encode() + b"\n" for r in records + [footer]))
+        f.flush()
+        os.fsync(f.fileno())
+
+    os.replace(tmp, target)
+    os.replace(index_tmp, index_path)
+    try:
+        os.unlink(segment)
+    except FileNotFoundError:
+        pass  # Another process finished the same segment first
+    return target
+
+
+@dataclass
+class AuditSegment:
+    """One audit data file (closed segment or the active file) and its index"""
+    path: Path
+    codec: Optional[str]
+    active: bool
+    blocks: List[Dict] = field(default_factory=list)
+    meta: Dict = field(default_factory=dict)  # created, and once compressed: codec, lines, size, last_chain
+
+    @classmethod
+    def load(cls, path: Path, active: bool = False) -> "AuditSegment":
+        codec = next((c for c, ext in CODECS.items() if path.name.endswith(ext)), None)
+        blocks, meta = _read_index(_index_path(path))
+        return cls(path=path, codec=codec, active=active, blocks=blocks, meta=meta)
+
+    @property
+    def size(self) -> int:
+        """Uncompressed bytes"""
+        if self.codec:
+            return self.meta.get("size", sum(b["len"] for b in self.blocks))
+        try:
+            return self.path.stat().st_size
+        except FileNotFoundError:
+            return 0
+
+    def _spans(self) -> List[Tuple[int, int, Optional[Dict]]]:
+        """(offset, length, block) covering the file; block is None for unindexed bytes"""
+        if self.codec:
+            return [(b["off"], b["len"], b) for b in self.blocks]
+        spans, pos, size = [], 0, self.size
+        for block in self.blocks:
+            if block["off"] + block["len"] > size:
+                break  # Index ahead of a truncated file
+            if block["off"] > pos:
+                spans.append((pos, block["off"] - pos, None))
+            spans.append((block["off"], block["len"], block))
+            pos = block["off"] + block["len"]
+        if pos < size:
+            spans.append((pos, size - pos, None))
+        return spans
+
+    def time_range(self) -> Tuple[Optional[float], Optional[float]]:
+        """(first, last) entry time, or None ends where unindexed bytes make it unknown"""
+        spans = self._spans()
+        if not spans or any(b is None or b.get("ts") is None for _, _, b in spans):
+            return None, None
+        return min(b["ts"] for _, _, b in spans), max(b["te"] for _, _, b in spans)
+
+    def overlaps(self, since: Optional[float] = None, until: Optional[float] = None) -> bool:
+        first, last = self.time_range()
+        if first is None:
+            return True
+        return (since is None or last >= since) and (until is None or first < until)
+
+    def spans(self, since: Optional[float] = None,
+              until: Optional[float] = None) -> List[Tuple[int, int, Optional[Dict]]]:
+        """Spans that may hold entries in [since, until)"""
+        selected = []
+        for span in self._spans():
+            block = span[2]
+            if block is not None and block.get("ts") is not None:
+                if (since is not None and block["te"] < since) or (until is not None and block["ts"] >= until):
+                    continue
+            selected.append(span)
+        return selected
+
+    def read(self, since: Optional[float] = None, until: Optional[float] = None) -> Iterator[bytes]:
+        """Yield chunks of whole lines that may fall in [since, until); the caller filters lines"""
+        with open(self.path, "rb") as f:
+            for offset, length, block in self.spans(since, until):
+                if self.codec:
+                    f.seek(block["coff"])
+                    yield _decompress(f.read(block["clen"]), self.codec)
+                else:
+                    f.seek(offset)
+                    yield f.read(length)
+
+    def last_chain(self) -> str:
+        if self.meta.get("last_chain"):
+            return self.meta["last_chain"]
+        if self.codec:
+            data = b"".join(AuditSegment(self.path, self.codec, self.active, self.blocks).read())
+            with io.BytesIO(data) as f:
+                value = _read_last_chain(f, len(data))
+        else:
+            with open(self.path, "rb") as f:
+                value = _read_last_chain(f, os.fstat(f.fileno()).st_size)
+        return value or self.meta.get("prev_chain") or GENESIS
+
+
+def list_segments(path: Path) -> List[AuditSegment]:
+    """Closed segments oldest first, then the active file"""
+    path = Path(path)
+    stem, _, suffix = path.name.partition(".")
+    suffix = "." + suffix if suffix else ""
+    closed: Dict[str, Path] = {}
+    for candidate in path.parent.glob(f"{stem}.*"):
+        name = candidate.name
+        if name == path.name or ".tmp" in name:
+            continue
+        base = name
+        for ext in CODECS.values():
+            if base.endswith(ext):
+                base = base[:-len(ext)]
+        if not base.endswith(suffix) or base == path.name:
+            continue
+        # A plain copy wins while compression of that segment is unfinished
+        if base not in closed or name == base:
+            closed[base] = candidate
+    def order(base: str):
+        stamp, _, n = base[len(stem) + 1:len(base) - len(suffix)].partition("-")
+        return stamp, int(n or 0)
+
+    segments = [AuditSegment.load(closed[base]) for base in sorted(closed, key=order)]
+    if path.exists():
+        segments.append(AuditSegment.load(path, active=True))
+    return segments
+
+
+def compress_pending(path: Path, codec: Optional[str] = None):
+    """Finish compression of closed segments left plain (e.g. after a crash)"""
+    for segment in list_segments(path):
+        if not segment.active and segment.codec is None:
+            compress_segment(segment.path, codec)
+
+
+def verify_chain(path: Path, anchor: Optional[str] = None) -> Dict:
+    """
+    Recompute the hash chain over every segment in order
+
+    The first entry must chain from GENESIS. The only exception is a log
+    whose older segments were removed: its first segment's index header
+    records the chain value it continued from ("prev_chain"). Such a log
+    is reported as anchored, with that value, and passes only when it
+    matches `anchor` if one is given. Every later segment's recorded start
+    must equal the end of the segment before it.
+
+    Returns counts and the first broken entry (segment, line number; 0 for
+    the segment header), if any. Unchained lines written before chaining
+    existed are counted, not failed; once the chain has started (or the
+    log is anchored) an unchained line breaks it.
+    """
+    result = {"entries": 0, "unchained": 0, "ok": True, "broken_at": None, "anchored": False, "anchor": None}
+    prev, chained = GENESIS, False
+    for n, segment in enumerate(list_segments(path)):
+        start = segment.meta.get("prev_chain")
+        anchored = n == 0 and start not in (None, GENESIS)  # Older segments were removed
+        if anchored:
+            result["anchored"], result["anchor"] = True, start
+            prev, chained = start, True
+        if (anchored and anchor not in (None, start)) or (not anchored and start not in (None, prev)):
+            result["ok"] = False
+            result["broken_at"] = (str(segment.path), 0)
+            return result
+
+        line_no = 0
+        for chunk in segment.read():
+            for line in chunk.splitlines():
+                line_no += 1
+                body, value = split_chain(line)
+                if value is None and not chained:
+                    result["unchained"] += 1
+                    continue
+                if value is None or chain_hash(prev, body) != value:
+                    result["ok"] = False
+                    result["broken_at"] = (str(segment.path), line_no)
+                    return result
+                result["entries"] += 1
+                prev, chained = value, True
+    return result
+
+
+class _FlushRequest:
+    """Queued marker: set once everything before it is written (error if that failed)"""
+    __slots__ = ("done", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.error: Optional[BaseException] = None
+
+
+class AuditWriter:
+    """
+    Background writer for one NDJSON audit file
+
+    Producers only enqueue serialized lines; a daemon thread keeps the file
+    open and appends them in batches through AuditSegmentLog (hash chain,
+    index, rotation; segment_options are passed through). fsync policy:
+      "always"   - fsync after every batch (durable, slowest)
+      "interval" - fsync at most every fsync_interval seconds
+      "never"    - leave it to the OS
+    """
+
+    FSYNC_POLICIES = ("always", "interval", "never")
+    MAX_BATCH = 4096  # Lines per write() call
+    CLOSE_TIMEOUT = 10.0  # Seconds close() waits for the queue to drain
+
+    def __init__(self, path: Path, flush_interval: float = 0.2, fsync: str = "interval",
+                 fsync_interval: float = 1.0, **segment_options):
+        if fsync not in self.FSYNC_POLICIES:
+            raise ValueError(f"Unknown fsync policy: {fsync}")
+        self.path = Path(path)
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self.fsync_interval = fsync_interval
+        self.written = 0
+        self.failed = 0  # Lines lost to write errors
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._last_fsync = time.monotonic()
+        self._closed = False
+
+        self._log = AuditSegmentLog(self.path, **segment_options)
+        self._thread = threading.Thread(target=self._run, name=f"audit-writer:{self.path.name}", daemon=True)
+        self._thread.start()
+
+    def write(self, line: str):
+        """Queue one serialized entry (newline-terminated); never blocks on I/O"""
+        if self._closed:
+            raise ValueError(f"Audit writer for {self.path} is closed")
+        self._queue.put(line)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until everything queued so far is on disk (fsynced unless policy is never)
+
+        Returns False on timeout, if writing failed, or if the writer thread is gone.
+        """
+        request = _FlushRequest()
+        self._queue.put(request)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            wait = self.flush_interval if deadline is None else min(self.flush_interval, deadline - time.monotonic())
+            if request.done.wait(max(wait, 0.0)):
+                return request.error is None
+            if not self._thread.is_alive() or (deadline is not None and time.monotonic() >= deadline):
+                return False
+
+    def close(self, timeout: Optional[float] = None) -> bool:
+        """Flush and stop the writer thread; False if it did not finish within timeout"""
+        if self._closed:
+            return True
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join(self.CLOSE_TIMEOUT if timeout is None else timeout)
+        if self._thread.is_alive():
+            print(f"[-] Audit writer for {self.path} did not stop, entries may be lost")
+            return False
+        self._log.close()
+        return True
+
+    def _run(self):
+        while True:
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+
+            lines: List[str] = []
+            waiters: List[_FlushRequest] = []
+            stop = False
+            while True:
+                if item is None:
+                    stop = True
+                elif isinstance(item, _FlushRequest):
+                    waiters.append(item)
+                else:
+                    lines.append(item)
+                if len(lines) >= self.MAX_BATCH:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+
+            # Any failure costs this batch, never the thread: flush() callers must wake
+            error = None
+            try:
+                self._write_batch(lines, force_sync=bool(waiters) or stop)
+            except Exception as e:
+                error = e
+                self.failed += len(lines)
+                print(f"[-] Audit write failed ({self.path}): {e!r}")
+            for waiter in waiters:
+                waiter.error = error
+                waiter.done.set()
+            if stop:
+                return
+
+    def _write_batch(self, items: List[str], force_sync: bool = False):
+        if items:
+            lines = "".join(items).encode().split(b"\n")
+            lines.pop()  # Empty after the final newline
+            self._log.append(lines)
+            self.written += len(lines)
+
+        now = time.monotonic()
+        if self.fsync == "always" or (
+                self.fsync == "interval" and (force_sync or now - self._last_fsync >= self.fsync_interval)):
+            self._log.sync()
+            self._last_fsync = now
+
+
+_writers: Dict[Path, AuditWriter] = {}
+_writers_lock = threading.Lock()
+_shutting_down = False
+
+
+def get_writer(path: Path, **options) -> Optional[AuditWriter]:
+    """Shared writer per audit file (options apply when it is first opened); None after shutdown"""
+    path = Path(path).expanduser().resolve()
+    with _writers_lock:
+        if _shutting_down:
+            return None
+        writer = _writers.get(path)
+        if writer is None or writer._closed:
+            writer = _writers[path] = AuditWriter(path, **options)
+        return writer
+
+
+def flush_all(timeout: Optional[float] = None):
+    with _writers_lock:
+        writers = list(_writers.values())
+    for writer in writers:
+        if not writer._closed:
+            writer.flush(timeout)
+
+
+@atexit.register
+def close_all(final: bool = True):
+    """Flush on shutdown so buffered entries are never lost on a clean exit"""
+    global _shutting_down
+    with _writers_lock:
+        _shutting_down = final
+        writers = list(_writers.values())
+        _writers.clear()
+    for writer in writers:
+        writer.close()
+
 
 class AuditLogger:
     """Minimal Cynapse audit bridge"""
-    
+
     AUDIT_PATH = Path.home() / ".cynapse" / "logs" / "audit.ndjson"
-    
-    def __init__(self, neuron_name: str = "cynapse_core"):
+
+    def __init__(self, neuron_name: str = "cynapse_core", path: Optional[Path] = None,
+                 buffered: bool = True, **writer_options):
         self.neuron_name = neuron_name
+        self.path = Path(path) if path else self.AUDIT_PATH
+        self.buffered = buffered
+        self.writer_options = writer_options
+        self._cached_writer: Optional[AuditWriter] = None
 
-    def log(self, event_type: str, data: Dict, integrity_hash: Optional[str] = None):
+    def _entry(self, event_type: str, data: Dict, integrity_hash: Optional[str] = None,
+               timestamp: Optional[str] = None, severity: Optional[str] = None) -> str:
         entry = {
-            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "timestamp": timestamp or datetime.utcnow().isoformat(timespec="microseconds") + "Z",
             "neuron": self.neuron_name,
             "event": event_type,
-            "data": data
         }
+        if severity:
+            entry["severity"] = severity
+        entry["data"] = data
         if integrity_hash:
             entry["integrity"] = integrity_hash
-        
-        self.AUDIT_PATH.parent.mkdir(parents=True, exist_ok=True)
-        with open(self.AUDIT_PATH, "a") as f:
-            f.write(json.dumps(entry) + "\n")
-    
+        return json.dumps(entry) + "\n"
+
+    def _writer(self) -> Optional[AuditWriter]:
+        if not self.buffered:
+            return None
+        writer = self._cached_writer
+        if writer is None or writer._closed:
+            writer = self._cached_writer = get_writer(self.path, **self.writer_options)
+        return writer
+
+    def _append(self, lines: List[str]):
+        writer = self._writer()
+        if writer is not None:
+            writer.write("".join(lines))
+            return
+
+        # Unbuffered (or logging during interpreter shutdown): append directly
+        segment_options = {k: v for k, v in self.writer_options.items()
+                           if k in ("max_bytes", "max_age", "compress", "codec")}
+        log = AuditSegmentLog(self.path, **segment_options)
+        try:
+            log.append([line.rstrip("\n").encode() for line in lines])
+        finally:
+            log.close(index_partial=False)
+
+    def log(self, event_type: str, data: Dict, integrity_hash: Optional[str] = None,
+            severity: Optional[str] = None):
+        self._append([self._entry(event_type, data, integrity_hash, severity=severity)])
+
+    def log_batch(self, event_type: str, items: List[Dict]):
+        """Several entries of one type sharing a timestamp"""
+        timestamp = datetime.utcnow().isoformat(timespec="microseconds") + "Z"
+        self._append([self._entry(event_type, data, timestamp=timestamp) for data in items])
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        writer = self._writer()
+        return writer.flush(timeout) if writer is not None else True
+
     def trigger_canary(self, stick_id: str, reason: str):
         """Alert Canary neuron to potential physical tampering"""
         self.log("canary_trigger_request", {
@@ -32,3 +827,344 @@ class AuditLogger:
             "reason": reason,
             "severity": "critical"
         })
+
+
+@dataclass
+class AuditQuery:
+    """
+    Filter over audit entries: neuron, event type, [since, until) and data
+    fields (dotted paths under "data", compared for equality)
+    """
+    neuron: Optional[str] = None
+    event: Optional[str] = None
+    since: Optional[float] = None
+    until: Optional[float] = None
+    where: Dict[str, Any] = field(default_factory=dict)
+
+    def needles(self) -> List[bytes]:
+        """
+        Literals every matching line must contain, longest first. Lines
+        without the first are skipped by a raw find() and never split;
+        the rest are checked before a line is parsed.
+        """
+        # Only strings serialize one way; dicts and lists may differ in key
+        # order or spacing, and numbers compare equal across 1, 1.0 and true
+        candidates = [json.dumps(v).encode() for v in self.where.values() if isinstance(v, str)]
+        if self.event:
+            candidates.append(b'"event": ' + json.dumps(self.event).encode())
+        if self.neuron:
+            candidates.append(b'"neuron": ' + json.dumps(self.neuron).encode())
+        return sorted(candidates, key=len, reverse=True)
+
+    def match(self, line: bytes, needles: Tuple[bytes, ...] = ()) -> bool:
+        for needle in needles:
+            if needle not in line:
+                return False
+        if self.since is not None or self.until is not None:
+            ts = entry_timestamp(line)
+            if ts is None:
+                return False
+            epoch = iso_to_epoch(ts)
+            if (self.since is not None and epoch < self.since) or (self.until is not None and epoch >= self.until):
+                return False
+        if not (self.neuron or self.event or self.where):
+            return True  # Time-only: no need to parse
+
+        try:
+            entry = json.loads(line)
+        except ValueError:
+            return False
+        if (self.neuron and entry.get("neuron") != self.neuron) or (self.event and entry.get("event") != self.event):
+            return False
+        for key, expected in self.where.items():
+            value = entry.get("data")
+            for part in key.split("."):
+                value = value.get(part) if isinstance(value, dict) else None
+            if value != expected:
+                return False
+        return True
+
+
+def _scan(buf, start: int, end: int, query: AuditQuery, needles: List[bytes]) -> List[bytes]:
+    """Matching lines in buf[start:end] (whole lines); buf may be an mmap"""
+    if not (needles or query.since is not None or query.until is not None or query.where):
+        return [line for line in buf[start:end].split(b"\n") if line]  # Every line matches
+
+    needle, rest = (needles[0], tuple(needles[1:])) if needles else (None, ())
+    matches = []
+    pos = start
+    while pos < end:
+        if needle:
+            hit = buf.find(needle, pos, end)
+            if hit < 0:
+                break
+            line_start = buf.rfind(b"\n", pos, hit) + 1 or pos
+        else:
+            line_start = hit = pos
+        line_end = buf.find(b"\n", hit, end)
+        if line_end < 0:
+            line_end = end
+        line = buf[line_start:line_end]
+        if line and query.match(line, rest):
+            matches.append(line)
+        pos = line_end + 1
+    return matches
+
+
+def _scan_task(path: str, codec: Optional[str], spans: List[Tuple[int, int, Optional[Dict]]],
+               query: AuditQuery) -> List[bytes]:
+    """Worker: scan some spans of one segment (mmap for plain files, frame by frame when compressed)"""
+    needles = query.needles()
+    # Blocks wholly inside the time range need no per-line time checks
+    untimed = replace(query, since=None, until=None)
+
+    def for_block(block: Optional[Dict]) -> AuditQuery:
+        if block is None or block.get("ts") is None:
+            return query
+        if (query.since is None or block["ts"] >= query.since) and (query.until is None or block["te"] < query.until):
+            return untimed
+        return query
+
+    matches = []
+    with open(path, "rb") as f:
+        if codec:
+            for _, _, block in spans:
+                f.seek(block["coff"])
+                data = _decompress(f.read(block["clen"]), codec)
+                matches.extend(_scan(data, 0, len(data), for_block(block), needles))
+            return matches
+
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return matches
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for offset, length, block in spans:
+                matches.extend(_scan(mm, offset, min(offset + length, size), for_block(block), needles))
+    return matches
+
+
+def _plan(path: Path, query: AuditQuery, task_bytes: int) -> List[Tuple[str, Optional[str], List]]:
+    """Scan tasks in log order: segments and blocks outside the time range are skipped"""
+    tasks = []
+    for segment in list_segments(path):
+        if not segment.overlaps(query.since, query.until):
+            continue
+        group, group_bytes = [], 0
+        for span in segment.spans(query.since, query.until):
+            group.append(span)
+            group_bytes += span[1]
+            if group_bytes >= task_bytes:
+                tasks.append((str(segment.path), segment.codec, group))
+                group, group_bytes = [], 0
+        if group:
+            tasks.append((str(segment.path), segment.codec, group))
+    return tasks
+
+
+def query_lines(path: Path, query: AuditQuery, workers: Optional[int] = None,
+                limit: Optional[int] = None, task_bytes: int = 16 << 20,
+                parallel_bytes: int = PARALLEL_SCAN_BYTES) -> Iterator[bytes]:
+    """
+    Stream matching raw lines oldest first
+
+    Work is split into ~task_bytes pieces of whole index blocks. When more
+    than parallel_bytes are to be scanned, the pieces go to a process pool
+    (workers=1 always scans inline); results come back in log order with a
+    bounded number of pieces in flight. Smaller scans run inline: starting
+    the pool costs more than it saves.
+    """
+    tasks = _plan(Path(path), query, task_bytes)
+    workers = workers or os.cpu_count() or 1
+    emitted = 0
+
+    scan_bytes = sum(length for _, _, spans in tasks for _, length, _ in spans)
+    if workers == 1 or len(tasks) <= 1 or scan_bytes < parallel_bytes:
+        results = (_scan_task(*task, query) for task in tasks)
+        pool = None
+    else:
+        # Not forked: the AuditWriter thread may hold its locks in this process
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+        pool = concurrent.futures.ProcessPoolExecutor(max_workers=min(workers, len(tasks)), mp_context=context)
+        results = _ordered(pool, tasks, query, in_flight=2 * workers)
+    try:
+        for lines in results:
+            for line in lines:
+                yield line
+                emitted += 1
+                if limit is not None and emitted >= limit:
+                    return
+    finally:
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+
+def _ordered(pool, tasks, query: AuditQuery, in_flight: int) -> Iterator[List[bytes]]:
+    pending: List[concurrent.futures.Future] = []
+    for task in tasks:
+        pending.append(pool.submit(_scan_task, *task, query))
+        if len(pending) >= in_flight:
+            yield pending.pop(0).result()
+    while pending:
+        yield pending.pop(0).result()
+
+
+def query_entries(path: Path, query: AuditQuery, **options) -> Iterator[Dict]:
+    """Stream matching entries as dicts (see query_lines)"""
+    for line in query_lines(path, query, **options):
+        yield json.loads(line)
+
+
+def parse_time(value: str) -> float:
+    """Epoch seconds from an ISO timestamp, epoch number, or age like 90s, 15m, 2h, 7d"""
+    units = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+    if value[-1:] in units and value[:-1].replace(".", "", 1).isdigit():
+        return time.time() - float(value[:-1]) * units[value[-1]]
+    try:
+        return float(value)
+    except ValueError:
+        return iso_to_epoch(value)
+
+
+def benchmark(producer_counts=(1, 8, 32), events: int = 100000):
+    """Audit throughput (events/s) for concurrent producers: per-event open vs buffered writer"""
+    import tempfile
+
+    data = {"stick_id": "stick-0001", "signal_power": 1.5e9, "reason": "benchmark"}
+
+    def run(logger: AuditLogger, producers: int, total: int) -> float:
+        per_producer = total // producers
+
+        def produce():
+            for _ in range(per_producer):
+                logger.log("benchmark_event", data)
+
+        threads = [threading.Thread(target=produce) for _ in range(producers)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        logger.flush()
+        return per_producer * producers / (time.perf_counter() - start)
+
+    with tempfile.TemporaryDirectory(prefix="audit_bench_") as work_dir:
+        print(f"{'producers':>9}  {'per-event open':>15}  {'buffered':>12}  {'buffered+fsync':>15}")
+        for producers in producer_counts:
+            path = Path(work_dir) / f"audit_{producers}.ndjson"
+            # The old path is far slower; a tenth of the events is enough to measure it
+            legacy = run(AuditLogger("bench", path=path.with_suffix(".legacy"), buffered=False),
+                         producers, events // 10)
+            buffered = run(AuditLogger("bench", path=path, fsync="never"), producers, events)
+            durable = run(AuditLogger("bench", path=path.with_suffix(".fsync"), fsync="always"),
+                          producers, events)
+            print(f"{producers:>9}  {legacy:>11.0f} e/s  {buffered:>8.0f} e/s  {durable:>11.0f} e/s")
+        close_all(final=False)
+
+
+def benchmark_query(lines: int = 2_000_000, segment_mb: int = 64):
+    """Query latency over a synthetic multi-segment log: selective, time-ranged and full scans"""
+    import random
+    import tempfile
+
+    rng = random.Random(0)
+    events = ["whistle_detected", "share_loaded", "redteam_test", "intrusion_detected", "decoy_integrity_failed"]
+    neurons = ["bat_ghost", "wolverine_redteam", "canary"]
+    start_time = time.time() - 7 * 86400
+    step = 7 * 86400 / lines
+
+    with tempfile.TemporaryDirectory(prefix="audit_query_bench_") as work_dir:
+        path = Path(work_dir) / "audit.ndjson"
+        log = AuditSegmentLog(path, max_bytes=segment_mb << 20)
+        t0 = time.perf_counter()
+        batch = []
+        for i in range(lines):
+            stamp = datetime.fromtimestamp(start_time + i * step, timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%f")
+            batch.append(json.dumps({
+                "timestamp": stamp + "Z", "neuron": rng.choice(neurons), "event": rng.choice(events),
+                "data": {"seq": i, "stick_id": f"stick-{rng.randrange(1000):04d}", "pad": "x" * 40}
+            }).encode())
+            if len(batch) == 8192:
+                log.append(batch)
+                batch = []
+        log.append(batch)
+        log.close()
+        size = sum(s.size for s in list_segments(path))
+        print(f"  built: {lines} lines, {size / 1e6:.0f} MB in {len(list_segments(path))} segments "
+              f"({time.perf_counter() - t0:.1f}s)")
+
+        day = 86400
+        cases = [
+            ("rare field (whole week)", AuditQuery(where={"stick_id": "stick-0042"}), None),
+            ("event + neuron (whole week)", AuditQuery(neuron="bat_ghost", event="whistle_detected"), None),
+            ("1 hour window", AuditQuery(since=start_time + 3 * day, until=start_time + 3 * day + 3600), None),
+            ("time-only full scan", AuditQuery(since=start_time - 1), None),
+        ]
+        for label, audit_query, _ in cases:
+            for workers in sorted({1, os.cpu_count() or 1}):
+                t0 = time.perf_counter()
+                count = sum(1 for _ in query_lines(path, audit_query, workers=workers))
+                elapsed = time.perf_counter() - t0
+                print(f"  {label:<28} workers={workers:<3}: {elapsed * 1000:8.0f} ms  "
+                      f"{count:>8} matches  ({lines / elapsed / 1e6:5.1f} M lines/s effective)")
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Cynapse audit log tools")
+    parser.add_argument("command", nargs="?", choices=["bench", "bench-query", "verify", "compress", "query"],
+                        default="bench")
+    parser.add_argument("--path", type=Path, default=AuditLogger.AUDIT_PATH, help="Active audit file")
+    parser.add_argument("--neuron", help="query: neuron name (e.g. bat_ghost)")
+    parser.add_argument("--event", help="query: event type")
+    parser.add_argument("--since", type=parse_time, help="query: ISO time, epoch, or age (30m, 2h, 7d)")
+    parser.add_argument("--until", type=parse_time, help="query: ISO time, epoch, or age")
+    parser.add_argument("--where", action="append", default=[], metavar="KEY=VALUE",
+                        help="query: data field equality, dotted keys; VALUE parsed as JSON if possible")
+    parser.add_argument("--limit", type=int, help="query: stop after this many matches")
+    parser.add_argument("--count", action="store_true", help="query: print only the number of matches")
+    parser.add_argument("--workers", type=int, help="query: worker processes for large scans (1 = scan inline)")
+    parser.add_argument("--anchor", help="verify: expected chain value before the oldest remaining "
+                                         "segment, when older segments were removed")
+    args = parser.parse_args()
+
+    if args.command == "bench":
+        benchmark()
+    elif args.command == "bench-query":
+        benchmark_query()
+    elif args.command == "compress":
+        compress_pending(args.path)
+    elif args.command == "query":
+        where = {}
+        for item in args.where:
+            key, _, raw = item.partition("=")
+            try:
+                where[key] = json.loads(raw)
+            except ValueError:
+                where[key] = raw
+        audit_query = AuditQuery(neuron=args.neuron, event=args.event, since=args.since,
+                                 until=args.until, where=where)
+        lines = query_lines(args.path, audit_query, workers=args.workers, limit=args.limit)
+        if args.count:
+            print(sum(1 for _ in lines))
+            return
+        out = sys.stdout.buffer
+        try:
+            for line in lines:
+                out.write(line + b"\n")
+        except BrokenPipeError:  # e.g. piped into head
+            sys.stderr.close()
+    else:
+        result = verify_chain(args.path, anchor=args.anchor)
+        print(json.dumps(result, indent=2))
+        if not result["ok"]:
+            raise SystemExit(1)
+        if result["anchored"] and args.anchor is None:
+            # Intact from the anchor on, but nothing vouches for the anchor itself
+            print("Chain starts from a recorded anchor; confirm it with --anchor", file=sys.stderr)
+            raise SystemExit(2)
+
+
+if __name__ == "__main__":
+    main()
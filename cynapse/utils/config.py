@@ -54,7 +54,12 @@ DEFAULT_CONFIG = {
         "workflow_path": "./workflows",
         "max_concurrent_bees": "5",
         "sandbox_enabled": "true",
-        "auto_approve": "false"
+        "auto_approve": "false",
+        "memory_retention_days": "0",
+        "instance_retention_days": "7",
+        "archive_path": "./cynapse/data/archive",
+        "maintenance_interval_hours": "24",
+        "auto_maintenance": "false"
     }
 }
 
@@ -0,0 +1,12 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def isolated_home(tmp_path, monkeypatch):
+    """Keep audit logs, keys and configs written under ~ inside the test's tmp dir"""
+    home = tmp_path / "home"
+    home.mkdir()
+    monkeypatch.setenv("HOME", str(home))
+    from cynapse.utils.audit import AuditLogger
+    monkeypatch.setattr(AuditLogger, "AUDIT_PATH", home / ".cynapse" / "logs" / "audit.ndjson")
+    return home
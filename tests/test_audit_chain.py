@@ -0,0 +1,148 @@
+"""Hash chain verification across audit segments"""
+
+import json
+
+import pytest
+
+from cynapse.neurons.beaver import CynapseBridge as BeaverBridge
+from cynapse.utils.audit import AuditLogger, flush_all, list_segments, verify_chain
+
+
+def _write_log(path, entries=60, compress=False):
+    logger = AuditLogger("test", path=path, buffered=False, max_bytes=2048, compress=compress)
+    for n in range(entries):
+        logger.log("event", {"n": n, "user": "alice"})
+    return list_segments(path)
+
+
+def _tamper(path, line_no: int):
+    lines = path.read_bytes().splitlines(keepends=True)
+    lines[line_no - 1] = lines[line_no - 1].replace(b'"alice"', b'"mallory"')
+    path.write_bytes(b"".join(lines))
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_intact_log_verifies(tmp_path, compress):
+    segments = _write_log(tmp_path / "audit.ndjson", compress=compress)
+    assert len(segments) > 2
+
+    result = verify_chain(tmp_path / "audit.ndjson")
+
+    assert result["ok"] and not result["anchored"]
+    assert result["entries"] == 60
+
+
+@pytest.mark.parametrize("line_no", [1, 5])
+def test_tampered_entry_in_first_segment_is_detected(tmp_path, line_no):
+    first = _write_log(tmp_path / "audit.ndjson")[0].path
+    _tamper(first, line_no)
+
+    result = verify_chain(tmp_path / "audit.ndjson")
+
+    assert not result["ok"]
+    assert result["broken_at"] == (str(first), line_no)
+
+
+def test_tampered_entry_in_middle_segment_is_detected(tmp_path):
+    middle = _write_log(tmp_path / "audit.ndjson")[1].path
+    _tamper(middle, 2)
+
+    assert verify_chain(tmp_path / "audit.ndjson")["broken_at"] == (str(middle), 2)
+
+
+def test_pruned_log_is_anchored_to_recorded_value(tmp_path):
+    path = tmp_path / "audit.ndjson"
+    removed = _write_log(path, compress=True)[0]
+    expected_anchor = removed.last_chain()
+    removed.path.unlink()
+
+    result = verify_chain(path)
+    assert result["ok"] and result["anchored"]
+    assert result["anchor"] == expected_anchor
+
+    assert verify_chain(path, anchor=expected_anchor)["ok"]
+    assert not verify_chain(path, anchor="0" * 63 + "1")["ok"]
+
+
+def test_pruned_log_with_tampered_first_entry_is_detected(tmp_path):
+    path = tmp_path / "audit.ndjson"
+    segments = _write_log(path)
+    segments[0].path.unlink()
+    _tamper(segments[1].path, 1)
+
+    result = verify_chain(path)
+
+    assert not result["ok"]
+    assert result["broken_at"] == (str(segments[1].path), 1)
+
+
+def test_segment_that_does_not_continue_its_predecessor_is_detected(tmp_path):
+    path = tmp_path / "audit.ndjson"
+    segments = _write_log(path)
+    segments[1].path.unlink()  # A gap in the middle, not a pruned head
+
+    result = verify_chain(path)
+
+    assert not result["ok"]
+    assert result["broken_at"] == (str(segments[2].path), 0)
+
+
+def test_entries_carry_chain_field(tmp_path):
+    path = tmp_path / "audit.ndjson"
+    _write_log(path, entries=1)
+    assert "chain" in json.loads(path.read_text())
+
+
+def test_beaver_events_join_the_chain(monkeypatch):
+    monkeypatch.setattr(BeaverBridge, "_audit", None)
+    AuditLogger("test").log("before", {})
+    BeaverBridge.log_event("rule_generation_start", {"input": "block ssh"}, severity="warning")
+    flush_all(timeout=5)
+
+    lines = [json.loads(line) for line in AuditLogger.AUDIT_PATH.read_text().splitlines()]
+    assert [(e["neuron"], e.get("severity")) for e in lines] == [("test", None), ("beaver_miner", "warning")]
+    assert all("chain" in e for e in lines)
+    assert verify_chain(AuditLogger.AUDIT_PATH)["ok"]
+
+
+def _splice(path, after_line: int, line: bytes):
+    lines = path.read_bytes().splitlines(keepends=True)
+    lines.insert(after_line, line)
+    path.write_bytes(b"".join(lines))
+
+
+def test_unchained_line_spliced_into_chained_segment_is_detected(tmp_path):
+    middle = _write_log(tmp_path / "audit.ndjson")[1].path
+    _splice(middle, 2, b'{"timestamp": "2026-01-01T00:00:00.000000Z", "neuron": "x", "event": "e", "data": {}}\n')
+
+    result = verify_chain(tmp_path / "audit.ndjson")
+
+    assert not result["ok"]
+    assert result["broken_at"] == (str(middle), 3)
+
+
+def test_writer_does_not_restart_the_chain_after_a_foreign_line(tmp_path):
+    path = tmp_path / "audit.ndjson"
+    logger = AuditLogger("test", path=path, buffered=False)
+    logger.log("event", {"n": 0})
+    with open(path, "ab") as f:
+        f.write(b'{"timestamp": "2026-01-01T00:00:00.000000Z", "neuron": "x", "event": "forged", "data": {}}\n')
+    logger.log("event", {"n": 1})
+
+    lines = path.read_bytes().splitlines()
+    assert verify_chain(path)["broken_at"] == (str(path), 2)
+    # Without the foreign line, the entries written around it form one chain
+    lines.pop(1)
+    path.write_bytes(b"\n".join(lines) + b"\n")
+    assert verify_chain(path)["ok"]
+
+
+def test_unchained_lines_from_before_chaining_are_counted(tmp_path):
+    path = tmp_path / "audit.ndjson"
+    path.write_bytes(b'{"timestamp": "2025-01-01T00:00:00Z", "neuron": "old", "event": "e", "data": {}}\n' * 3)
+    AuditLogger("test", path=path, buffered=False).log("event", {})
+
+    result = verify_chain(path)
+
+    assert result["ok"]
+    assert (result["unchained"], result["entries"]) == (3, 1)
@@ -0,0 +1,63 @@
+"""Background audit writer and segment index"""
+
+import json
+
+from cynapse.utils.audit import (
+    AuditLogger, AuditSegment, AuditSegmentLog, AuditWriter, TIMESTAMP_LEN, iso_to_epoch,
+)
+
+
+def _body(ts: str, n: int) -> bytes:
+    return json.dumps({"timestamp": ts, "neuron": "test", "event": "e", "data": {"n": n}}).encode()
+
+
+def test_write_error_fails_flush_and_writer_survives(tmp_path, monkeypatch):
+    writer = AuditWriter(tmp_path / "audit.ndjson", flush_interval=0.01)
+    real_append = writer._log.append
+    calls = []
+
+    def broken_once(lines):
+        calls.append(lines)
+        if len(calls) == 1:
+            raise TypeError("not serializable")
+        real_append(lines)
+
+    monkeypatch.setattr(writer._log, "append", broken_once)
+    try:
+        writer.write('{"timestamp": "x"}\n')
+        assert writer.flush(timeout=5) is False
+        assert writer.failed == 1
+
+        writer.write(_body("2026-01-01T00:00:00.000000Z", 1).decode() + "\n")
+        assert writer.flush(timeout=5) is True
+        assert writer.written == 1
+    finally:
+        assert writer.close(timeout=5)
+
+
+def test_flush_times_out_when_thread_is_gone(tmp_path):
+    writer = AuditWriter(tmp_path / "audit.ndjson", flush_interval=0.01)
+    writer.close()
+    assert writer.flush(timeout=1) is False
+
+
+def test_logger_writes_fixed_width_timestamps(tmp_path):
+    logger = AuditLogger("test", path=tmp_path / "audit.ndjson", buffered=False)
+    logger.log("e", {})
+    logger.log_batch("e", [{}, {}])
+
+    for line in (tmp_path / "audit.ndjson").read_text().splitlines():
+        assert len(json.loads(line)["timestamp"]) == TIMESTAMP_LEN
+
+
+def test_block_range_with_whole_second_timestamps(tmp_path):
+    path = tmp_path / "audit.ndjson"
+    log = AuditSegmentLog(path, compress=False)
+    # isoformat() without timespec drops the fraction at .000000
+    log.append([_body("2026-01-01T00:00:01Z", 0), _body("2026-01-01T00:00:00.500000Z", 1),
+                _body("2026-01-01T00:00:02Z", 2), _body("2026-01-01T00:00:01.900000Z", 3)])
+    log.close()
+
+    (block,) = AuditSegment.load(path, active=True).blocks
+    assert block["ts"] == iso_to_epoch("2026-01-01T00:00:00.500000Z")
+    assert block["te"] == iso_to_epoch("2026-01-01T00:00:02Z")
@@ -0,0 +1,66 @@
+"""ChaCha20-Poly1305 backends against the RFC 8439 test vectors"""
+
+import secrets
+
+import pytest
+
+from cynapse.neurons.bat import ChaCha20Poly1305
+
+BACKENDS = ChaCha20Poly1305.available_backends()
+
+# RFC 8439 section 2.8.2
+KEY = bytes(range(0x80, 0xa0))
+NONCE = bytes.fromhex("070000004041424344454647")
+AAD = bytes.fromhex("50515253c0c1c2c3c4c5c6c7")
+PLAINTEXT = (b"Ladies and Gentlemen of the class of '99: If I could offer you only one tip for "
+             b"the future, sunscreen would be it.")
+CIPHERTEXT = bytes.fromhex(
+    "d31a8d34648e60db7b86afbc53ef7ec2a4aded51296e08fea9e2b5a736ee62d6"
+    "3dbea45e8ca9671282fafb69da92728b1a71de0a9e060b2905d6a5b67ecd3b36"
+    "92ddbd7f2d778b8c9803aee328091b58fab324e4fad675945585808b4831d7bc"
+    "3ff4def08e4b7a9de576d26586cec64b6116")
+TAG = bytes.fromhex("1ae10b594f09e26a7e902ecbd0600691")
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_aead_known_answer(backend):
+    aead = ChaCha20Poly1305(KEY, backend=backend)
+    assert aead.encrypt(PLAINTEXT, NONCE, AAD) == (CIPHERTEXT, TAG)
+    assert aead.decrypt(CIPHERTEXT, NONCE, TAG, AAD) == PLAINTEXT
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_aead_rejects_tampering(backend):
+    aead = ChaCha20Poly1305(KEY, backend=backend)
+    assert aead.decrypt(CIPHERTEXT[:-1] + bytes([CIPHERTEXT[-1] ^ 1]), NONCE, TAG, AAD) is None
+    assert aead.decrypt(CIPHERTEXT, NONCE, TAG, AAD[:-1]) is None
+    assert aead.decrypt(CIPHERTEXT, NONCE, bytes(16), AAD) is None
+
+
+def test_poly1305_known_answer():
+    # RFC 8439 section 2.5.2
+    key = bytes.fromhex("85d6be7857556d337f4452fe42d506a80103808afb0db2fd4abff6af4149f51b")
+    tag = ChaCha20Poly1305._poly1305(key, b"Cryptographic Forum Research Group")
+    assert tag == bytes.fromhex("a8061dc1305136c6c22b8baf0c0127a9")
+
+
+def test_chacha20_block_known_answer():
+    # RFC 8439 section 2.3.2
+    key = bytes(range(32))
+    nonce = bytes.fromhex("000000090000004a00000000")
+    expected = bytes.fromhex(
+        "10f1e7e4d13b5915500fdd1fa32071c4c7d1f4c733c068030422aa9ac3d46c4e"
+        "d2826446079faa0914c2d705d98b02a2b5129cd1de164eb9cbd083e8a2503c4e")
+    aead = ChaCha20Poly1305(key, backend="python")
+    assert aead._chacha_block(key, nonce, 1) == expected
+    if "numpy" in BACKENDS:
+        assert aead._chacha_blocks_numpy(nonce, 1, 1) == expected
+
+
+@pytest.mark.parametrize("backend", [b for b in BACKENDS if b != "python"])
+def test_backends_agree_across_numpy_batches(backend, monkeypatch):
+    monkeypatch.setattr(ChaCha20Poly1305, "BATCH_BLOCKS", 3)
+    key, nonce = secrets.token_bytes(32), secrets.token_bytes(12)
+    plaintext, aad = secrets.token_bytes(64 * 7 + 13), secrets.token_bytes(20)
+    expected = ChaCha20Poly1305(key, backend="python").encrypt(plaintext, nonce, aad)
+    assert ChaCha20Poly1305(key, backend=backend).encrypt(plaintext, nonce, aad) == expected
@@ -0,0 +1,111 @@
+"""Tamper detection in the segmented Ghost Shell container"""
+
+import io
+import secrets
+
+import pytest
+
+from cynapse.neurons.bat import SegmentedCipher
+
+SEGMENT = 4096
+RECORD = SegmentedCipher.SEGMENT_HEADER.size + SEGMENT + SegmentedCipher.TAG_SIZE
+HEADER = SegmentedCipher.HEADER.size
+
+
+@pytest.fixture
+def container():
+    key = secrets.token_bytes(32)
+    plaintext = secrets.token_bytes(SEGMENT * 3 + 100)
+    dst = io.BytesIO()
+    SegmentedCipher(key, segment_size=SEGMENT).encrypt_stream(io.BytesIO(plaintext), dst, len(plaintext))
+    return key, plaintext, bytearray(dst.getvalue())
+
+
+def _decrypt(key, data: bytes) -> bytes:
+    dst = io.BytesIO()
+    SegmentedCipher(key).decrypt_stream(io.BytesIO(bytes(data)), dst)
+    return dst.getvalue()
+
+
+def _flip(data: bytearray, offset: int) -> bytearray:
+    data = bytearray(data)
+    data[offset] ^= 0x01
+    return data
+
+
+def test_round_trip(container):
+    key, plaintext, data = container
+    assert _decrypt(key, data) == plaintext
+
+
+@pytest.mark.parametrize("offset", [
+    HEADER + RECORD + 20,                       # ciphertext of segment 1
+    HEADER + 2 * RECORD - 1,                    # tag of segment 1
+    HEADER - 1,                                 # plaintext size in the header (AAD)
+])
+def test_flipped_bit_is_detected(container, offset):
+    key, _, data = container
+    with pytest.raises(ValueError):
+        _decrypt(key, _flip(data, offset))
+
+
+def test_swapped_segments_are_detected(container):
+    key, _, data = container
+    first = data[HEADER:HEADER + RECORD]
+    second = data[HEADER + RECORD:HEADER + 2 * RECORD]
+    data[HEADER:HEADER + 2 * RECORD] = second + first
+    with pytest.raises(ValueError):
+        _decrypt(key, data)
+
+
+def test_truncation_and_trailing_data_are_detected(container):
+    key, _, data = container
+    with pytest.raises(ValueError):
+        _decrypt(key, data[:HEADER + 3 * RECORD])
+    with pytest.raises(ValueError):
+        _decrypt(key, data + b"\0")
+
+
+def test_wrong_key_is_rejected(container):
+    _, _, data = container
+    with pytest.raises(ValueError):
+        _decrypt(secrets.token_bytes(32), data)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_decrypt_file_detects_tampering(container, tmp_path, workers):
+    key, plaintext, data = container
+    cipher = SegmentedCipher(key)
+    src = tmp_path / "model.enc"
+
+    src.write_bytes(bytes(data))
+    assert cipher.decrypt_file(src, tmp_path / "model", workers=workers, batch_segments=1) == len(plaintext)
+    assert (tmp_path / "model").read_bytes() == plaintext
+
+    src.write_bytes(bytes(_flip(data, HEADER + 2 * RECORD + 50)))
+    with pytest.raises(ValueError):
+        cipher.decrypt_file(src, tmp_path / "model", workers=workers, batch_segments=1)
+
+
+@pytest.mark.parametrize("size", [1, SEGMENT * 8, SEGMENT * 11 + 7])
+def test_parallel_decrypt_file_matches_serial(tmp_path, size):
+    key = secrets.token_bytes(32)
+    plaintext = secrets.token_bytes(size)
+    src = tmp_path / "model.enc"
+    with open(src, "wb") as dst:
+        SegmentedCipher(key, segment_size=SEGMENT).encrypt_stream(io.BytesIO(plaintext), dst, size)
+    cipher = SegmentedCipher(key)
+
+    outputs, progress = {}, {}
+    for workers in (1, 3):
+        out = tmp_path / f"model.{workers}"
+        progress[workers] = []
+        done = cipher.decrypt_file(src, out, workers=workers, batch_segments=2,
+                                   progress=lambda n, total, seen=progress[workers]: seen.append((n, total)))
+        assert done == size
+        outputs[workers] = out.read_bytes()
+
+    assert outputs[1] == outputs[3] == _decrypt(key, src.read_bytes()) == plaintext
+    for seen in progress.values():
+        assert [n for n, _ in seen] == sorted(n for n, _ in seen)
+        assert seen[-1] == (size, size)
@@ -0,0 +1,63 @@
+"""Whistle detection on synthesized recordings, for every Goertzel backend"""
+
+import math
+from array import array
+
+import pytest
+
+from cynapse.neurons.bat import GoertzelBank, UltrasonicDetector, _write_test_wav, np
+
+BACKENDS = [b for b in GoertzelBank.BACKENDS if b != "numpy" or np is not None]
+BURST = (0.6, 0.9)  # Seconds
+
+
+@pytest.fixture(scope="module")
+def recordings(tmp_path_factory):
+    work = tmp_path_factory.mktemp("wav")
+    cases = {
+        "burst": dict(freq=18000, amplitude=2000, noise=300, tone_span=BURST),
+        "off_bin_burst": dict(freq=18450, amplitude=2000, noise=300, tone_span=BURST),
+        "noise": dict(noise=300),
+        "silence": dict(),
+        "audible_tone": dict(freq=15000, amplitude=8000, noise=300),
+    }
+    paths = {}
+    for name, kwargs in cases.items():
+        paths[name] = work / f"{name}.wav"
+        _write_test_wav(paths[name], 1.5, **kwargs)
+    return paths
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+@pytest.mark.parametrize("case", ["burst", "off_bin_burst"])
+def test_burst_is_detected_inside_its_window(recordings, backend, case):
+    detector = UltrasonicDetector(backend=backend)
+
+    events = list(detector.detection_events(detector._wav_blocks(recordings[case])))
+
+    assert events
+    latest_end = BURST[1] + detector.CHUNK_SIZE / detector.SAMPLE_RATE
+    assert all(BURST[0] < t <= latest_end for t in events), events
+    assert detector.detect(5.0, replay=recordings[case], speed=0)
+    assert BURST[0] < detector.last_detection <= latest_end
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+@pytest.mark.parametrize("case", ["noise", "silence", "audible_tone"])
+def test_no_detection_without_a_whistle(recordings, backend, case):
+    detector = UltrasonicDetector(backend=backend)
+
+    assert not detector.detect(5.0, replay=recordings[case], speed=0)
+    assert detector.last_detection is None
+
+
+@pytest.mark.skipif(np is None, reason="needs numpy")
+def test_backends_compute_the_same_powers():
+    numpy_bank = GoertzelBank(18000, 48000, 1024, tolerance=500, backend="numpy")
+    python_bank = GoertzelBank(18000, 48000, 1024, tolerance=500, backend="python")
+    samples = array('h', (int(3000 * math.sin(2 * math.pi * 18100 * i / 48000) + (i * 7919) % 200 - 100)
+                          for i in range(1024)))
+
+    expected = python_bank.powers(samples)
+    assert numpy_bank.powers(samples.tobytes()) == pytest.approx(expected, rel=1e-9)
+    assert max(expected) > UltrasonicDetector.POWER_THRESHOLD
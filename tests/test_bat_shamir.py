@@ -0,0 +1,165 @@
+"""Shamir secret sharing and k-of-n share collection in the Ghost Shell"""
+
+import asyncio
+import atexit
+import io
+import itertools
+import os
+import pathlib
+import secrets
+
+import pytest
+
+from cynapse.neurons.bat import GhostShell, SegmentedCipher, ShamirSecretSharing
+
+
+def _gf_mul_reference(a: int, b: int) -> int:
+    """Shift-and-add multiply modulo x^8 + x^4 + x^3 + x + 1"""
+    product = 0
+    while b:
+        if b & 1:
+            product ^= a
+        a <<= 1
+        if a & 0x100:
+            a ^= ShamirSecretSharing.PRIME
+        b >>= 1
+    return product
+
+
+def test_table_multiply_matches_bitwise_reference():
+    for a in range(256):
+        row = ShamirSecretSharing._mul_row(a)
+        for b in range(256):
+            expected = _gf_mul_reference(a, b)
+            assert ShamirSecretSharing._gf_mul(a, b) == expected == row[b], (a, b)
+        if a:
+            assert _gf_mul_reference(a, ShamirSecretSharing._gf_inv(a)) == 1, a
+
+    data = bytes(range(256))
+    assert ShamirSecretSharing._gf_mul_bytes(data, 0x57) == bytes(_gf_mul_reference(0x57, b) for b in data)
+
+
+@pytest.mark.parametrize("k,n", [(2, 3), (3, 5), (5, 5)])
+def test_any_k_shares_reconstruct(k, n):
+    secret = secrets.token_bytes(32)
+    shares = ShamirSecretSharing.split(secret, n=n, k=k)
+
+    for subset in itertools.combinations(shares, k):
+        assert ShamirSecretSharing.reconstruct(list(subset)) == secret
+
+
+def test_fewer_than_k_shares_do_not_reconstruct():
+    secret = secrets.token_bytes(32)
+    shares = ShamirSecretSharing.split(secret, n=5, k=3)
+
+    assert ShamirSecretSharing.reconstruct(shares[:2]) != secret
+
+
+def test_stream_round_trip():
+    payload = secrets.token_bytes(100_000)
+    outputs = [io.BytesIO() for _ in range(4)]
+    ShamirSecretSharing.split_stream(io.BytesIO(payload), outputs, k=3, chunk_size=4096)
+
+    inputs = [(x, io.BytesIO(outputs[x - 1].getvalue())) for x in (4, 1, 3)]
+    dst = io.BytesIO()
+    assert ShamirSecretSharing.reconstruct_stream(inputs, dst, chunk_size=4096) == len(payload)
+    assert dst.getvalue() == payload
+
+
+@pytest.fixture
+def sticks(tmp_path):
+    """A 3-of-5 split written to tmp_path/bat1..bat5"""
+    model = tmp_path / "model.gguf"
+    model.write_bytes(secrets.token_bytes(4096))
+    splitter = GhostShell(threshold=3, total_shares=5)
+    splitter.STICK_MOUNT = str(tmp_path / "out" / "bat{}")
+    splitter.split_model(model, tmp_path / "out")
+    return splitter.STICK_MOUNT
+
+
+def test_collect_uses_split_from_manifest(sticks, tmp_path):
+    ghost = GhostShell()  # Configured 2-of-3, sticks hold 3-of-5
+    ghost.STICK_MOUNT = sticks
+
+    shares, threshold = asyncio.run(ghost.collect_shares_async())
+
+    assert threshold == 3
+    assert len(shares) == 3
+    key = ShamirSecretSharing.reconstruct(shares)
+    SegmentedCipher(key).decrypt_file(tmp_path / "out" / "elara.enc", tmp_path / "plain", workers=1)
+    assert (tmp_path / "plain").read_bytes() == (tmp_path / "model.gguf").read_bytes()
+
+
+def test_collect_rejects_disagreeing_override(sticks):
+    ghost = GhostShell()
+    ghost.STICK_MOUNT = sticks
+
+    with pytest.raises(ValueError, match="3-of-5"):
+        asyncio.run(ghost.collect_shares_async(threshold=2))
+
+
+def test_blocking_collect_keeps_the_list_api(sticks):
+    ghost = GhostShell()
+    ghost.STICK_MOUNT = sticks
+
+    shares = ghost.collect_shares()
+
+    assert isinstance(shares, list) and len(shares) == 3
+    assert all(isinstance(share_id, int) and isinstance(data, bytes) for share_id, data in shares)
+
+
+def test_mounted_sticks_are_found_by_glob(sticks, tmp_path):
+    (tmp_path / "out" / "bat12").mkdir()
+    (tmp_path / "out" / "bat300").mkdir()  # Beyond the 255 shares a split can have
+    (tmp_path / "out" / "batman").mkdir()
+    ghost = GhostShell()
+    ghost.STICK_MOUNT = sticks
+
+    assert [n for n, _ in ghost.mounted_sticks()] == [1, 2, 3, 4, 5, 12]
+
+
+def test_manifest_is_read_once_per_stick(sticks, monkeypatch):
+    ghost = GhostShell()
+    ghost.STICK_MOUNT = sticks
+    reads = []
+    real_read = pathlib.Path.read_bytes
+
+    def counting_read(path):
+        if path.name == "manifest.json":
+            reads.append(path.parent.name)
+        return real_read(path)
+
+    monkeypatch.setattr(pathlib.Path, "read_bytes", counting_read)
+    asyncio.run(ghost.collect_shares_async())
+
+    assert len(reads) == len(set(reads))
+
+
+@pytest.mark.skipif(not hasattr(os, "memfd_create"), reason="memfd_create not available")
+@pytest.mark.parametrize("workers", [1, 2])
+def test_assemble_into_memfd_round_trip(sticks, tmp_path, monkeypatch, workers):
+    ghost = GhostShell()
+    ghost.STICK_MOUNT = sticks
+    cleanups = []
+    monkeypatch.setattr(atexit, "register", lambda fn, *args: cleanups.append((fn, args)))
+
+    async def present():
+        return True
+
+    monkeypatch.setattr(ghost, "authenticate_presence", present)
+    before = set((tmp_path / "out").rglob("*"))
+
+    path = asyncio.run(ghost.assemble(encrypted_path=tmp_path / "out" / "elara.enc", workers=workers))
+
+    model = ghost.assembled
+    assert model.kind == "memfd" and model.ram_only and path == model.path
+    with model.mmap() as view:
+        assert view[:] == (tmp_path / "model.gguf").read_bytes()
+    assert set((tmp_path / "out").rglob("*")) == before  # Nothing decrypted reached the filesystem
+
+    fd = model.fd
+    assert cleanups == [(model.release, (ghost._secure_wipe,))]
+    model.release()
+    assert model.fd is None
+    with pytest.raises(OSError):
+        os.fstat(fd)
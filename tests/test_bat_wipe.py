@@ -0,0 +1,63 @@
+"""Secure wipe of artifacts that reached a disk"""
+
+import os
+import secrets
+
+import pytest
+
+from cynapse.neurons.bat import GhostShell, SecureWiper
+
+BLOCK = 4096
+
+
+@pytest.fixture
+def no_truncate(monkeypatch):
+    # Keep the overwritten bytes observable through a second hard link
+    monkeypatch.setattr(os, "ftruncate", lambda fd, length: None)
+
+
+@pytest.mark.parametrize("passes", [1, 3])
+def test_wipe_overwrites_every_byte_and_unlinks(tmp_path, monkeypatch, no_truncate, passes):
+    original = secrets.token_bytes(BLOCK * 5 + 123)
+    work = tmp_path / "work"
+    work.mkdir()
+    path = work / "model.bin"
+    path.write_bytes(original)
+    keep = work / "keep"
+    os.link(path, keep)
+
+    written = []
+    real_pwrite = os.pwrite
+    monkeypatch.setattr(os, "pwrite", lambda fd, data, offset: written.append(len(data)) or real_pwrite(fd, data, offset))
+
+    result = SecureWiper(passes=passes, buffer_size=BLOCK * 2).wipe(path)
+
+    assert not path.exists()
+    assert sorted(p.name for p in work.iterdir()) == ["keep"]  # Renamed copy is gone too
+    assert (result.size, result.passes) == (len(original), passes)
+    assert sum(written) == len(original) * passes
+    wiped = keep.read_bytes()
+    assert len(wiped) == len(original)
+    for offset in range(0, len(original), BLOCK):
+        assert wiped[offset:offset + BLOCK] != original[offset:offset + BLOCK]
+
+
+def test_wipe_truncates_and_ignores_missing_files(tmp_path):
+    path = tmp_path / "model.bin"
+    path.write_bytes(b"x" * 10000)
+    keep = tmp_path / "keep"
+    os.link(path, keep)
+
+    assert SecureWiper(sync=False).wipe(path) is not None
+    assert keep.stat().st_size == 0
+    assert SecureWiper().wipe(path) is None
+
+
+def test_ghost_shell_keeps_three_pass_default(tmp_path, capsys):
+    path = tmp_path / "model.bin"
+    path.write_bytes(b"x" * 10000)
+
+    GhostShell()._secure_wipe(path)
+
+    assert not path.exists()
+    assert "x3" in capsys.readouterr().out
@@ -0,0 +1,117 @@
+"""Decoy deployment across home roots"""
+
+import asyncio
+import hashlib
+import os
+from pathlib import Path
+
+import pytest
+
+from cynapse.neurons.canary import CanaryNeuron, StealthDecoyGenerator
+
+# Decoys whose content is drawn only from the seeded generator (no timestamps)
+SEEDED_DECOYS = (".ssh/id_rsa_backup", "projects/elara/models/checkpoint_final.onnx",
+                 "Downloads/model_weights_fp16.onnx")
+
+
+def _deploy(tmp_path, roots, seed=42, workers=None, name="canary.json"):
+    canary = CanaryNeuron(config_path=tmp_path / name)
+    canary.generator = StealthDecoyGenerator(seed=seed)
+    asyncio.run(canary.deploy(sparse=True, roots=roots, workers=workers))
+    return canary
+
+
+def test_existing_files_are_not_replaced(tmp_path):
+    home = tmp_path / "alice"
+    (home / ".aws").mkdir(parents=True)
+    real = home / ".aws" / "credentials"
+    real.write_text("[default]\naws_access_key_id = REAL\n")
+    outside = tmp_path / "outside"
+    outside.write_text("keep me")
+    (home / "workspace").mkdir()
+    (home / "workspace" / "cookies_backup.json").symlink_to(outside)
+
+    canary = _deploy(tmp_path, [home])
+
+    assert real.read_text() == "[default]\naws_access_key_id = REAL\n"
+    assert outside.read_text() == "keep me"
+    assert str(real) not in canary.manifest
+    assert str(home / "workspace" / "cookies_backup.json") not in canary.manifest
+    assert len(canary.manifest) == len(CanaryNeuron.DECOY_LOCATIONS) - 2
+
+
+def test_seeded_contents_do_not_depend_on_scheduling(tmp_path):
+    home = tmp_path / "alice"
+
+    _deploy(tmp_path, [home], workers=16, name="first.json")
+    first = {rel: (home / rel).read_bytes() for rel in SEEDED_DECOYS}
+    for path in list(home.rglob("*")):
+        if path.is_file():
+            path.unlink()
+    _deploy(tmp_path, [home], workers=1, name="second.json")
+
+    assert {rel: (home / rel).read_bytes() for rel in SEEDED_DECOYS} == first
+
+
+@pytest.mark.skipif(not hasattr(os, "geteuid") or os.geteuid() != 0, reason="needs root to chown")
+def test_created_paths_belong_to_the_home_owner(tmp_path):
+    home = tmp_path / "alice"
+    home.mkdir()
+    os.chown(home, 4242, 4242)
+
+    canary = _deploy(tmp_path, [home])
+
+    for decoy in canary.manifest:
+        path = home
+        for part in os.path.relpath(decoy, home).split(os.sep):
+            path = path / part
+            st = path.lstat()
+            assert (st.st_uid, st.st_gid) == (4242, 4242), path
+
+
+def _write_in_hole(path, data: bytes):
+    with open(path, "r+b") as f:
+        f.seek(path.stat().st_size // 2)
+        f.write(data)
+
+
+@pytest.mark.skipif(not hasattr(os, "SEEK_DATA"), reason="no SEEK_DATA/SEEK_HOLE")
+def test_sparse_decoy_hash_covers_only_data_extents(tmp_path):
+    path = tmp_path / "work" / "model.onnx"
+    path.parent.mkdir()
+    edge = StealthDecoyGenerator.SPARSE_EDGE
+    with open(path, "wb") as f:
+        size = StealthDecoyGenerator(seed=3).write_onnx_model(f, 4, sparse=True)
+
+    data = path.read_bytes()
+    assert len(data) == size == 4 << 20
+    assert path.stat().st_blocks * 512 <= 4 * edge  # Only the edges are allocated
+    assert data[:2] == b"\x08\x08" and data[10:26] == data[-16:]  # Fingerprint at both ends
+    assert data[edge:size - edge] == bytes(size - 2 * edge)
+
+    expected = hashlib.sha256((0).to_bytes(8, "little") + data[:edge]
+                              + (size - edge).to_bytes(8, "little") + data[size - edge:])
+    assert CanaryNeuron._hash_file(path) == expected.hexdigest()
+
+    _write_in_hole(path, bytes(4096))  # Reads back identically, but allocates a new extent
+    assert path.read_bytes() == data
+    assert CanaryNeuron._hash_file(path) != expected.hexdigest()
+
+
+@pytest.mark.skipif(not hasattr(os, "SEEK_DATA"), reason="no SEEK_DATA/SEEK_HOLE")
+def test_sparse_decoys_verify_against_their_manifest_hash(tmp_path):
+    home = tmp_path / "alice"
+    canary = _deploy(tmp_path, [home])
+    sparse = [Path(p) for p, record in canary.manifest.items()
+              if record["size"] > 2 * StealthDecoyGenerator.SPARSE_EDGE]
+    assert len(sparse) >= 2
+    for path in sparse:
+        assert canary.manifest[str(path)]["sha256"] == CanaryNeuron._hash_file(path)
+
+    os.utime(sparse[0])  # Touched, content intact
+    _write_in_hole(sparse[-1], b"\x01")
+
+    counts = asyncio.run(canary.verify(redeploy=False))
+
+    assert counts["hashed"] == 1 and counts["tampered"] == 1
+    assert counts["ok"] == len(canary.manifest) - 2
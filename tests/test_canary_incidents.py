@@ -0,0 +1,264 @@
+"""Every closed intrusion incident is persisted, whatever the alert sinks do"""
+
+import asyncio
+import http.server
+import json
+import os
+import threading
+import time
+
+import pytest
+
+from cynapse.neurons.canary import CanaryNeuron, CynapseBridge
+
+
+@pytest.fixture(autouse=True)
+def fresh_audit_logger(monkeypatch):
+    monkeypatch.setattr(CynapseBridge, "_audit", None)
+
+
+async def _trip(canary: CanaryNeuron, decoys, repeats: int = 1):
+    tasks = canary._start_pipeline()
+    try:
+        now = time.time()
+        for _ in range(repeats):
+            for decoy in decoys:
+                await canary._on_intrusion(str(decoy.parent), decoy.name, {
+                    "timestamp": now, "action": "READ", "process": {"pid": 4321, "name": "exfil"}})
+        await asyncio.sleep(canary.COALESCE_WINDOW * 3)
+    finally:
+        await canary._stop_pipeline(tasks)
+
+
+def _canary(tmp_path, count: int):
+    canary = CanaryNeuron(config_path=tmp_path / "canary.json")
+    canary.COALESCE_WINDOW = 0.05
+    decoys = [tmp_path / f"decoy{i:04}" / "credentials" for i in range(count)]
+    for decoy in decoys:
+        canary._register_decoy(decoy, canary._generate_decoy_config("credentials"))
+    return canary, decoys
+
+
+def test_burst_larger_than_sink_queues_is_fully_persisted(tmp_path, capsys):
+    canary, decoys = _canary(tmp_path, 500)
+
+    asyncio.run(_trip(canary, decoys))
+
+    assert len(canary.event_history) == 500
+    assert canary.store.count() == 500
+    assert {e.decoy_path for e in canary.query_events(limit=None)} == {str(d) for d in decoys}
+
+
+def test_rate_limited_incidents_are_persisted(tmp_path, capsys):
+    canary, decoys = _canary(tmp_path, 1)
+    canary.RATE_LIMIT_COUNT = 1
+
+    async def trip_repeatedly():
+        for _ in range(3):
+            await _trip(canary, decoys)
+
+    asyncio.run(trip_repeatedly())
+
+    assert canary.store.count() == 3
+    assert capsys.readouterr().out.count("CANARY TRIPPED") == 1
+
+
+def _enqueue_burst(canary: CanaryNeuron, decoy, count: int, start: float, pid: int = 4321):
+    resolved = decoy.resolve()
+    for i in range(count):
+        canary._enqueue_event(str(resolved.parent), resolved.name, {
+            "timestamp": start + i * 0.001, "action": ["OPEN", "READ", "CLOSE"][i % 3],
+            "process": {"pid": pid, "name": "exfil"}})
+
+
+def test_burst_on_one_decoy_is_one_incident_and_one_write(tmp_path, monkeypatch):
+    canary, decoys = _canary(tmp_path, 1)
+    canary.PERSIST_INTERVAL = 60.0  # Only the shutdown flush writes
+    alerts, writes = [], []
+    monkeypatch.setattr(canary, "_dispatch_alert", alerts.append)
+    real_write = canary._write_batch
+    monkeypatch.setattr(canary, "_write_batch", lambda batch: (writes.append(len(batch)), real_write(batch)))
+
+    async def run():
+        tasks = canary._start_pipeline()
+        try:
+            _enqueue_burst(canary, decoys[0], 300, time.time())
+            await asyncio.sleep(canary.COALESCE_WINDOW * 3)
+            assert writes == []  # Buffered, not written per incident
+        finally:
+            await canary._stop_pipeline(tasks)
+
+    asyncio.run(run())
+
+    assert len(alerts) == 1
+    assert alerts[0].event_count == 300
+    assert alerts[0].action == "OPEN/READ/CLOSE"
+    assert writes == [1]
+    assert canary.store.count() == 1
+
+
+def test_full_batch_is_written_before_the_interval(tmp_path, monkeypatch):
+    canary, decoys = _canary(tmp_path, 120)
+    canary.PERSIST_INTERVAL = 60.0
+    canary.PERSIST_BATCH = 50
+    writes = []
+    real_write = canary._write_batch
+    monkeypatch.setattr(canary, "_write_batch", lambda batch: (writes.append(len(batch)), real_write(batch)))
+
+    async def run():
+        tasks = canary._start_pipeline()
+        try:
+            for decoy in decoys:
+                _enqueue_burst(canary, decoy, 1, time.time())
+            await asyncio.sleep(canary.COALESCE_WINDOW * 3)
+            assert writes == [120]  # Woken early by a full batch; incidents closed together share a write
+        finally:
+            await canary._stop_pipeline(tasks)
+
+    asyncio.run(run())
+
+    assert writes == [120]
+    assert canary.store.count() == 120
+
+
+def test_full_queue_counts_dropped_events(tmp_path):
+    canary, decoys = _canary(tmp_path, 1)
+    canary.QUEUE_SIZE = 10
+
+    async def run():
+        tasks = canary._start_pipeline()
+        try:
+            _enqueue_burst(canary, decoys[0], 25, time.time())  # Consumer has not run yet
+            await asyncio.sleep(canary.COALESCE_WINDOW * 3)
+        finally:
+            await canary._stop_pipeline(tasks)
+
+    asyncio.run(run())
+
+    assert canary.dropped_events == 15
+    assert canary.store.count() == 1
+    assert canary.query_events()[0].event_count == 10
+
+
+def test_rate_limited_alerts_report_suppressed_count(tmp_path, monkeypatch):
+    canary, decoys = _canary(tmp_path, 1)
+    canary.RATE_LIMIT_COUNT = 2
+    canary.RATE_LIMIT_PERIOD = 60.0
+    alerts = []
+    monkeypatch.setattr(canary, "_dispatch_alert", alerts.append)
+    start = time.time()
+
+    async def run():
+        tasks = canary._start_pipeline()
+        try:
+            for offset in (0, 1, 2, 3, 4, 100):  # Incident times; the last is past the period
+                _enqueue_burst(canary, decoys[0], 1, start + offset)
+                await asyncio.sleep(canary.COALESCE_WINDOW * 2)
+        finally:
+            await canary._stop_pipeline(tasks)
+
+    asyncio.run(run())
+
+    assert [a.timestamp - start for a in alerts] == [0, 1, 100]
+    assert [a.suppressed for a in alerts] == [0, 0, 3]
+    assert canary.store.count() == 6
+
+
+def test_cancelled_monitor_propagates_and_cleans_up(tmp_path, monkeypatch):
+    canary, _ = _canary(tmp_path, 1)
+    stopped = []
+
+    async def run_forever():
+        await asyncio.Event().wait()
+
+    monkeypatch.setattr(canary.watcher, "run", run_forever)
+    monkeypatch.setattr(canary.watcher, "stop", lambda: stopped.append(True))
+
+    async def run():
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(canary.monitor(), 0.2)
+
+    asyncio.run(run())
+
+    assert stopped == [True]
+    assert canary.events is None  # Pipeline torn down
+
+
+@pytest.fixture
+def webhook_server():
+    """Local HTTP endpoint that fails the first POST with 500, then accepts"""
+    received = []
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # Keep-alive, so a shared session reuses one connection
+
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            received.append((self.client_address[1], body))
+            self.send_response(500 if len(received) == 1 else 200)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/hook", received
+    server.shutdown()
+    server.server_close()
+
+
+def test_webhook_retries_and_shares_one_session(tmp_path, webhook_server, monkeypatch):
+    aiohttp = pytest.importorskip("aiohttp")
+    url, received = webhook_server
+    canary, decoys = _canary(tmp_path, 3)
+    canary.webhook_url = url
+    canary.WEBHOOK_BACKOFF = 0.01
+    sessions = []
+    real_session = aiohttp.ClientSession
+
+    def counting_session(*args, **kwargs):
+        sessions.append(real_session(*args, **kwargs))
+        return sessions[-1]
+
+    monkeypatch.setattr(aiohttp, "ClientSession", counting_session)
+
+    async def run():
+        tasks = canary._start_pipeline()
+        sink = canary.sinks["webhook"]
+        try:
+            for decoy in decoys:
+                _enqueue_burst(canary, decoy, 1, time.time())
+            await asyncio.sleep(canary.COALESCE_WINDOW * 3)
+        finally:
+            await canary._stop_pipeline(tasks)
+        return sink.stats()
+
+    stats = asyncio.run(run())
+
+    assert (stats["sent"], stats["failed"]) == (3, 0)
+    assert len(received) == 4  # One refused delivery, retried
+    assert received[0][1]["event_id"] == received[1][1]["event_id"]
+    assert {body["decoy_path"] for _, body in received} == {str(d) for d in decoys}
+    assert len(sessions) == 1
+    assert len({port for port, _ in received}) == 1  # One kept-alive connection
+
+
+def test_quiet_window_skips_only_our_own_events_on_the_written_decoy(tmp_path):
+    canary, decoys = _canary(tmp_path, 2)
+    canary.events = asyncio.Queue()
+    canary._quiet_until[str(decoys[0])] = time.time() + 60.0
+
+    _enqueue_burst(canary, decoys[0], 3, time.time(), pid=os.getpid())
+    assert canary.events.qsize() == 0
+    _enqueue_burst(canary, decoys[0], 3, time.time())  # Someone else, same decoy
+    _enqueue_burst(canary, decoys[0], 3, time.time(), pid=-1)  # Unattributed
+    _enqueue_burst(canary, decoys[1], 3, time.time(), pid=os.getpid())  # Not being written
+    assert canary.events.qsize() == 9
+
+    canary._quiet_until[str(decoys[0])] = time.time() - 1.0
+    _enqueue_burst(canary, decoys[0], 1, time.time(), pid=os.getpid())
+    assert canary.events.qsize() == 10
+    assert canary._quiet_until == {}
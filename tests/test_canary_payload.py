@@ -0,0 +1,55 @@
+"""Seeded decoy model payloads"""
+
+import hashlib
+import zlib
+
+import pytest
+
+from cynapse.neurons.canary import StealthDecoyGenerator, np
+
+BACKENDS = [pytest.param("numpy", marks=pytest.mark.skipif(np is None, reason="numpy not installed")), "python"]
+
+
+def _model(backend, seed=7, chunk=None, size_mb=1):
+    generator = StealthDecoyGenerator(seed=seed, payload_backend=backend)
+    if chunk:
+        generator.PAYLOAD_CHUNK = chunk
+    return generator.generate_onnx_model(size_mb)
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_same_seed_gives_same_payload(backend):
+    model = _model(backend)
+
+    assert len(model) == 1 << 20
+    assert _model(backend) == model
+    assert _model(backend, chunk=4096) == model  # Chunking does not shift the stream
+    assert _model(backend, seed=8) != model
+    assert len(zlib.compress(model)) > len(model) * 0.99
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_derived_generators_are_reproducible(backend):
+    parent = StealthDecoyGenerator(seed=7, payload_backend=backend)
+
+    first = parent.derive("models/a.onnx").generate_onnx_model(1)
+
+    assert StealthDecoyGenerator(seed=7, payload_backend=backend).derive("models/a.onnx").generate_onnx_model(1) == first
+    assert parent.derive("models/b.onnx").generate_onnx_model(1) != first
+
+
+@pytest.mark.skipif(np is None, reason="numpy not installed")
+def test_numpy_payload_is_the_sfc64_stream():
+    generator = StealthDecoyGenerator(seed=7, payload_backend="numpy")
+    fingerprint = bytes(range(16))
+    size = 3 * 4096 + 5
+
+    payload = b"".join(bytes(chunk) for chunk in generator.payload_stream(size, fingerprint))
+
+    seed = int.from_bytes(hashlib.sha256(b"7:" + fingerprint).digest()[:16], "little")
+    assert payload == np.random.SFC64(seed).random_raw((size + 7) // 8).tobytes()[:size]
+
+
+def test_unavailable_backend_is_rejected():
+    with pytest.raises(ValueError):
+        StealthDecoyGenerator(seed=1, payload_backend="cuda")
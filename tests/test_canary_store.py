@@ -0,0 +1,85 @@
+"""Intrusion event store: filters, paging and lazy opening"""
+
+from dataclasses import asdict
+
+import pytest
+
+from cynapse.neurons.canary import CanaryNeuron, IntrusionEvent, IntrusionStore, _PendingIncident
+
+
+def _event(n: int, decoy: str, exe: str, name: str) -> dict:
+    return asdict(IntrusionEvent(
+        event_id=f"e{n:03}", timestamp=1000.0 + n, decoy_path=decoy, decoy_type="credentials",
+        action="READ", process_name=name, process_exe=exe, process_cmdline="", pid=n, uid=1000,
+        username="alice", hostname="host", cwd="/", network_connections=[], hash_chain="x"))
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = IntrusionStore(tmp_path / "events.db")
+    store.append_many([
+        _event(n, f"/home/alice/decoy{n % 3}", ["/usr/bin/cat", "/usr/bin/curl"][n % 2], ["cat", "curl"][n % 2])
+        for n in range(30)
+    ])
+    yield store
+    store.close()
+
+
+def _ids(events):
+    return [e.event_id for e in events]
+
+
+def test_query_is_newest_first_and_pages(store):
+    assert _ids(store.query(limit=3)) == ["e029", "e028", "e027"]
+    assert _ids(store.query(limit=3, offset=3)) == ["e026", "e025", "e024"]
+    assert len(store.query(limit=None)) == 30
+
+
+def test_query_filters(store):
+    assert _ids(store.query(since=1025.0, until=1028.0)) == ["e027", "e026", "e025"]
+    assert _ids(store.query(decoy="/home/alice/decoy1", since=1020.0)) == ["e028", "e025", "e022"]
+    by_exe = store.query(process="/usr/bin/curl", limit=None)
+    assert by_exe and all(e.process_exe == "/usr/bin/curl" for e in by_exe)
+    assert _ids(store.query(process="curl", limit=None)) == _ids(by_exe)
+    assert store.query(process="nc") == []
+
+
+def test_count_top_and_duplicate_ids(store):
+    store.append_many([_event(0, "/home/alice/decoy0", "/usr/bin/cat", "cat")])  # Already recorded
+    assert store.count() == 30
+    assert store.count(since=1020.0) == 10
+    assert sorted(store.top("process_name")) == [("cat", 15), ("curl", 15)]
+    assert store.top("decoy_path", since=1027.0, limit=1)[0][1] == 1
+    with pytest.raises(ValueError):
+        store.top("username")
+
+
+def test_store_is_not_created_by_reads(tmp_path):
+    canary = CanaryNeuron(config_path=tmp_path / "canary.json")
+    db = tmp_path / "canary_events.db"
+
+    assert not db.exists()
+    status = canary.status()
+    assert (status["events_recorded"], status["top_decoys"]) == (0, [])
+    assert canary.query_events() == []
+    assert not db.exists()
+
+    canary.store.append_many([_event(1, "/d", "/usr/bin/cat", "cat")])
+    assert db.exists() and canary.status()["events_recorded"] == 1
+
+
+def test_recent_events_ring_is_bounded(tmp_path, monkeypatch):
+    monkeypatch.setattr(CanaryNeuron, "RECENT_EVENTS", 5)
+    canary = CanaryNeuron(config_path=tmp_path / "canary.json")
+    decoy = tmp_path / "decoy" / "credentials"
+    canary._register_decoy(decoy, canary._generate_decoy_config("credentials"))
+    monkeypatch.setattr(canary, "_dispatch_alert", lambda event: None)
+
+    for n in range(12):
+        canary._incidents[str(decoy)] = _PendingIncident(
+            decoy_path=str(decoy), config=canary.decoys[str(decoy)], first_seen=1000.0 + n,
+            last_seen=1000.0 + n, actions=["READ"], process={"pid": n})
+        canary._close_incident(str(decoy))
+
+    assert [e.pid for e in canary.event_history] == [7, 8, 9, 10, 11]
+    assert canary.store.count() == 12
@@ -0,0 +1,90 @@
+"""Per-file inotify watches on decoys"""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+from cynapse.neurons.canary import DistributedWatcher
+
+pytestmark = pytest.mark.skipif(sys.platform != "linux", reason="inotify is Linux-only")
+
+
+class _Recorder:
+    def __init__(self):
+        self.events = []
+        self.watcher = DistributedWatcher(self.record)
+        self.watcher.attributor = None  # Attribution is covered elsewhere
+
+    def record(self, watch_path, name, details):
+        self.events.append((os.path.join(watch_path, name), details["actions"]))
+
+    def drain(self):
+        self.watcher._on_inotify_readable()
+        events, self.events = self.events, []
+        return events
+
+
+@pytest.fixture
+def decoy(tmp_path):
+    path = (tmp_path / "decoys").resolve() / "id_rsa"
+    path.parent.mkdir()
+    path.write_text("key")
+    return path
+
+
+def _watch(recorder, path):
+    assert asyncio.run(recorder.watcher.add_watch(path))
+    return recorder.watcher.watch_descriptors[str(path)]["wd"]
+
+
+def test_neighbours_of_a_watched_file_are_not_reported(decoy):
+    recorder = _Recorder()
+    _watch(recorder, decoy)
+    (decoy.parent / "notes.txt").write_text("unrelated")
+    decoy.read_text()
+
+    events = recorder.drain()
+
+    assert {path for path, _ in events} == {str(decoy)}
+    assert any("ACCESS" in actions for _, actions in events)
+    recorder.watcher.stop()
+
+
+def test_watch_is_dropped_on_delete_self_and_re_added(decoy):
+    recorder = _Recorder()
+    old_wd = _watch(recorder, decoy)
+
+    decoy.unlink()
+    assert (str(decoy), ["DELETE"]) in recorder.drain()
+    assert str(decoy) not in recorder.watcher.watch_descriptors
+    assert old_wd not in recorder.watcher._wd_to_path
+
+    decoy.write_text("replanted")
+    new_wd = _watch(recorder, decoy)
+    recorder.drain()  # The write itself
+    decoy.read_text()
+
+    assert new_wd != old_wd
+    assert any("ACCESS" in actions for path, actions in recorder.drain() if path == str(decoy))
+    recorder.watcher.stop()
+
+
+def test_replant_before_the_old_watch_is_ignored_keeps_the_new_watch(decoy):
+    recorder = _Recorder()
+    old_wd = _watch(recorder, decoy)
+
+    # Redeploy replaces the decoy before the loop sees IN_IGNORED for the old inode
+    decoy.unlink()
+    decoy.write_text("replanted")
+    new_wd = _watch(recorder, decoy)
+    recorder.drain()
+
+    assert recorder.watcher.watch_descriptors[str(decoy)]["wd"] == new_wd
+    assert recorder.watcher._wd_to_path == {new_wd: str(decoy)}
+    assert recorder.watcher._file_wds == {new_wd}
+    assert old_wd != new_wd
+    decoy.read_text()
+    assert any("ACCESS" in actions for path, actions in recorder.drain() if path == str(decoy))
+    recorder.watcher.stop()
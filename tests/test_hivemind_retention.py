@@ -0,0 +1,114 @@
+"""Retention policy for hivemind.db"""
+
+import gzip
+import json
+import time
+
+from cynapse.core.hivemind import (
+    Bee, BeeInstance, BeeState, BeeType, Honeycomb, HiveConfig, Node, RetentionPolicy,
+)
+from cynapse.utils.config import ConfigManager
+
+DAY = 86400
+
+
+def _finished(honeycomb, bee_id, end_time, n=0):
+    instance = BeeInstance(instance_id=f"{bee_id}_{n}", bee_id=bee_id, state=BeeState.QUEUED)
+    honeycomb.create_instance(instance)
+    honeycomb.update_instance(instance.instance_id, state=BeeState.COMPLETED.value, end_time=end_time)
+
+
+def _bee(bee_id, ephemeral=False):
+    return Bee(id=bee_id, name=bee_id, type=BeeType.DEPLOYMENT,
+               nodes=[Node('out', 'output')], ephemeral=ephemeral)
+
+
+def test_retention_keeps_user_and_template_bees(tmp_path):
+    honeycomb = Honeycomb(str(tmp_path / "hive.db"))
+    now = time.time()
+    for bee in (_bee("user_bee"), _bee("template_chat"), _bee("oneoff", ephemeral=True)):
+        honeycomb.save_bee(bee)
+        _finished(honeycomb, bee.id, now - 30 * DAY)
+
+    archived = honeycomb.apply_retention(
+        RetentionPolicy(memory_days=0, instance_days=7, archive_path=str(tmp_path / "archive")), now=now)
+
+    assert archived == {'memory': 0, 'instances': 3, 'bees': 1}
+    assert honeycomb.load_bee("user_bee") is not None
+    assert honeycomb.load_bee("template_chat") is not None
+    assert honeycomb.load_bee("oneoff") is None
+
+    (bee_archive,) = (tmp_path / "archive").glob("bees-*.ndjson.gz")
+    with gzip.open(bee_archive, 'rt') as f:
+        assert [json.loads(line)['id'] for line in f] == ["oneoff"]
+
+
+def test_ephemeral_bee_with_live_instance_is_kept(tmp_path):
+    honeycomb = Honeycomb(str(tmp_path / "hive.db"))
+    now = time.time()
+    honeycomb.save_bee(_bee("oneoff", ephemeral=True))
+    _finished(honeycomb, "oneoff", now - 30 * DAY, n=0)
+    _finished(honeycomb, "oneoff", now - DAY, n=1)
+
+    archived = honeycomb.apply_retention(
+        RetentionPolicy(instance_days=7, archive_path=None), now=now)
+
+    assert archived == {'memory': 0, 'instances': 1, 'bees': 0}
+    assert honeycomb.load_bee("oneoff") is not None
+
+
+def test_memory_is_kept_by_default(tmp_path):
+    honeycomb = Honeycomb(str(tmp_path / "hive.db"))
+    honeycomb.log_interaction("q", "r")
+
+    archived = honeycomb.apply_retention(RetentionPolicy(archive_path=None), now=time.time() + 365 * DAY)
+
+    assert archived['memory'] == 0
+    assert len(honeycomb.get_recent_memory()) == 1
+
+
+def test_memory_expiry_without_archive(tmp_path):
+    honeycomb = Honeycomb(str(tmp_path / "hive.db"))
+    for _ in range(3):
+        honeycomb.log_interaction("q", "r")
+
+    archived = honeycomb.apply_retention(
+        RetentionPolicy(memory_days=30, instance_days=0, archive_path=None), now=time.time() + 31 * DAY)
+
+    assert archived['memory'] == 3
+    assert honeycomb.get_recent_memory() == []
+
+
+def test_maintenance_is_opt_in():
+    config = HiveConfig()
+    assert config.auto_maintenance is False
+    assert config.memory_retention_days == 0
+
+
+def test_template_prefix_is_matched_literally(tmp_path):
+    honeycomb = Honeycomb(str(tmp_path / "hive.db"))
+    now = time.time()
+    for bee in (_bee("template_chat", ephemeral=True), _bee("templateXchat", ephemeral=True)):
+        honeycomb.save_bee(bee)
+        _finished(honeycomb, bee.id, now - 30 * DAY)
+
+    archived = honeycomb.apply_retention(RetentionPolicy(instance_days=7, archive_path=None), now=now)
+
+    assert archived['bees'] == 1
+    assert honeycomb.load_bee("template_chat") is not None
+    assert honeycomb.load_bee("templateXchat") is None
+
+
+def test_list_instances_is_newest_first(tmp_path):
+    honeycomb = Honeycomb(str(tmp_path / "hive.db"))
+    for n, start in enumerate([200.0, 100.0, 300.0, 300.0]):
+        honeycomb.create_instance(BeeInstance(instance_id=f"i{n}", bee_id="b", state=BeeState.COMPLETED,
+                                              start_time=start))
+
+    assert [i['instance_id'] for i in honeycomb.list_instances("b")] == ["i3", "i2", "i0", "i1"]
+    assert [i['instance_id'] for i in honeycomb.list_instances("b", BeeState.COMPLETED, limit=2)] == ["i3", "i2"]
+
+
+def test_archive_path_defaults_match_shipped_config():
+    shipped = ConfigManager().get("hivemind", "archive_path")
+    assert HiveConfig().archive_path == RetentionPolicy().archive_path == shipped
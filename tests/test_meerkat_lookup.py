@@ -0,0 +1,70 @@
+"""Set-based CVE lookup returns what the one-item-at-a-time lookup returned"""
+
+import asyncio
+import random
+import sqlite3
+
+import pytest
+
+from cynapse.neurons.meerkat import MeerkatScanner, SoftwareItem
+
+VERSIONS = ["1", "1.2", "1.2.3", "1.2.30", "1.20.0", "1.3.0", "10.0", "2.0.0", "2.0.0rc1", "0.9"]
+
+
+def _build_db(path, index: bool, seed: int = 7):
+    rng = random.Random(seed)
+    conn = sqlite3.connect(str(path))
+    conn.execute("CREATE TABLE cve (cve_id TEXT, pkg TEXT, version TEXT, cvss REAL, summary TEXT)")
+    rows = []
+    for n in range(3000):
+        cve_id = f"CVE-2026-{rng.randrange(2000):05d}"  # Repeats: one CVE over several versions
+        cvss = rng.choice([5.0, 7.5, 9.8, round(rng.uniform(0, 10), 1)])  # Plenty of ties
+        rows.append((cve_id, f"pkg{rng.randrange(60)}", rng.choice(VERSIONS), cvss, f"issue {n}"))
+    conn.executemany("INSERT INTO cve VALUES (?, ?, ?, ?, ?)", rows)
+    if index:
+        conn.execute("CREATE INDEX idx_cve_pkg ON cve(pkg)")
+    conn.commit()
+    conn.close()
+
+
+def _reference(db_path, item: SoftwareItem):
+    """The original lookup: one query per version pattern, first occurrence of a CVE wins"""
+    conn = sqlite3.connect(str(db_path))
+    patterns = [item.version, ".".join(item.version.split(".")[:2]), item.version.split(".")[0]]
+    found = []
+    for pattern in patterns:
+        # The original left CVSS ties in scan order; rowid makes that explicit
+        for cve_id, cvss, summary in conn.execute(
+                "SELECT cve_id, cvss, summary FROM cve WHERE pkg = ? AND (version = ? OR version LIKE ?) "
+                "ORDER BY cvss DESC, rowid", (item.name, pattern, f"{pattern}%")):
+            if all(cve_id != f[0] for f in found):
+                found.append((cve_id, cvss, summary))
+    conn.close()
+    return found
+
+
+@pytest.mark.parametrize("index", [True, False])
+def test_bulk_lookup_matches_per_item_lookup(tmp_path, index, monkeypatch):
+    db_path = tmp_path / "cve.db"
+    _build_db(db_path, index)
+    rng = random.Random(1)
+    items = [SoftwareItem(f"pkg{rng.randrange(70)}", rng.choice(VERSIONS), "python") for _ in range(400)]
+    items += items[:20]  # Duplicates resolve once and are returned for every occurrence
+    monkeypatch.setattr(MeerkatScanner, "LOOKUP_CHUNK", 64)  # Several chunks on several DB workers
+
+    async def run():
+        scanner = MeerkatScanner(db_path=db_path)
+        try:
+            bulk = await scanner.lookup_vulnerabilities_bulk(items)
+            single = await scanner.lookup_vulnerabilities(items[0])
+        finally:
+            await scanner.close()
+        return bulk, single
+
+    bulk, single = asyncio.run(run())
+
+    assert len(bulk) == len(items)
+    assert sum(1 for vulns in bulk if vulns) > 100
+    for item, vulns in zip(items, bulk):
+        assert [(v.cve_id, v.cvss_score, v.summary) for v in vulns] == _reference(db_path, item), item
+    assert single == bulk[0]